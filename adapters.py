@@ -0,0 +1,168 @@
+import asyncio
+import importlib
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+# Custo relativo de cada forma de buscar uma página (menor = mais barato)
+HTTP = 'http'
+CRAWL4AI = 'crawl4ai'
+BROWSER = 'browser'
+STRATEGY_COST = {HTTP: 1, CRAWL4AI: 5, BROWSER: 10}
+
+# Depois de tantas falhas seguidas, a estratégia é pulada no resto da execução
+# (ou por STRATEGY_DEMOTION_S segundos, em processos longos como o daemon)
+MAX_STRATEGY_FAILURES = 3
+STRATEGY_DEMOTION_S = float(os.environ.get('STRATEGY_DEMOTION_S', '900'))
+
+
+@dataclass(frozen=True)
+class FetchStrategy:
+    """Uma forma de extrair as ofertas de uma URL: fetch(crawler, url, on_markdown) -> ofertas.
+
+    uses_crawler indica que a estratégia usa o navegador compartilhado do
+    AsyncWebCrawler (e não um navegador próprio). requires lista os módulos
+    pesados que a estratégia importa na primeira chamada.
+    """
+
+    kind: str
+    fetch: object
+    uses_crawler: bool = False
+    requires: tuple = ()
+
+    @property
+    def cost(self):
+        return STRATEGY_COST[self.kind]
+
+    def preload(self):
+        """Importa agora os módulos de requires (ex.: para aquecer um processo de longa duração)."""
+        for module in self.requires:
+            importlib.import_module(module)
+
+
+@dataclass
+class MarketplaceAdapter:
+    """Um marketplace: padrões de URL, estratégias de busca e limites padrão.
+
+    product_id_pattern extrai da URL o id do produto no marketplace (primeiro
+    grupo), para reconhecer URLs diferentes do mesmo produto.
+    """
+
+    name: str
+    patterns: tuple
+    strategies: list
+    max_retries: int = 3
+    max_concurrency: int = 3
+    product_id_pattern: str = None
+    _compiled: list = field(default_factory=list, init=False, repr=False)
+    _semaphore: object = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        self.strategies = sorted(self.strategies, key=lambda strategy: strategy.cost)
+
+    def matches(self, url):
+        return any(pattern.search(url) for pattern in self._compiled)
+
+    def product_id(self, url):
+        """Id do produto na URL, ou None se o adaptador não sabe extraí-lo."""
+        if not self.product_id_pattern:
+            return None
+        match = re.search(self.product_id_pattern, url)
+        return match.group(1) if match else None
+
+    @property
+    def uses_crawler(self):
+        return any(strategy.uses_crawler for strategy in self.strategies)
+
+    @property
+    def semaphore(self):
+        """Limita as URLs simultâneas deste marketplace a max_concurrency."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+
+class AdapterRegistry:
+    """Escolhe o adaptador de cada URL e a ordem das estratégias a tentar.
+
+    As estratégias são tentadas da mais barata para a mais cara; uma que
+    falha MAX_STRATEGY_FAILURES vezes seguidas num marketplace deixa de ser
+    tentada, para não pagar a falha barata antes de cada fallback. O
+    rebaixamento vale até reset() (início de cada execução) ou por
+    demotion_s segundos, o que vier primeiro: num processo que não para
+    (ex.: scrape_api), uma queda passageira não rebaixa a estratégia para sempre.
+    """
+
+    def __init__(self, adapters=(), max_failures=MAX_STRATEGY_FAILURES, demotion_s=None):
+        self.adapters = []
+        self.max_failures = max_failures
+        self.demotion_s = STRATEGY_DEMOTION_S if demotion_s is None else demotion_s
+        self._failures = {}
+        self._demoted_at = {}
+        self.used = {}
+        for adapter in adapters:
+            self.register(adapter)
+
+    def reset(self):
+        """Zera as falhas, os rebaixamentos e as contagens (início de uma execução)."""
+        self._failures.clear()
+        self._demoted_at.clear()
+        self.used.clear()
+
+    def register(self, adapter):
+        self.adapters.append(adapter)
+        return adapter
+
+    def for_url(self, url):
+        for adapter in self.adapters:
+            if adapter.matches(url):
+                return adapter
+        return None
+
+    def product_key(self, url):
+        """Chave canônica do produto: (marketplace, id), ou a própria URL sem query/fragmento."""
+        adapter = self.for_url(url)
+        product_id = adapter.product_id(url) if adapter is not None else None
+        if product_id:
+            return f'{adapter.name}:{product_id}'
+        return url.split('#')[0].split('?')[0].rstrip('/')
+
+    def strategies(self, adapter):
+        """Estratégias do adaptador, da mais barata para a mais cara, sem as rebaixadas.
+
+        A última nunca é rebaixada: sempre sobra uma estratégia para tentar.
+        """
+        *cheaper, last = adapter.strategies
+        return [s for s in cheaper if not self._demoted((adapter.name, s.kind))] + [last]
+
+    def _demoted(self, key):
+        if self._failures.get(key, 0) < self.max_failures:
+            return False
+        demoted_at = self._demoted_at.get(key)
+        if demoted_at is not None and self.demotion_s and time.monotonic() - demoted_at >= self.demotion_s:
+            # Passou o tempo de rebaixamento: a estratégia volta a ser tentada
+            self._failures[key] = 0
+            del self._demoted_at[key]
+            return False
+        return True
+
+    def record(self, adapter, strategy, ok):
+        key = (adapter.name, strategy.kind)
+        if ok:
+            self._failures[key] = 0
+            self._demoted_at.pop(key, None)
+            self.used[key] = self.used.get(key, 0) + 1
+            return
+        self._failures[key] = self._failures.get(key, 0) + 1
+        if self._failures[key] == self.max_failures and strategy is not adapter.strategies[-1]:
+            self._demoted_at[key] = time.monotonic()
+            print(f'[{adapter.name}] Estratégia {strategy.kind} falhou {self.max_failures} vezes seguidas, '
+                  f'indo direto para as próximas')
+
+    def print_report(self):
+        if self.used:
+            print('Estratégias de busca:')
+        for (name, kind), count in sorted(self.used.items()):
+            print(f'  [{name}] {count} URLs extraídas via {kind}')
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+
+from serialization import encode_body
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedApiClient:
+    """Cliente da API com pool de conexões e envio em lotes.
+
+    Os itens de cada URL são acumulados com add() e enviados em lotes de
+    batch_size itens por uma única aiohttp.ClientSession. Se o POST do lote
+    responde 400 (algum item já existe), os itens são reenviados URL por URL
+    e só as que respondem 400 de novo vão via PUT, como no envio por URL.
+    As URLs cujos itens não foram salvos ficam em failed_keys.
+    """
+
+    def __init__(self, api_url, batch_size=50, max_connections=10, timeout=60):
+        self.api_url = api_url
+        self.batch_size = batch_size
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.failed_keys = set()
+        self.saved_keys = set()
+        self._buffer = []
+        self._buffer_keys = []
+        self._lock = asyncio.Lock()
+        self._sending = set()
+        self._session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await self.flush()
+        finally:
+            await self._session.close()
+
+    async def add(self, key, items):
+        """Acumula os itens de uma URL; dispara o envio quando o lote enche."""
+        async with self._lock:
+            self._buffer.extend(items)
+            self._buffer_keys.append((key, len(items)))
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, keys = self._take()
+        task = asyncio.create_task(self._send(batch, keys))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+        # Limita os envios simultâneos ao tamanho do pool
+        if len(self._sending) >= self.max_connections:
+            await asyncio.wait(self._sending, return_when=asyncio.FIRST_COMPLETED)
+
+    async def flush(self):
+        """Envia o que restou no buffer e aguarda os envios pendentes."""
+        async with self._lock:
+            batch, keys = self._take()
+        if batch:
+            await self._send(batch, keys)
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+
+    def _take(self):
+        batch, keys = self._buffer, self._buffer_keys
+        self._buffer, self._buffer_keys = [], []
+        return batch, keys
+
+    async def _request(self, method, batch):
+        try:
+            body, headers = encode_body(batch)
+            async with self._session.request(method, self.api_url, data=body, headers=headers) as response:
+                logger.info(f'Status da resposta ({method}) para lote de {len(batch)} itens: {response.status}')
+                return response.status
+        except Exception as e:
+            logger.error(f'Erro ao enviar lote para a API ({method}): {e}')
+            return None
+
+    async def _send(self, batch, keys):
+        """Envia um lote; keys são pares (URL, quantidade de itens) na ordem do lote."""
+        status = await self._request('POST', batch)
+        if status == 400 and len(keys) > 1:
+            # Reenvia separado para que só os itens em conflito sejam atualizados via PUT
+            groups = []
+            start = 0
+            for key, count in keys:
+                groups.append(self._send(batch[start:start + count], [(key, count)]))
+                start += count
+            await asyncio.gather(*groups)
+            return
+        if status == 400:
+            status = await self._request('PUT', batch)
+        urls = [key for key, _ in keys]
+        if status in (200, 201, 202):
+            self.saved_keys.update(urls)
+        else:
+            logger.warning(f'Falha ao enviar lote com {len(urls)} URLs (Status: {status})')
+            self.failed_keys.update(urls)
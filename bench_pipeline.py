@@ -0,0 +1,283 @@
+"""Teste de escala do pipeline (process_urls) contra o simulador de marketplaces.
+
+Uso: python bench_pipeline.py [tamanhos...]      (padrão: 1000 10000 50000)
+
+Sobe marketplace_sim.py num processo à parte e, para cada tamanho, roda
+process_urls num processo novo e num diretório temporário (sem_dados, outbox
+e dados/ não se misturam com os reais). A API de preços também é a do
+simulador. Mercado Livre e Época usam as estratégias HTTP reais. A Beleza na
+Web segue o caminho padrão de produção, o lote (crawl_beleza_batch, com
+blocos, circuito e prazos) e o extrator de markdown reais, com um crawler
+simulado no lugar do Chromium: arun_many busca o markdown do simulador por
+HTTP. Sem o crawl4ai instalado, ou com BENCH_BELEZA_BATCH=0, a Beleza na Web
+cai para o modo por URL via HTTP. A Amazon, que em produção precisa de
+navegador, sempre lê a página simulada por HTTP com um extrator simplificado.
+A saída informa o modo de cada marketplace: os números não incluem o custo
+do navegador. Relata vazão, latência por URL (p50/p95/p99/máx), resultados e
+pico de memória do Python.
+
+Os limites de produção valem, exceto onde o ambiente já define outro valor:
+CRAWL_DELAY_S=0, CRAWL_WORKERS=32, UPLOAD_WORKERS=8 e
+BENCH_MARKETPLACE_CONCURRENCY (padrão: o max_concurrency de cada adaptador).
+A latência e as falhas do simulador vêm de SIM_LATENCY_MS, SIM_LATENCY_SIGMA,
+SIM_FAILURE_RATE e SIM_SELLERS.
+"""
+import asyncio
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import marketplace_sim
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+BENCH_BELEZA_BATCH = os.environ.get('BENCH_BELEZA_BATCH', '1') == '1'
+BENCH_ENV = {
+    'CRAWL_DELAY_S': '0',
+    'CRAWL_WORKERS': '32',
+    'UPLOAD_WORKERS': '8',
+    'PIPELINE_QUEUE_SIZE': '64',
+}
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_simulator(port):
+    """Sobe o simulador e espera o /health responder."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, 'marketplace_sim.py'), str(port)],
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            with urllib.request.urlopen(f'{base_url}/health', timeout=1):
+                return process, base_url
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError('o simulador de marketplaces não subiu')
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('o simulador de marketplaces não respondeu')
+
+
+def use_simulated_strategies(registry, concurrency=None):
+    """Troca as estratégias de navegador por leituras HTTP das páginas simuladas."""
+    from adapters import HTTP, FetchStrategy
+    from scrape_combined_crawl4ai import own_browser
+
+    for adapter in registry.adapters:
+        if adapter.name == 'Amazon':
+            adapter.strategies = [FetchStrategy(HTTP, own_browser(fetch_simulated_amazon))]
+        elif adapter.name == 'Beleza na Web':
+            adapter.strategies = [FetchStrategy(HTTP, own_browser(fetch_simulated_beleza))]
+        else:
+            adapter.strategies = [strategy for strategy in adapter.strategies if strategy.kind == HTTP]
+        if concurrency:
+            adapter.max_concurrency = concurrency
+
+
+async def _get_simulated(marketplace, url):
+    """Corpo da página simulada, com a mesma classificação de bloqueios das páginas reais."""
+    from page_guard import PageBlocked, classify
+    from shared_resources import http_session
+
+    async with http_session() as session:
+        async with session.get(url) as response:
+            body = await response.text()
+            status = response.status
+    verdict = classify(marketplace, status, url)
+    if verdict.blocked:
+        raise PageBlocked(marketplace, url, verdict)
+    return body
+
+
+async def fetch_simulated_amazon(url):
+    from product_identity import find_ean
+    from records import Offer, ProductHeader
+
+    html = await _get_simulated('Amazon', url)
+    sku = re.search(r'/dp/([A-Z0-9]{10})', url).group(1)
+    header = ProductHeader(
+        sku, 'Amazon', re.search(r'id="productTitle">(.*?)<', html).group(1), 4.5,
+        re.search(r'id="landingImage" src="([^"]+)"', html).group(1), ean=find_ean(html),
+    )
+    data_hora = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+    lojas = []
+    for loja, preco in re.findall(r'class="seller">(.*?)</a><span class="a-offscreen">R\$ ([\d.,]+)<', html):
+        key_loja = loja.lower().replace(' ', '')
+        lojas.append(Offer(header, loja, float(preco.replace('.', '').replace(',', '.')), data_hora,
+                           key_loja, f'{key_loja}_{sku}'))
+    return lojas
+
+
+async def fetch_simulated_beleza(url):
+    from scrape_combined_crawl4ai import extract_data_from_markdown_beleza
+
+    return extract_data_from_markdown_beleza(await _get_simulated('Beleza na Web', url))
+
+
+class SimulatedCrawler:
+    """AsyncWebCrawler no lugar do Chromium: arun_many busca o markdown do simulador por HTTP.
+
+    Os resultados saem conforme ficam prontos (como o stream do crawl4ai), com
+    até max_sessions páginas ao mesmo tempo.
+    """
+
+    def __init__(self, max_sessions):
+        from types import SimpleNamespace
+
+        self.max_sessions = max_sessions
+        self.crawler_strategy = SimpleNamespace(set_hook=lambda *args, **kwargs: None)
+
+    async def start(self):
+        return self
+
+    async def close(self):
+        pass
+
+    async def _crawl(self, url):
+        from types import SimpleNamespace
+
+        from shared_resources import http_session
+
+        try:
+            async with http_session() as session:
+                async with session.get(url) as response:
+                    markdown = await response.text()
+                    status = response.status
+        except Exception as e:
+            return SimpleNamespace(url=url, success=False, error_message=str(e), markdown='')
+        return SimpleNamespace(url=url, success=status < 400, error_message=f'status {status}',
+                               markdown=markdown, status_code=status)
+
+    async def arun_many(self, urls, config=None, dispatcher=None):
+        semaphore = asyncio.Semaphore(self.max_sessions)
+
+        async def crawl_limited(url):
+            async with semaphore:
+                return await self._crawl(url)
+
+        async def results():
+            tasks = [asyncio.ensure_future(crawl_limited(url)) for url in urls]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return results()
+
+
+def beleza_batch_available():
+    """O lote da Beleza na Web monta a configuração e o dispatcher com o crawl4ai."""
+    return importlib.util.find_spec('crawl4ai') is not None
+
+
+async def run_size(size, base_url):
+    """Roda process_urls com size URLs simuladas e devolve o resumo da execução."""
+    import aiohttp
+
+    from run_metrics import RunMetrics, percentile
+    from scrape_combined_crawl4ai import ADAPTERS, BELEZA_AUTH_FILE, BELEZA_BATCH_MAX_SESSIONS, process_urls
+    from shared_resources import install
+
+    concurrency = int(os.environ.get('BENCH_MARKETPLACE_CONCURRENCY', '0'))
+    use_simulated_strategies(ADAPTERS, concurrency)
+    beleza_batch = BENCH_BELEZA_BATCH and beleza_batch_available()
+    crawler = None
+    if beleza_batch:
+        crawler = SimulatedCrawler(BELEZA_BATCH_MAX_SESSIONS)
+        # O lote exige a sessão salva; o simulador não confere cookies
+        with open(BELEZA_AUTH_FILE, 'w') as f:
+            json.dump({'cookies': []}, f)
+    urls = marketplace_sim.catalog(base_url, size)
+    metrics = RunMetrics()
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=256))
+    install(None, session)
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            outcomes = await process_urls(urls, beleza_batch=beleza_batch, with_details=False,
+                                          crawler=crawler, metrics=metrics)
+    finally:
+        install()
+        await session.close()
+    elapsed = time.perf_counter() - started
+
+    latencies = [value for values in metrics.latencies.values() for value in values]
+    contagem = {}
+    for status in outcomes.values():
+        contagem[status] = contagem.get(status, 0) + 1
+    return {
+        'urls': size,
+        'duracao_s': round(elapsed, 2),
+        'urls_por_s': round(size / elapsed, 1) if elapsed else 0.0,
+        'p50_s': round(percentile(latencies, 50), 3),
+        'p95_s': round(percentile(latencies, 95), 3),
+        'p99_s': round(percentile(latencies, 99), 3),
+        'max_s': round(max(latencies, default=0.0), 3),
+        'pico_python_mb': round(metrics.peak_python_rss / 1024 / 1024, 1),
+        'resultados': contagem,
+        'concorrencia': {adapter.name: adapter.max_concurrency for adapter in ADAPTERS.adapters},
+        'modos': {
+            'Mercado Livre': 'HTTP (estratégia real)',
+            'Época Cosméticos': 'HTTP (estratégia real)',
+            'Amazon': 'HTTP (extrator simplificado, sem navegador)',
+            'Beleza na Web': ('lote arun_many (caminho padrão, crawler simulado por HTTP)' if beleza_batch
+                              else 'por URL via HTTP (sem o lote de produção)'),
+        },
+    }
+
+
+def run_child(size, base_url):
+    """Executa um tamanho num processo novo, dentro de um diretório temporário."""
+    env = {**BENCH_ENV, **os.environ, 'SIM_BASE_URL': base_url, 'API_URL': f'{base_url}/api/products'}
+    with tempfile.TemporaryDirectory(prefix='bench-pipeline-') as workdir:
+        out = subprocess.run(
+            [sys.executable, os.path.join(HERE, 'bench_pipeline.py'), '--filho', str(size)],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else 'falhou')
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--filho':
+        sys.path.insert(0, HERE)
+        print(json.dumps(asyncio.run(run_size(int(sys.argv[2]), os.environ['SIM_BASE_URL']))))
+        return
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    process, base_url = start_simulator(marketplace_sim.SIM_PORT)
+    print(f'Simulador: latência mediana {marketplace_sim.SIM_LATENCY_MS:.0f} ms '
+          f'(sigma {marketplace_sim.SIM_LATENCY_SIGMA}), falhas {marketplace_sim.SIM_FAILURE_RATE:.1%}')
+    try:
+        for size in sizes:
+            try:
+                result = run_child(size, base_url)
+            except RuntimeError as e:
+                print(f'  {size} URLs: falhou ({e})')
+                continue
+            print(
+                f"  {result['urls']} URLs em {result['duracao_s']}s ({result['urls_por_s']} URLs/s), "
+                f"latência p50 {result['p50_s']}s, p95 {result['p95_s']}s, p99 {result['p99_s']}s, "
+                f"máx {result['max_s']}s, pico de memória {result['pico_python_mb']} MB, "
+                f"resultados {result['resultados']}"
+            )
+            for marketplace, modo in result['modos'].items():
+                print(f'    [{marketplace}] {modo}')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()
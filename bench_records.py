@@ -0,0 +1,79 @@
+"""Compara o formato plano (dicts) com o compacto (Offer + ProductHeader).
+
+Uso: python bench_records.py [produtos] [vendedores]
+Mede o tamanho do corpo JSON enviado à API e a memória por oferta.
+"""
+import json
+import sys
+import tracemalloc
+
+from records import Offer, ProductHeader, to_flat, to_grouped
+
+DESCRICAO = 'Wella Professionals Invigo Nutri-Enrich - Shampoo 1000ml ' * 3
+IMAGEM = 'https://res.cloudinary.com/beleza-na-web/image/upload/f_auto,fl_progressive,q_auto:eco,w_800/v1/imagens/product/12345/abcdef-wella-invigo.jpg'
+
+
+def build_dicts(produtos, vendedores):
+    lojas = []
+    for p in range(produtos):
+        sku = f'MLB{p:08d}'
+        # Como nos extratores: os mesmos objetos str em todos os vendedores
+        descricao, imagem = f'{DESCRICAO}{p}', f'{IMAGEM}?p={p}'
+        for v in range(vendedores):
+            key_loja = f'loja{v}'
+            lojas.append({
+                'sku': sku,
+                'loja': f'Loja {v}',
+                'preco_final': 100.0 + v,
+                'data_hora': '2025-01-01T00:00:00Z',
+                'marketplace': 'Mercado Livre',
+                'key_loja': key_loja,
+                'key_sku': f'{key_loja}_{sku}',
+                'descricao': descricao,
+                'review': 4.5,
+                'imagem': imagem,
+                'status': 'ativo',
+            })
+    return lojas
+
+
+def build_offers(produtos, vendedores):
+    lojas = []
+    for p in range(produtos):
+        sku = f'MLB{p:08d}'
+        header = ProductHeader(sku, 'Mercado Livre', f'{DESCRICAO}{p}', 4.5, f'{IMAGEM}?p={p}')
+        for v in range(vendedores):
+            key_loja = f'loja{v}'
+            lojas.append(Offer(header, f'Loja {v}', 100.0 + v, '2025-01-01T00:00:00Z', key_loja, f'{key_loja}_{sku}'))
+    return lojas
+
+
+def measure(builder, produtos, vendedores):
+    tracemalloc.start()
+    data = builder(produtos, vendedores)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def main():
+    produtos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    vendedores = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    total = produtos * vendedores
+
+    dicts, mem_dicts = measure(build_dicts, produtos, vendedores)
+    offers, mem_offers = measure(build_offers, produtos, vendedores)
+
+    flat_bytes = len(json.dumps(to_flat(offers), ensure_ascii=False).encode('utf-8'))
+    grouped_bytes = len(json.dumps(to_grouped(offers), ensure_ascii=False).encode('utf-8'))
+
+    print(f'{produtos} produtos x {vendedores} vendedores = {total} ofertas')
+    print(f'Memória por oferta: dict {mem_dicts / total:.0f} B, Offer {mem_offers / total:.0f} B '
+          f'({100 * (1 - mem_offers / mem_dicts):.0f}% menor)')
+    print(f'Payload: plano {flat_bytes / 1024:.0f} KB, agrupado {grouped_bytes / 1024:.0f} KB '
+          f'({100 * (1 - grouped_bytes / flat_bytes):.0f}% menor)')
+    assert len(dicts) == len(offers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Mede o tempo de inicialização: import dos módulos e import até a primeira requisição.
+
+Uso: python bench_startup.py [repetições]
+Cada medição roda num processo Python novo (import a frio). Para cada
+marketplace, "primeira requisição" é o import de scrape_combined_crawl4ai
+mais os módulos que a estratégia mais barata do adaptador carrega
+(FetchStrategy.requires), ou seja, o custo até a primeira URL começar.
+"""
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ['crawl4ai', 'playwright', 'aiohttp', 'litellm', 'nltk', 'requests']
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module} as target
+imported = time.perf_counter()
+strategy = None
+if {url!r}:
+    adapter = target.ADAPTERS.for_url({url!r})
+    strategy = target.ADAPTERS.strategies(adapter)[0]
+    strategy.preload()
+ready = time.perf_counter()
+print(json.dumps({{
+    'import_s': imported - start,
+    'ready_s': ready - start,
+    'strategy': strategy.kind if strategy else None,
+    'heavy': sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+'''
+
+SAMPLE_URLS = {
+    'Mercado Livre': 'https://www.mercadolivre.com.br/shampoo/p/MLB20570794/s',
+    'Amazon': 'https://www.amazon.com.br/dp/B07KSDBVJW',
+    'Época Cosméticos': 'https://www.epocacosmeticos.com.br/pesquisa?q=7896235353652',
+    'Beleza na Web': 'https://www.belezanaweb.com.br/senscience-cpr-step-3-condicionador-1l',
+}
+
+
+def probe(module, url=''):
+    code = _PROBE.format(module=module, url=url, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def best_of(runs, module, url=''):
+    results = [probe(module, url) for _ in range(runs)]
+    return min(results, key=lambda r: r['ready_s'])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f'Melhor de {runs} processos novos por medição')
+    for module in ['scrape_combined_crawl4ai', 'details', 'execucao']:
+        try:
+            result = best_of(runs, module)
+        except subprocess.CalledProcessError as e:
+            print(f'  import {module}: falhou ({e.stderr.strip().splitlines()[-1]})')
+            continue
+        print(f"  import {module}: {result['import_s'] * 1000:.0f} ms, módulos pesados: {result['heavy'] or 'nenhum'}")
+    for marketplace, url in SAMPLE_URLS.items():
+        try:
+            result = best_of(runs, 'scrape_combined_crawl4ai', url)
+        except subprocess.CalledProcessError as e:
+            print(f'  [{marketplace}] falhou ({e.stderr.strip().splitlines()[-1]})')
+            continue
+        print(
+            f"  [{marketplace}] import até a primeira requisição ({result['strategy']}): "
+            f"{result['ready_s'] * 1000:.0f} ms, módulos pesados: {result['heavy'] or 'nenhum'}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import os
+import time
+from collections import deque
+
+# O circuito de um marketplace abre quando, entre as últimas CIRCUIT_WINDOW
+# URLs (e ao menos CIRCUIT_MIN_CALLS), a fração de falhas chega a
+# CIRCUIT_FAILURE_RATE. Depois de CIRCUIT_COOLDOWN segundos, uma única URL
+# de teste decide se ele fecha de novo.
+CIRCUIT_FAILURE_RATE = float(os.environ.get('CIRCUIT_FAILURE_RATE', '0.5'))
+CIRCUIT_MIN_CALLS = int(os.environ.get('CIRCUIT_MIN_CALLS', '5'))
+CIRCUIT_WINDOW = int(os.environ.get('CIRCUIT_WINDOW', '10'))
+CIRCUIT_COOLDOWN = float(os.environ.get('CIRCUIT_COOLDOWN', '300'))
+
+FECHADO = 'fechado'
+ABERTO = 'aberto'
+MEIO_ABERTO = 'meio_aberto'
+
+
+class CircuitBreaker:
+    """Circuit breaker de um marketplace.
+
+    - fechado: todas as URLs passam; os resultados entram numa janela móvel;
+    - aberto: as URLs são recusadas até passar o cooldown;
+    - meio_aberto: só uma URL de teste passa; sucesso fecha o circuito,
+      falha abre de novo por mais um cooldown.
+    """
+
+    def __init__(self, name, failure_rate=None, min_calls=None, window=None, cooldown=None):
+        self.name = name
+        self.failure_rate = failure_rate if failure_rate is not None else CIRCUIT_FAILURE_RATE
+        self.min_calls = min_calls if min_calls is not None else CIRCUIT_MIN_CALLS
+        self.cooldown = cooldown if cooldown is not None else CIRCUIT_COOLDOWN
+        self.results = deque(maxlen=window or CIRCUIT_WINDOW)
+        self.state = FECHADO
+        self.opened_at = None
+        self.opened = 0
+        self.rejected = 0
+        self._probing = False
+
+    def allow(self):
+        """True se a próxima URL do marketplace pode ser crawleada."""
+        if self.state == FECHADO:
+            return True
+        if self.state == ABERTO and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = MEIO_ABERTO
+            print(f'[{self.name}] Circuito meio aberto, testando com uma URL')
+        if self.state == MEIO_ABERTO and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record(self, ok):
+        """Registra o resultado de uma URL que passou por allow()."""
+        if self.state == MEIO_ABERTO:
+            self._probing = False
+            if ok:
+                print(f'[{self.name}] URL de teste com dados, fechando o circuito')
+                self.state = FECHADO
+                self.results.clear()
+            else:
+                self._open()
+            return
+        if self.state == ABERTO:
+            return
+        self.results.append(ok)
+        failures = self.results.count(False)
+        if len(self.results) >= self.min_calls and failures / len(self.results) >= self.failure_rate:
+            self._open()
+
+    def release(self):
+        """Devolve uma admissão de allow() que não terá resultado (ex.: URL parada pelo prazo).
+
+        Se era a URL de teste, a próxima chamada a allow() escolhe outra.
+        """
+        if self.state == MEIO_ABERTO:
+            self._probing = False
+
+    def _open(self):
+        self.state = ABERTO
+        self.opened_at = time.monotonic()
+        self.opened += 1
+        print(f'[{self.name}] Circuito aberto por {self.cooldown:.0f}s após falhas seguidas')
+
+
+class MarketplaceBreakers:
+    """Um CircuitBreaker por marketplace, criado na primeira URL de cada um."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.breakers = {}
+
+    def get(self, marketplace):
+        breaker = self.breakers.get(marketplace)
+        if breaker is None:
+            breaker = self.breakers[marketplace] = CircuitBreaker(marketplace, **self.options)
+        return breaker
+
+    def allow(self, marketplace):
+        return self.get(marketplace).allow()
+
+    def record(self, marketplace, ok):
+        self.get(marketplace).record(ok)
+
+    def release(self, marketplace):
+        self.get(marketplace).release()
+
+    def closed(self, marketplace):
+        return self.get(marketplace).state == FECHADO
+
+    def print_report(self):
+        for name, breaker in sorted(self.breakers.items()):
+            if breaker.opened:
+                print(
+                    f'[{name}] Circuito aberto {breaker.opened} vezes, '
+                    f'{breaker.rejected} URLs adiadas (estado final: {breaker.state})'
+                )
@@ -0,0 +1,258 @@
+"""Modo daemon: um processo de longa duração em volta de process_urls.
+
+Uso: python daemon.py
+Mantém aquecidos o navegador do crawl4ai, os navegadores do Playwright
+(shared_resources.BrowserPool) e a sessão HTTP; raspa cada URL do catálogo
+a cada DAEMON_URL_INTERVAL_S segundos, espalhadas ao longo do intervalo em
+vez de todas de uma vez, e as que ficam sem dados depois de DAEMON_RETRY_S
+(sem usar sem_dados_urls.json); relê CATALOG_FILE quando ele muda (ou com SIGHUP)
+e responde GET /health e GET /status em DAEMON_HOST:DAEMON_PORT.
+"""
+import asyncio
+import json
+import os
+import signal
+import time
+from datetime import datetime
+
+from circuit_breaker import MarketplaceBreakers
+from memory_governor import MemoryGovernor
+from scrape_combined_crawl4ai import ADAPTERS, build_browser_config, process_urls
+from shared_resources import BrowserPool, install
+from state_files import AUTH_STATE
+
+CATALOG_FILE = os.environ.get('CATALOG_FILE', 'urls.json')
+DAEMON_URL_INTERVAL_S = float(os.environ.get('DAEMON_URL_INTERVAL_S', '3600'))
+# URLs sem dados (ou adiadas) voltam depois deste intervalo, se menor que o normal
+DAEMON_RETRY_S = float(os.environ.get('DAEMON_RETRY_S', '900'))
+DAEMON_BATCH_SIZE = int(os.environ.get('DAEMON_BATCH_SIZE', '20'))
+DAEMON_HOST = os.environ.get('DAEMON_HOST', '127.0.0.1')
+DAEMON_PORT = int(os.environ.get('DAEMON_PORT', '8080'))
+# De quanto em quanto tempo o catálogo é verificado quando não há URL vencida
+CATALOG_POLL_S = 30
+
+
+def catalog_mtime(path=CATALOG_FILE):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def load_catalog(path=CATALOG_FILE):
+    """URLs do catálogo (lista JSON em path) ou, sem o arquivo, execucao.COMBINED_URLS."""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return list(dict.fromkeys(json.load(f)))
+    from execucao import COMBINED_URLS
+
+    return list(dict.fromkeys(COMBINED_URLS))
+
+
+class UrlSchedule:
+    """Agenda contínua: cada URL volta a vencer interval segundos depois de raspada.
+
+    URLs novas são espalhadas ao longo de um intervalo, para o trabalho sair
+    num fluxo constante e não em rajadas de hora em hora.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_due = {}
+
+    def update(self, urls):
+        now = time.monotonic()
+        current = set(urls)
+        new = [url for url in urls if url not in self.next_due]
+        self.next_due = {url: due for url, due in self.next_due.items() if url in current}
+        step = self.interval / max(len(new), 1)
+        for idx, url in enumerate(new):
+            self.next_due[url] = now + idx * step
+
+    def due(self, limit):
+        now = time.monotonic()
+        vencidas = sorted((due, url) for url, due in self.next_due.items() if due <= now)
+        return [url for _, url in vencidas[:limit]]
+
+    def done(self, urls, delay=None):
+        """Reagenda as URLs para daqui a delay segundos (padrão: o intervalo)."""
+        now = time.monotonic()
+        delay = self.interval if delay is None else min(delay, self.interval)
+        for url in urls:
+            if url in self.next_due:
+                self.next_due[url] = now + delay
+
+    def seconds_until_next(self):
+        if not self.next_due:
+            return float('inf')
+        return max(0.0, min(self.next_due.values()) - time.monotonic())
+
+
+class ScraperDaemon:
+    def __init__(self, catalog_path=CATALOG_FILE, interval=None, batch_size=None, host=None, port=None):
+        self.catalog_path = catalog_path
+        self.batch_size = batch_size or DAEMON_BATCH_SIZE
+        self.host = host or DAEMON_HOST
+        self.port = port or DAEMON_PORT
+        self.schedule = UrlSchedule(interval or DAEMON_URL_INTERVAL_S)
+        self.catalog = []
+        self.catalog_mtime = None
+        self.crawler = None
+        # Estado que atravessa os ciclos: circuitos dos marketplaces e o recycle do crawler
+        self.breakers = MarketplaceBreakers()
+        self.governor = MemoryGovernor()
+        self.browser_pool = None
+        self.session = None
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.cycles = 0
+        self.last_cycle = None
+        self.last_error = None
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._reload_requested = True
+
+    async def reload_catalog(self):
+        """Relê o catálogo se o arquivo mudou (ou se um reload foi pedido), numa thread."""
+        mtime = await asyncio.to_thread(catalog_mtime, self.catalog_path)
+        if not self._reload_requested and mtime == self.catalog_mtime:
+            return
+        self._reload_requested = False
+        try:
+            catalog = await asyncio.to_thread(load_catalog, self.catalog_path)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f'Erro ao carregar o catálogo {self.catalog_path}: {e}')
+            return
+        self.catalog_mtime = mtime
+        self.catalog = catalog
+        self.schedule.update(catalog)
+        print(f'Catálogo carregado: {len(catalog)} URLs')
+
+    def request_reload(self):
+        self._reload_requested = True
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    async def _start_resources(self):
+        import aiohttp
+
+        self.browser_pool = await BrowserPool().start()
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20))
+        install(self.browser_pool, self.session)
+
+    async def _ensure_crawler(self, urls):
+        """Sobe o navegador do crawl4ai na primeira URL que precisa dele.
+
+        O recycle (por páginas ou memória) fica com self.governor, que
+        process_urls aplica ao mesmo crawler.
+        """
+        if self.crawler is not None or not any(
+            (adapter := ADAPTERS.for_url(url)) is not None and adapter.uses_crawler for url in urls
+        ):
+            return
+        from crawl4ai import AsyncWebCrawler
+
+        self.crawler = AsyncWebCrawler(config=await build_browser_config())
+        await self.crawler.start()
+
+    async def _close_resources(self):
+        install()
+        await AUTH_STATE.flush()
+        if self.crawler is not None:
+            await self.crawler.close()
+        if self.session is not None:
+            await self.session.close()
+        if self.browser_pool is not None:
+            await self.browser_pool.close()
+
+    async def run_cycle(self, urls):
+        started = time.time()
+        await self._ensure_crawler(urls)
+        outcomes = await process_urls(
+            urls, crawler=self.crawler, breakers=self.breakers, governor=self.governor, retry_sem_dados=False,
+        )
+        failed = [url for url in urls if outcomes.get(url) != 'ok']
+        self.schedule.done([url for url in urls if outcomes.get(url) == 'ok'])
+        self.schedule.done(failed, DAEMON_RETRY_S)
+        self.cycles += 1
+        contagem = {}
+        for status in outcomes.values():
+            contagem[status] = contagem.get(status, 0) + 1
+        self.last_cycle = {
+            'inicio': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+            'duracao_s': round(time.time() - started, 2),
+            'urls': len(urls),
+            'resultados': contagem,
+        }
+
+    async def _wait(self, seconds):
+        if self._stop.is_set():
+            return
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig, handler in ((signal.SIGTERM, self.stop), (signal.SIGINT, self.stop), (signal.SIGHUP, self.request_reload)):
+            try:
+                loop.add_signal_handler(sig, handler)
+            except (NotImplementedError, AttributeError):
+                pass
+        await self._start_resources()
+        runner = await self._start_server()
+        print(f'Daemon no ar: status em http://{self.host}:{self.port}/status')
+        try:
+            while not self._stop.is_set():
+                await self.reload_catalog()
+                batch = self.schedule.due(self.batch_size)
+                if not batch:
+                    await self._wait(min(self.schedule.seconds_until_next(), CATALOG_POLL_S))
+                    continue
+                try:
+                    await self.run_cycle(batch)
+                    self.last_error = None
+                except Exception as e:
+                    print(f'Erro no ciclo do daemon: {e}')
+                    self.last_error = str(e)
+                    self.schedule.done(batch)
+                    await self._wait(CATALOG_POLL_S)
+        finally:
+            await runner.cleanup()
+            await self._close_resources()
+            print('Daemon encerrado')
+
+    def status(self):
+        return {
+            'iniciado_em': self.started_at,
+            'ciclos': self.cycles,
+            'catalogo': self.catalog_path if self.catalog_mtime is not None else 'execucao.COMBINED_URLS',
+            'urls_no_catalogo': len(self.catalog),
+            'proxima_url_em_s': round(min(self.schedule.seconds_until_next(), 1e9), 1),
+            'ultimo_ciclo': self.last_cycle,
+            'ultimo_erro': self.last_error,
+            'crawler_aquecido': self.crawler is not None,
+            'navegadores': self.browser_pool.status() if self.browser_pool is not None else {},
+        }
+
+    async def _start_server(self):
+        from aiohttp import web
+
+        async def health(request):
+            return web.json_response({'status': 'ok', 'ciclos': self.cycles, 'ultimo_erro': self.last_error})
+
+        async def status(request):
+            return web.json_response(self.status())
+
+        app = web.Application()
+        app.router.add_get('/health', health)
+        app.router.add_get('/status', status)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        return runner
+
+
+if __name__ == '__main__':
+    asyncio.run(ScraperDaemon().run())
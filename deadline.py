@@ -0,0 +1,67 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+
+# Orçamento de tempo de cada URL e da execução inteira (segundos; 0 = sem limite)
+URL_DEADLINE_S = float(os.environ.get('URL_DEADLINE_S', '120'))
+RUN_DEADLINE_S = float(os.environ.get('RUN_DEADLINE_S', '0'))
+
+_current = contextvars.ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(Exception):
+    """O orçamento de tempo da URL (ou da execução) acabou."""
+
+
+class Deadline:
+    """Prazo absoluto do qual todas as esperas de uma URL descontam.
+
+    Com parent (o prazo da execução), o que restar for menor vale.
+    seconds=None ou 0 significa sem limite próprio.
+    """
+
+    def __init__(self, seconds=None, parent=None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+        self.parent = parent
+
+    def remaining(self):
+        """Segundos restantes (float('inf') se não há limite)."""
+        left = self.expires_at - time.monotonic() if self.expires_at is not None else float('inf')
+        if self.parent is not None:
+            left = min(left, self.parent.remaining())
+        return left
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout_ms(self, cap_ms):
+        """O menor entre cap_ms e o tempo restante, em ms; levanta DeadlineExceeded se acabou."""
+        left = self.remaining()
+        if left <= 0:
+            raise DeadlineExceeded('orçamento de tempo esgotado')
+        # Nunca 0: para o Playwright, timeout=0 significa esperar para sempre
+        return max(1, int(min(cap_ms, left * 1000)))
+
+
+@contextmanager
+def use_deadline(deadline):
+    """Torna deadline o prazo corrente, visto por timeout_ms() nas tarefas filhas."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def current_deadline():
+    return _current.get()
+
+
+def timeout_ms(cap_ms):
+    """Timeout (ms) de um passo da extração: cap_ms limitado pelo prazo corrente, se houver."""
+    deadline = _current.get()
+    if deadline is None:
+        return cap_ms
+    return deadline.timeout_ms(cap_ms)
@@ -0,0 +1,71 @@
+import asyncio
+
+
+class ScrapeDedup:
+    """Uma raspagem por produto na execução.
+
+    URLs diferentes do mesmo produto (mesma chave de key_func, ex.:
+    ADAPTERS.product_key) recebem o resultado da primeira raspagem, esteja
+    ela em andamento ou já concluída.
+    """
+
+    def __init__(self, key_func):
+        self.key_func = key_func
+        self.shared = 0
+        self._results = {}
+
+    def known(self, url):
+        """True se o produto de url já foi (ou está sendo) raspado nesta execução."""
+        return self.key_func(url) in self._results
+
+    async def run(self, url, fetch):
+        """Resultado de fetch() para o produto de url, raspando só na primeira vez."""
+        key = self.key_func(url)
+        task = self._results.get(key)
+        if task is None:
+            task = self._results[key] = asyncio.ensure_future(fetch())
+        else:
+            self.shared += 1
+            print(f'{url} é o mesmo produto que uma URL já raspada ({key}), reaproveitando o resultado')
+        return await asyncio.shield(task)
+
+    def group(self, urls):
+        """Separa as URLs em representantes (uma por produto) e {representante: [duplicadas]}."""
+        first = {}
+        duplicates = {}
+        for url in urls:
+            key = self.key_func(url)
+            if key in first:
+                duplicates.setdefault(first[key], []).append(url)
+                self.shared += 1
+            else:
+                first[key] = url
+        return list(first.values()), duplicates
+
+
+class OfferDedup:
+    """Descarta ofertas cujo key_sku já foi gravado nesta execução."""
+
+    def __init__(self):
+        self.dropped = 0
+        self._seen = set()
+
+    def filter(self, offers):
+        novas = []
+        for offer in offers:
+            key = offer.key_sku
+            if key is not None and key in self._seen:
+                self.dropped += 1
+                continue
+            if key is not None:
+                self._seen.add(key)
+            novas.append(offer)
+        return novas
+
+
+async def expand_duplicates(source, duplicates):
+    """Repete cada (url, resultado) de source para as URLs duplicadas da mesma."""
+    async for url, result in source:
+        yield url, result
+        for duplicate in duplicates.get(url, ()):
+            yield duplicate, result
@@ -1,13 +1,15 @@
 import re
 import logging
 import asyncio
-import aiohttp
 from datetime import datetime
 from typing import List, Dict
-from crawl4ai import AsyncWebCrawler
-import json
 import os
 
+from api_client import BatchedApiClient
+from details_cache import DetailsHashStore, content_hash, load_changed_skus
+from serialization import wire_stats
+from state_files import load_json, save_json
+
 # Configura o logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,12 +17,38 @@ logger = logging.getLogger(__name__)
 # Arquivo para persistir URLs com erro
 FAILED_URLS_FILE = 'failed_urls.json'
 
-
-def save_failed_urls(failed_urls: List[str]):
-    """Salva URLs com erro em um arquivo JSON."""
+DETAILS_API_URL = os.environ.get(
+    'DETAILS_API_URL', 'https://streamlit-apirest.onrender.com/api/productsdetails'
+)
+# Páginas crawleadas ao mesmo tempo e itens por requisição à API
+DETAILS_CONCURRENCY = int(os.environ.get('DETAILS_CONCURRENCY', '8'))
+DETAILS_BATCH_SIZE = int(os.environ.get('DETAILS_BATCH_SIZE', '50'))
+DETAILS_PAGE_TIMEOUT = 60000  # ms
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+# Ignora os hashes salvos e reenvia todos os detalhes
+DETAILS_FORCE = os.environ.get('DETAILS_FORCE', '0') == '1'
+
+SKU_PATTERN = r'\*\*Cod:\*\* (MP\d+|\d+)'
+# Trechos do markdown lidos por extract_data_from_markdown; só eles entram no hash
+DETAIL_SECTION_PATTERNS = [
+    (r'Categorias\s*\n((?:\[[^\]]+\]\([^\)]+\)\s*)+)', 0),
+    (r'Tipos de Cabelo\s*[\n\s]*((?:(?:\*\*\s*)?\[[^\]]+\]\([^\)]+\)(?:\s*\*\*)?\s*)+)', re.DOTALL),
+    (r'Condição dos Fios\s*[\n\s]*((?:(?:\*\*\s*)?\[[^\]]+\]\([^\)]+\)(?:\s*\*\*)?\s*)+)', re.DOTALL),
+    (r'Desejo de Beleza\s*([^\n]+)', 0),
+    (r'Tamanho\s*\*\*\s*\[([^\]]+)\]\([^\)]+\)\s*\*\*', 0),
+    (r'Propriedades\s*\*\*\s*\[([^\]]+)\]\([^\)]+\)\s*\*\*', 0),
+    (r'Marca\s*\*\*\s*\[([^\]]+)\]\([^\)]+\)\s*\*\*', 0),
+    (r'Linha\s*\*\*\s*\[([^\]]+)\]\([^\)]+\)\s*\*\*', 0),
+    (r'###\s*Detalhes\s*([\s\S]+?)(?=(###\s*Como Usar|###\s*Ação / Resultado|$))', re.DOTALL),
+    (r'###\s*Como Usar\s*([\s\S]+?)(?=(###\s*Ação / Resultado|$))', re.DOTALL),
+    (r'###\s*Ação / Resultado\s*([\s\S]+?)(?=(##|\n\s*Avaliações|\n\s*\[|$))', re.DOTALL),
+]
+
+
+async def save_failed_urls(failed_urls: List[str]):
+    """Salva URLs com erro em um arquivo JSON (numa thread, com escrita atômica)."""
     try:
-        with open(FAILED_URLS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(failed_urls, f, ensure_ascii=False, indent=2)
+        await save_json(FAILED_URLS_FILE, failed_urls, indent=2)
         logger.info(
             f'URLs com erro salvas em {FAILED_URLS_FILE}: {failed_urls}'
         )
@@ -28,17 +56,33 @@ def save_failed_urls(failed_urls: List[str]):
         logger.error(f'Erro ao salvar URLs com erro: {e}')
 
 
-def load_failed_urls() -> List[str]:
+async def load_failed_urls() -> List[str]:
     """Carrega URLs com erro do arquivo JSON."""
-    if os.path.exists(FAILED_URLS_FILE):
-        try:
-            with open(FAILED_URLS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f'Erro ao carregar URLs com erro: {e}')
+    try:
+        return await load_json(FAILED_URLS_FILE, [])
+    except Exception as e:
+        logger.error(f'Erro ao carregar URLs com erro: {e}')
     return []
 
 
+def extract_sku(markdown: str):
+    """Retorna o SKU (Cod:) do markdown, ou None."""
+    sku_match = re.search(SKU_PATTERN, markdown)
+    return sku_match.group(1) if sku_match else None
+
+
+def relevant_sections(markdown: str) -> str:
+    """
+    Junta os trechos do markdown usados pelo modelo ProductDetails, ignorando
+    o resto da página (preços, estoque, recomendações), que muda a toda hora.
+    """
+    sections = []
+    for pattern, flags in DETAIL_SECTION_PATTERNS:
+        match = re.search(pattern, markdown, flags)
+        sections.append(match.group(1) if match else '')
+    return '\n\x1e'.join(sections)
+
+
 def extract_data_from_markdown(markdown: str) -> List[Dict]:
     """
     Extrai dados do Markdown para o model ProductDetails e retorna uma lista de dicionários.
@@ -229,134 +273,180 @@ def extract_data_from_markdown(markdown: str) -> List[Dict]:
     return products
 
 
-async def crawl_url(crawler, url):
+class DetailsUploader:
     """
-    Extrai dados de uma URL e retorna uma lista de ProductDetails.
-    """
-    logging.info(f'Extraindo dados da URL: {url}')
-    try:
-        result = await crawler.arun(
-            url,
-            timeout=60,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            },
-        )
-        markdown_content = result.markdown
-        products = extract_data_from_markdown(markdown_content)
-        if not products:
-            logging.warning(f'Sem dados ou SKU não encontrado para {url}')
-        logging.info(f'Extraídos {len(products)} itens da URL {url}')
-        return products
-    except Exception as e:
-        logging.error(f'Erro ao crawlear a URL {url}: {e}')
-        return []
+    Decide, a partir do markdown de uma página, se os detalhes do produto
+    precisam ser extraídos e enviados, e os encaminha ao BatchedApiClient.
 
-
-async def send_to_api(data):
-    """
-    Envia os dados para a API hospedada.
+    Os hashes só são gravados no DetailsHashStore depois que o cliente
+    confirma o envio (finish), para que falhas sejam refeitas na próxima
+    execução. Com max_age (segundos), SKUs verificados há menos tempo que
+    isso nem são comparados.
     """
-    api_url = 'https://streamlit-apirest.onrender.com/api/productsdetails'
-    async with aiohttp.ClientSession() as session:
+
+    def __init__(self, client, hash_store=None, force=False, max_age=None):
+        self.client = client
+        self.hash_store = hash_store or DetailsHashStore()
+        self.force = force
+        self.max_age = max_age
+        self.unchanged_count = 0
+        # url -> (sku, hash do markdown, hash do resultado) aguardando confirmação
+        self._pending = {}
+
+    async def handle(self, url: str, markdown: str) -> str:
+        """
+        Processa o markdown de uma URL. Retorna 'em_cache', 'inalterado',
+        'enviado' ou 'falha' (sem dados extraídos).
+        """
+        if self.hash_store.hashes is None:
+            await asyncio.to_thread(self.hash_store.load)
+        markdown = markdown or ''
+        sku = extract_sku(markdown)
+        if (
+            sku
+            and not self.force
+            and self.max_age
+            and self.hash_store.is_fresh(sku, self.max_age)
+        ):
+            return 'em_cache'
+        markdown_hash = content_hash(relevant_sections(markdown))
+        if (
+            sku
+            and not self.force
+            and self.hash_store.markdown_unchanged(sku, markdown_hash)
+        ):
+            logging.info(f'Detalhes sem alteração para {sku}, pulando {url}')
+            self.hash_store.touch(sku)
+            self.unchanged_count += 1
+            return 'inalterado'
         try:
-            # Envia a lista diretamente
-            json_data = json.dumps(data, ensure_ascii=False)
-            logging.info(f'Enviando dados para {api_url}: {json_data}')
-            async with session.post(
-                api_url,
-                data=json_data,
-                headers={'Content-Type': 'application/json'},
-            ) as response:
-                response_text = await response.text()
-                logging.info(
-                    f'Status da resposta (POST): {response.status}, Resposta: {response_text}'
-                )
-                return response.status
-        except json.JSONDecodeError as e:
-            logging.error(f'Erro ao serializar JSON: {e}')
-            return None
+            products = extract_data_from_markdown(markdown)
         except Exception as e:
-            logging.error(f'Erro ao enviar dados para a API (POST): {e}')
-            return None
+            logging.error(f'Erro geral ao processar {url}: {e}')
+            products = []
+        if not products:
+            return 'falha'
+        parsed_hash = content_hash(products)
+        if not self.force and self.hash_store.parsed_unchanged(sku, parsed_hash):
+            # O markdown mudou, mas não o que enviamos: só atualiza o hash
+            self.hash_store.update(sku, markdown_hash, parsed_hash, changed=False)
+            self.unchanged_count += 1
+            return 'inalterado'
+        self._pending[url] = (sku, markdown_hash, parsed_hash)
+        await self.client.add(url, products)
+        return 'enviado'
+
+    async def finish(self):
+        """Grava os hashes das URLs cujo envio foi confirmado. Chamar após o flush do cliente."""
+        if self.hash_store.hashes is None:
+            await asyncio.to_thread(self.hash_store.load)
+        for url in self.client.saved_keys:
+            if url in self._pending:
+                self.hash_store.update(*self._pending[url])
+        await asyncio.to_thread(self.hash_store.save)
+        logging.info(
+            f'{len(self.hash_store.changed)} SKUs alterados, {self.unchanged_count} sem alteração'
+        )
 
 
-async def update_to_api(data):
-    """
-    Implementação futura para PUT, se necessário.
+async def process_urls(urls, concurrency=None, batch_size=None, force=None):
     """
-    pass
+    Processa URLs com concorrência limitada num único crawler e envia os
+    resultados em lotes. URLs com erro da execução anterior vão para o início
+    da lista e as que falharem nesta execução são salvas para a próxima.
 
-
-async def process_urls(urls):
-    """
-    Processa URLs sequencialmente, coleta URLs com erro e as move para o início da lista.
+    SKUs cujas seções de detalhes não mudaram desde o último envio são
+    pulados (sem extração nem POST), a menos que force seja verdadeiro.
     """
-    total_urls = len(urls)
-    logging.info(f'Total de URLs a processar: {total_urls}')
+    concurrency = concurrency or DETAILS_CONCURRENCY
+    batch_size = batch_size or DETAILS_BATCH_SIZE
+    force = DETAILS_FORCE if force is None else force
+    wire_stats.reset()
 
     # Carrega URLs com erro de execuções anteriores
-    failed_urls = load_failed_urls()
+    failed_urls = await load_failed_urls()
     logging.info(f'URLs com erro carregadas: {failed_urls}')
 
     # Adiciona URLs com erro no início da lista, evitando duplicatas
     urls = failed_urls + [url for url in urls if url not in failed_urls]
-    logging.info(f'Lista de URLs atualizada com {len(urls)} itens')
-
-    # Lista para armazenar URLs que falharam na execução atual
-    current_failed_urls = []
+    total_urls = len(urls)
+    logging.info(f'Total de URLs a processar: {total_urls}')
 
-    async with AsyncWebCrawler(verbose=True) as crawler:
-        processed_count = 0
-        api_url = 'http://127.0.0.1:8000/api/productsdetails'
-        for url in urls:
-            processed_count += 1
-            logging.info(
-                f'Processando {processed_count}/{total_urls} URLs: {url}'
-            )
-            try:
-                result = await crawl_url(crawler, url)
-                logger.info(
-                    f'Resultado para {url}:\n{json.dumps(result, ensure_ascii=False, indent=2)}'
+    # URLs que falharam no crawl ou na extração nesta execução
+    current_failed_urls = set()
+    handled = set()
+
+    # Importado aqui: quem só usa DetailsUploader (scrape_combined) não carrega o crawl4ai
+    from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
+    from crawl4ai.async_dispatcher import SemaphoreDispatcher
+
+    browser_config = BrowserConfig(headless=True, user_agent=USER_AGENT)
+    run_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        page_timeout=DETAILS_PAGE_TIMEOUT,
+        stream=True,
+    )
+    dispatcher = SemaphoreDispatcher(
+        semaphore_count=concurrency, max_session_permit=concurrency
+    )
+
+    processed_count = 0
+    async with AsyncWebCrawler(config=browser_config) as crawler, BatchedApiClient(
+        DETAILS_API_URL, batch_size=batch_size
+    ) as client:
+        uploader = DetailsUploader(client, force=force)
+        try:
+            async for result in await crawler.arun_many(
+                urls=urls, config=run_config, dispatcher=dispatcher
+            ):
+                processed_count += 1
+                url = result.url
+                handled.add(url)
+                logging.info(
+                    f'Processando {processed_count}/{total_urls} URLs: {url}'
                 )
-
-                if result:
-                    post_status = await send_to_api(result)
-                    if post_status in (200, 201):
-                        logging.info(
-                            f'Dados enviados com sucesso para {url}, POST concluído.'
-                        )
-                    elif post_status == 400:
-                        put_status = await update_to_api(result)
-                        if put_status != 202:
-                            logging.warning(
-                                f'Falha ao atualizar dados para {api_url} (Status: {put_status})'
-                            )
-                            current_failed_urls.append(url)
-                    else:
-                        logging.warning(
-                            f'Falha ao enviar dados para {api_url} (Status: {post_status})'
-                        )
-                        current_failed_urls.append(url)
-                else:
+                if not result.success:
+                    logging.error(
+                        f'Erro ao crawlear a URL {url}: {result.error_message}'
+                    )
+                    current_failed_urls.add(url)
+                    continue
+                if await uploader.handle(url, result.markdown) == 'falha':
                     logging.warning(
                         f'Falha ou sem dados para {url}, marcando para reprocessamento'
                     )
-                    current_failed_urls.append(url)
-            except Exception as e:
-                logging.error(f'Erro geral ao processar {url}: {e}')
-                current_failed_urls.append(url)
+                    current_failed_urls.add(url)
+        except Exception as e:
+            logging.error(f'Erro no processamento em lote: {e}')
+            # O que não chegou a ser crawleado fica para a próxima execução
+            current_failed_urls.update(
+                url for url in urls if url not in handled
+            )
 
-        logging.info(
-            f'Processamento concluído: {processed_count}/{total_urls} URLs processadas'
-        )
-        logging.info(f'URLs com erro nesta execução: {current_failed_urls}')
+    current_failed_urls.update(client.failed_keys)
+    await uploader.finish()
+    # Mantém a ordem original da lista ao persistir
+    failed_in_order = [url for url in urls if url in current_failed_urls]
+
+    logging.info(
+        f'Processamento concluído: {processed_count}/{total_urls} URLs processadas'
+    )
+    logging.info(f'URLs com erro nesta execução: {failed_in_order}')
+    logging.info(f'Tráfego para a API: {wire_stats.summary()}')
 
-        # Salva URLs com erro para a próxima execução
-        save_failed_urls(current_failed_urls)
+    # Salva URLs com erro para a próxima execução
+    await save_failed_urls(failed_in_order)
 
 
 if __name__ == '__main__':
+    import sys
+
+    # "python details.py --changed" lista os SKUs alterados na última execução
+    if '--changed' in sys.argv:
+        for sku in load_changed_skus():
+            print(sku)
+        sys.exit(0)
+
     # Exemplo de URLs
     beleza_na_web_urls = [
         'https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-mascara-capilar-500ml/',
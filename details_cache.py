@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from state_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Hashes por SKU da última versão enviada à API
+DETAILS_HASHES_FILE = 'details_hashes.json'
+# SKUs que mudaram na última execução
+DETAILS_CHANGED_FILE = 'details_changed.json'
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def utc_now() -> str:
+    """Data e hora atuais em UTC, no formato dos arquivos de cache."""
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def content_hash(value) -> str:
+    """Hash estável de um texto ou de uma estrutura serializável em JSON."""
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+class DetailsHashStore:
+    """
+    Guarda, por SKU, o hash das seções relevantes do markdown e o hash do
+    resultado de extract_data_from_markdown. Permite pular a extração e o
+    envio quando nada mudou desde a última execução.
+
+    Os hashes são lidos em load() e gravados em save(), que bloqueiam e
+    devem rodar numa thread quando chamados do event loop.
+    """
+
+    def __init__(self, path: str = DETAILS_HASHES_FILE):
+        self.path = path
+        self.hashes = None
+        self.changed = []
+
+    def load(self):
+        """Lê os hashes do arquivo, se ainda não foram lidos."""
+        if self.hashes is None:
+            self.hashes = self._load()
+
+    def _load(self) -> dict:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f'Erro ao carregar {self.path}: {e}')
+        return {}
+
+    def markdown_unchanged(self, sku: str, markdown_hash: str) -> bool:
+        return self.hashes.get(sku, {}).get('markdown') == markdown_hash
+
+    def parsed_unchanged(self, sku: str, parsed_hash: str) -> bool:
+        return self.hashes.get(sku, {}).get('parsed') == parsed_hash
+
+    def is_fresh(self, sku: str, max_age: float) -> bool:
+        """True se o SKU foi verificado há menos de max_age segundos."""
+        checked = self.hashes.get(sku, {}).get('atualizado_em')
+        if not checked:
+            return False
+        try:
+            checked_at = datetime.strptime(checked, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            return False
+        return (datetime.now(timezone.utc) - checked_at).total_seconds() < max_age
+
+    def touch(self, sku: str):
+        """Marca o SKU como verificado agora, sem alterar os hashes."""
+        if sku in self.hashes:
+            self.hashes[sku]['atualizado_em'] = utc_now()
+
+    def update(self, sku: str, markdown_hash: str, parsed_hash: str, changed: bool = True):
+        """Registra os hashes de um SKU; changed indica se o conteúdo enviado mudou."""
+        self.hashes[sku] = {
+            'markdown': markdown_hash,
+            'parsed': parsed_hash,
+            'atualizado_em': utc_now(),
+        }
+        if changed:
+            self.changed.append(sku)
+
+    def save(self):
+        """Persiste os hashes e a lista de SKUs alterados nesta execução (escrita atômica)."""
+        if self.hashes is None:
+            return
+        try:
+            write_json_atomic(self.path, self.hashes, indent=2)
+            write_json_atomic(
+                DETAILS_CHANGED_FILE,
+                {'data_hora': utc_now(), 'skus': self.changed},
+                indent=2,
+            )
+            logger.info(f'{len(self.changed)} SKUs alterados nesta execução')
+        except Exception as e:
+            logger.error(f'Erro ao salvar hashes de detalhes: {e}')
+
+def load_changed_skus() -> list:
+    """Retorna os SKUs que mudaram na última execução."""
+    if os.path.exists(DETAILS_CHANGED_FILE):
+        try:
+            with open(DETAILS_CHANGED_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get('skus', [])
+        except Exception as e:
+            logger.error(f'Erro ao carregar {DETAILS_CHANGED_FILE}: {e}')
+    return []
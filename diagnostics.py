@@ -0,0 +1,211 @@
+"""Diagnóstico opcional do event loop: atraso (lag) e perfil por amostragem.
+
+LOOP_LAG_MONITOR=1: uma corrotina mede o atraso do loop a cada
+LOOP_LAG_INTERVAL_MS e uma thread vigia; quando o loop fica parado mais de
+LOOP_LAG_THRESHOLD_MS, a thread captura a pilha da thread do loop, ou seja,
+a chamada que está bloqueando. O relatório lista esses pontos por tempo
+total bloqueado.
+
+CPU_PROFILE=1: uma thread amostra as pilhas de todas as threads a cada
+CPU_PROFILE_INTERVAL_MS (ignorando as ociosas, paradas em select/wait) e
+grava dados/perfil-<run_id>.folded no formato de pilhas colapsadas
+("a;b;c contagem"), aceito por flamegraph.pl, speedscope e inferno.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from run_metrics import percentile
+from sinks import DATA_DIR
+
+LOOP_LAG_MONITOR = os.environ.get('LOOP_LAG_MONITOR', '0') == '1'
+LOOP_LAG_THRESHOLD_MS = float(os.environ.get('LOOP_LAG_THRESHOLD_MS', '100'))
+LOOP_LAG_INTERVAL_MS = float(os.environ.get('LOOP_LAG_INTERVAL_MS', '20'))
+CPU_PROFILE = os.environ.get('CPU_PROFILE', '0') == '1'
+CPU_PROFILE_INTERVAL_MS = float(os.environ.get('CPU_PROFILE_INTERVAL_MS', '10'))
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Frames mais internos de uma thread parada esperando (e não trabalhando)
+_IDLE_FILES = ('selectors.py', 'threading.py', 'queue.py', os.path.join('concurrent', 'futures', 'thread.py'))
+
+
+def _frames(frame):
+    """Frames da pilha, do mais externo para o mais interno."""
+    stack = []
+    while frame is not None:
+        stack.append(frame)
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _path(filename):
+    if filename.startswith(PROJECT_DIR):
+        return os.path.relpath(filename, PROJECT_DIR)
+    return os.path.basename(filename)
+
+
+def _label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({_path(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _where(frame):
+    return f'{_path(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}'
+
+
+def _call_site(stack):
+    """(frame do projeto, frame mais interno) de uma pilha: onde o nosso código chamou o que bloqueou."""
+    innermost = stack[-1]
+    own = next((f for f in reversed(stack) if f.f_code.co_filename.startswith(PROJECT_DIR)), innermost)
+    return _where(own), _where(innermost)
+
+
+class LoopLagMonitor:
+    """Mede o atraso do event loop e registra as chamadas que o bloquearam."""
+
+    def __init__(self, threshold_ms=None, interval_ms=None):
+        self.threshold = (threshold_ms or LOOP_LAG_THRESHOLD_MS) / 1000
+        self.interval = (interval_ms or LOOP_LAG_INTERVAL_MS) / 1000
+        self.lags = []
+        self.sites = {}
+        self._beat = time.monotonic()
+        self._stalled_at = None
+        self._stop = threading.Event()
+        self._task = None
+        self._thread = None
+        self._loop_thread = None
+
+    def start(self):
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name='loop-lag-monitor', daemon=True)
+        self._thread.start()
+        return self
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._beat = now
+            site, self._stalled_at = self._stalled_at, None
+            self.lags.append(lag)
+            if lag >= self.threshold:
+                stats = self.sites.setdefault(site or ('(não capturado)', ''), [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += lag
+                stats[2] = max(stats[2], lag)
+
+    def _watch(self):
+        # Verifica com folga o bastante para pegar a chamada ainda em andamento
+        while not self._stop.wait(self.threshold / 2):
+            if self._stalled_at is not None or time.monotonic() - self._beat <= self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._stalled_at = _call_site(_frames(frame))
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    def report(self):
+        sites = sorted(self.sites.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            'amostras': len(self.lags),
+            'p50_ms': round(percentile(self.lags, 50) * 1000, 1),
+            'p99_ms': round(percentile(self.lags, 99) * 1000, 1),
+            'max_ms': round(max(self.lags, default=0.0) * 1000, 1),
+            'bloqueios': [
+                {'local': own, 'chamada': inner, 'vezes': count,
+                 'total_ms': round(total * 1000, 1), 'max_ms': round(longest * 1000, 1)}
+                for (own, inner), (count, total, longest) in sites
+            ],
+        }
+
+    def print_report(self, limit=10):
+        report = self.report()
+        print(f"Atraso do event loop: p50 {report['p50_ms']} ms, p99 {report['p99_ms']} ms, "
+              f"máx {report['max_ms']} ms ({report['amostras']} amostras)")
+        if not report['bloqueios']:
+            print(f'  Nenhum bloqueio acima de {self.threshold * 1000:.0f} ms')
+        for site in report['bloqueios'][:limit]:
+            print(f"  {site['local']} -> {site['chamada']}: {site['vezes']}x, "
+                  f"total {site['total_ms']} ms, máx {site['max_ms']} ms")
+
+
+class SamplingProfiler:
+    """Amostra as pilhas de todas as threads e conta as pilhas colapsadas."""
+
+    def __init__(self, interval_ms=None, include_idle=False):
+        self.interval = (interval_ms or CPU_PROFILE_INTERVAL_MS) / 1000
+        self.include_idle = include_idle
+        self.samples = 0
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if not self.include_idle and frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = ';'.join(_label(f) for f in _frames(frame))
+                self.counts[f"{names.get(ident, ident)};{stack}"] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def save(self, run_id, directory=DATA_DIR):
+        """Grava as pilhas colapsadas em directory/perfil-<run_id>.folded."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'perfil-{run_id}.folded')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(f'{stack} {count}\n' for stack, count in self.counts.most_common())
+        return path
+
+
+def start_diagnostics():
+    """Inicia o que estiver ligado (LOOP_LAG_MONITOR, CPU_PROFILE); chamar dentro do event loop."""
+    monitor = LoopLagMonitor().start() if LOOP_LAG_MONITOR else None
+    profiler = SamplingProfiler().start() if CPU_PROFILE else None
+    return monitor, profiler
+
+
+def stop_diagnostics(monitor, profiler):
+    """Para o diagnóstico sem relatório (ex.: execução interrompida por erro)."""
+    if monitor is not None:
+        monitor.stop()
+    if profiler is not None:
+        profiler.stop()
+
+
+def finish_diagnostics(run_id, monitor, profiler):
+    """Para o diagnóstico iniciado por start_diagnostics e imprime/grava os resultados."""
+    if monitor is not None:
+        monitor.stop()
+        monitor.print_report()
+    if profiler is not None:
+        profiler.stop()
+        path = profiler.save(run_id)
+        print(f'Perfil por amostragem gravado em {path} ({profiler.samples} amostras a cada '
+              f'{profiler.interval * 1000:.0f} ms); abra com flamegraph.pl ou speedscope')
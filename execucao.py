@@ -2,330 +2,330 @@
 
 import time
 import asyncio
-import requests
 from datetime import datetime
 from scrape_combined_crawl4ai import process_urls, carregar_sem_dados_url
 import re
 
+# Catálogo padrão de URLs; o daemon (daemon.py) usa CATALOG_FILE se existir
+COMBINED_URLS = [
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-by-boca-rosa-hair-oleo-capilar-quartzo-liquido-65ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-cpr-step-3-condicionador-1l",
+    "https://www.belezanaweb.com.br/joico-kpak-color-therapy-smart-release-condicionador-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-kpak-color-therapy-smart-release-shampoo-1-litro/ofertas-marketplace",
+    "https://www.epocacosmeticos.com.br/pesquisa?q=7896235353652",
+    "https://www.epocacosmeticos.com.br/pesquisa?q=4064666318356",
+    "https://www.mercadolivre.com.br/wella-professionals-invigo-nutri-enrich-shampoo-1000ml/p/MLB19702074/s?pdp_filters=seller_id%3A1190258457",
+    "https://www.mercadolivre.com.br/shampoo-wella-invigo-nutri-enrich-1-litro-profissional/p/MLB20570794/s?pdp_filters=seller_id%3A1190258457",
+    "https://www.mercadolivre.com.br/cadiveu-maxi-ondas-ativador-de-cachos-200ml-waves/p/MLB25477625/s?pdp_filters=seller_id%3A1190258457",
+    "https://www.mercadolivre.com.br/cadiveu-boca-rosa-hair-quartzo-shine-protetor-termico-200ml/p/MLB19566993/s?pdp_filters=seller_id%3A1190258457",
+    "https://www.mercadolivre.com.br/deva-curl-supercream-creme-de-coco-250g/p/MLB19514996/s?pdp_filters=seller_id%3A1190258457",
+    "https://www.mercadolivre.com.br/wella-professionals-condicionador-fusion-200ml/p/MLB22343829/s?pdp_filters=seller_id%3A1190258457",
+    "https://www.mercadolivre.com.br/wella-oil-reflections-luminous-oleo-30ml/p/MLB19515342/s?pdp_filters=official_store%3A3667",
+    "https://www.mercadolivre.com.br/shampoo-wella-professionals-invigo-nutri-enrich-250ml/p/MLB19704103/s?pdp_filters=official_store%3A3667&page=1",
+    "https://www.mercadolivre.com.br/wella-invigo-color-brilliance-shampoo-250ml/p/MLB24006354/s",
+    "https://www.mercadolivre.com.br/mascara-capilar-invigo-color-brilliance-500ml-wella-professionals/p/MLB19703901/s",
+    "https://www.mercadolivre.com.br/condicionador-invigo-color-brilliance-wella-professionals-1-litro/p/MLB19704364/s",
+    "https://www.mercadolivre.com.br/shampoo-invigo-color-brilliance-1l-wella-professionals/p/MLB19506213/s",
+    "https://www.epocacosmeticos.com.br/pesquisa?q=8005610672427",
+    'https://www.mercadolivre.com.br/shampoo-wella-invigo-nutri-enrich-1-litro-profissional/p/MLB20570794/s',
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-shampoo-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-condicionador-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-mascara-capilar-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-shampoo-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-condicionador-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-mascara-capilar-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-luminous-reveal-shampoo-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-luminous-reboost-mascara-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-oleo-capilar-100ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-light-oleo-capilar-100ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-acai-oil-oleo-de-tratamento-60ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-cadiveu-professional-plastica-dos-fios-alinhamento-profissional-3-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-gradual-smoothing-mist-spray-protetor-termico-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-by-boca-rosa-hair-oleo-capilar-quartzo-liquido-65ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-one-condition-condicionador-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-mascara-capilar-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-heaven-in-hair-mascara-capilar-250g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-supercream-creme-modelador-250g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-leavein-protetor-termico-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-intensif-mascara-capilar-de-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-mascara-capilar-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-deep-moisturizing-conditioner-mascara-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-cpr-step-3-condicionador-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-condicionando-a-juba-hidronutritivo-condicionador-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-ondulando-a-juba-creme-de-pentear-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-modelando-a-juba-geleia-seladora-300g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-encrespando-a-juba-creme-de-pentear-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-juba-mascara-capilar-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-moisture-recovery-moisturizing-smart-release-shampoo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-kpak-to-repair-damage-hair-smart-release-shampoo-300ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-supercream-creme-modelador-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-one-condition-decadence-condicionador-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-proteina-condicionante-preshampoo-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-profissional-glamour-essentials-serum-capilar-65ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-leavein-nutritivo-215ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-glamour-essentials-fluido-condicionante-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-cadiveu-professional-essentials-hair-remedy-home-care-3-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-acai-oil-oleo-de-tratamento-60ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-acai-oil-oleo-de-acai-110ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-encrespando-a-juba-creme-de-pentear-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-cabeleira-crescimento-e-fortalecimento-fluido-fortificante-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-homecare-cadiveu-essentials-quartzo-shine-2-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-cadiveu-professional-plastica-dos-fios-alinhamento-profissional-3-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-homecare-cadiveu-essentials-quartzo-shine-2-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/aneethun-linha-a-mascara-capilar-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-styling-cream-creme-modelador-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-divine-antifrizz-condicionador-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-silk-moisture-condicionador-240ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-essentials-maxi-ondas-leavein-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-warming-express-mascara-de-nutricao-150ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-angell-leave-in-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-mascara-reparadora-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-mascara-de-tratamento-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-no-poo-shampoo-cremoso-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-heaven-in-hair-mascara-capilar-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/aneethun-linha-a-silicone-com-tutano-e-queratina-creme-capilar-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-original-shampoo-nopoo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-balm-leavein-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-leavein-150ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-low-poo-deligh-shampoo-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-no-poo-decadence-shampoo-sem-espuma-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-stages-nutrition-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-one-condition-delight-condicionador-355ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-essential-power-dose-ampola-de-tratamento-capilar-13ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-leavein-reparador-215ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-sem-sulfato-shampoo-reparador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-care-angell-modelador-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/widi-care-blend-de-oleos-vegetais-tratamento-capilar-60ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-angell-leavein-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-go-curly-leavein-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-shampoo-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-cadiveu-professional-glamour-essentials-home-care-2-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-condicionador-reparador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-go-curly-mascara-capilar-200g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/prohall-cosmetic-btx-blend-repair-tratamento-disciplinante-300g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-divine-antifrizz-shampoo-1000ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-stages-treatment-leavein-multifuncional-em-spray-260ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-moisture-recovery-smart-release-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-stage-hydration-mascara-capilar-200g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-mask-mascara-capilar-condicionadora-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-essentials-bye-bye-frizz-killer-leave-in-120ml",
+    "https://www.belezanaweb.com.br/cadiveu-professional-glamour-essentials-mascara-capilar-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-intensif-mascara-capilar-de-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-shampoo-low-poo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-divine-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-conditioner-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/aneethun-linha-a-shampoo-300ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-styling-cream-creme-de-pentear-250g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/jacques-janine-professionnel-bb-cream-finalizador-240ml",
+    "https://www.belezanaweb.com.br/jacques-janine-professionnel-liso-absoluto-fluido-termoativado-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-bond-angel-blonde-repair-mascara-capilar-200g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-essentials-hair-remedy-leavein-condicionante-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-kpak-to-repair-damage-hair-smart-release-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-beach-hair-day-finalizador-capilar-260ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-delight-shampoo-low-poo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-bond-angel-thermal-blond-leavein-matizador-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-stagesnutrition-condicionador-250-ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/kit-cadiveu-professional-plastica-dos-fios-2-produtos/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-essential-fluido-reparador-leavein-60ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-one-condition-decadence-condicionador-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/aneethun-repair-system-mascara-posquimica-250g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-revival-condicionador-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-decadence-shampoo-no-poo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-fiber-mask-efeito-teia-mascara-capilar-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-glamour-essentials-shampoo-250ml",
+    "https://www.belezanaweb.com.br/brae-divine-home-care-mascara-capilar-200g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-fusion-shampoo-1000ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-fusion-condicionador-1-litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-fusion-mascara-reparadora-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-mascara-capilar-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-cpr-step-0-shampoo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-silk-moisture-shampoo-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-silk-moisture-shampoo-280ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-intensif-mascara-capilar-de-500ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-balance-condicionador-240ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-true-hue-color-serum-capilar-55ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-balance-shampoo-280ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-smooth-shampoo-1000ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-silk-moisture-condicionador-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-fiber-mask-efeito-teia-mascara-capilar-500g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-revival-condicionador-1l",
+    "https://www.belezanaweb.com.br/brae-soul-color-condicionador-1litro/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-joifull-volumizing-smart-release-leavein-100ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/wella-professionals-color-motion-condicionador-1000ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/joico-blonde-life-brilliant-glow-brightening-oil-oleo-capilar-100ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/mp293269-mascara-cabelos-loiros-brae-stages-blonding-200g/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-shampoo-stages-blonding-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/mp293272-mascara-cabelos-coloridos-brae-stages-color-protect-200g",
+    "https://www.belezanaweb.com.br/brae-stages-colors-protect-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/brae-stage-hydration-shampoo-250ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-final-style-extra-shine-spray-de-brilho-150ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-true-hue-shampoo-sem-sulfato-280ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-inner-restore-deep-moisturizing-mascara-de-hidratacao-50ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-true-hue-condicionador-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/senscience-cpr-step-1-porosity-reconstructor-tratamento-reconstrutor1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-blonde-reconstructor-ph-balancing-mask-mascara-capilar-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-soft-sense-condicionador-3l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-hair-remedy-condicionador-980ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-mascara-capilar-980ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-condicionador-980ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-shampoo-980ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-wave-maker-ativador-de-cachos-180ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-mist-er-right-finalizador-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-bleave-in-finalizador-condicionante-200ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-b-leavein-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-set-it-free-finalizador-120ml/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-one-condition-delight-condicionador-1l/ofertas-marketplace",
+    "https://www.belezanaweb.com.br/deva-curl-low-poo-shampoo-355ml/ofertas-marketplace",
+    "https://www.amazon.com.br/dp/B07KSDBVJW",
+    "https://www.amazon.com.br/dp/B0933L5RJC",
+    "https://www.amazon.com.br/dp/B0DJ1QCJL9",
+    "https://www.amazon.com.br/dp/B07KSFWRK7",
+    "https://www.amazon.com.br/dp/B085Z2MYFL",
+    "https://www.amazon.com.br/dp/B01F9ZSZ8O",
+    "https://www.amazon.com.br/dp/B00CZC5F0G",
+    "https://www.amazon.com.br/dp/B07KSD84NN",
+    "https://www.amazon.com.br/dp/B076JS1JG5",
+    "https://www.amazon.com.br/dp/B01F9ZSWLY",
+    "https://www.amazon.com.br/dp/B07FYV4WK3",
+    "https://www.amazon.com.br/dp/B07KSDBVJW",
+    "https://www.amazon.com.br/dp/B07KSFF8TB",
+    "https://www.amazon.com.br/dp/B07FYX2LGM",
+    "https://www.amazon.com.br/dp/B07YD6C2WH",
+    "https://www.amazon.com.br/dp/B07LH9F1LX",
+    "https://www.amazon.com.br/dp/B09MNL1QZQ",
+    "https://www.amazon.com.br/dp/B083JT5T7Q",
+    "https://www.amazon.com.br/dp/B07LH7ZSWK",
+    "https://www.amazon.com.br/dp/B07FZ6PKJF",
+    "https://www.amazon.com.br/dp/B00FAQRKT8",
+    "https://www.amazon.com.br/dp/B0719FDXCP",
+    "https://www.amazon.com.br/dp/B098CF44X7",
+    "https://www.amazon.com.br/dp/B097ZBHF6N",
+    "https://www.amazon.com.br/dp/B085ZB4ZY1",
+    "https://www.amazon.com.br/dp/B06Y2D6KSZ",
+    "https://www.amazon.com.br/dp/B077C3QD52",
+    "https://www.amazon.com.br/dp/B085Z3K3S1",
+    "https://www.amazon.com.br/dp/B06Y2H832L",
+    "https://www.amazon.com.br/dp/B07GKQ3QXH",
+    "https://www.amazon.com.br/dp/B07N6NQ53K",
+    "https://www.amazon.com.br/dp/B085YZLF97",
+    "https://www.amazon.com.br/dp/B085ZYF5BC",
+    "https://www.amazon.com.br/dp/B00JPZAJPM",
+    "https://www.amazon.com.br/dp/B01FVH8Z6W",
+    "https://www.amazon.com.br/dp/B08LHDPVRL",
+    "https://www.amazon.com.br/dp/B085ZJ5CN1",
+    "https://www.amazon.com.br/dp/B07V5JJPMY",
+    "https://www.amazon.com.br/dp/B07KSGCC6L",
+    "https://www.amazon.com.br/dp/B09X8CZW18",
+    "https://www.amazon.com.br/dp/B07M9WGSJJ",
+    "https://www.amazon.com.br/dp/B07MG75WL3",
+    "https://www.amazon.com.br/dp/B0C2G5DQV3",
+    "https://www.amazon.com.br/dp/B07L6L2YWY",
+    "https://www.amazon.com.br/dp/B07Y3YRWCB",
+    "https://www.amazon.com.br/dp/B0C2FX5XV9",
+    "https://www.amazon.com.br/dp/B0BNCBX6NT",
+    "https://www.amazon.com.br/dp/B06Y1YBBMV",
+    "https://www.amazon.com.br/dp/B010EF137O",
+    "https://www.amazon.com.br/dp/B06Y22T1NJ",
+    "https://www.amazon.com.br/dp/B085ZJL7V3",
+    "https://www.amazon.com.br/dp/B07V1X42LR",
+    "https://www.amazon.com.br/dp/B0C2FYX26R",
+    "https://www.amazon.com.br/dp/B077BY8NR5",
+    "https://www.amazon.com.br/dp/B077T49BGR",
+    "https://www.amazon.com.br/dp/B00YS699ZY",
+    "https://www.amazon.com.br/dp/B085Z1D33T",
+    "https://www.amazon.com.br/dp/B09563VJCG",
+    "https://www.amazon.com.br/dp/B0CB1SFYTX",
+    "https://www.amazon.com.br/dp/B09563VJCG",
+    "https://www.amazon.com.br/dp/B0DKY5W4ZC",
+    "https://www.amazon.com.br/dp/B07LH9HCV8",
+    "https://www.amazon.com.br/dp/B098CF44X7",
+    "https://www.amazon.com.br/dp/B06Y2D2XVW",
+    "https://www.amazon.com.br/dp/B0DHLFQXDM",
+    "https://www.amazon.com.br/dp/B07MG8G9NB",
+    "https://www.amazon.com.br/dp/B077C475QK",
+    "https://www.amazon.com.br/dp/B09Q5KNWLX",
+    "https://www.amazon.com.br/dp/B010EF0WOO",
+    "https://www.amazon.com.br/dp/B0D2PKQVM6",
+    "https://www.amazon.com.br/dp/B0D2PKQVM6",
+    "https://www.amazon.com.br/dp/B09L6WQVW5",
+    "https://www.amazon.com.br/dp/B07YCSV7TW",
+    "https://www.amazon.com.br/dp/B09NGP5PBN",
+    "https://www.amazon.com.br/dp/B0056J1WFM",
+    "https://www.amazon.com.br/dp/B07FV2M2WW",
+    "https://www.amazon.com.br/dp/B07N1HWSH2",
+    "https://www.amazon.com.br/dp/B083M7WZBZ",
+    "https://www.amazon.com.br/dp/B08FZLLMZ3",
+    "https://www.amazon.com.br/dp/B07NVXKHWB",
+    "https://www.amazon.com.br/dp/B09GBFYX9C",
+    "https://www.amazon.com.br/dp/B07NVX24DS",
+    "https://www.amazon.com.br/dp/B07YCSV7TW",
+    "https://www.amazon.com.br/dp/B0DHLFDT2Y",
+    "https://www.amazon.com.br/dp/B0DKY5Q1B8",
+    "https://www.amazon.com.br/dp/B085Z5WKBB",
+    "https://www.amazon.com.br/dp/B085ZKX86Q",
+    "https://www.amazon.com.br/dp/B0BCL4F5RR",
+    "https://www.amazon.com.br/dp/B09ZGTC91G",
+    "https://www.amazon.com.br/dp/B077BY5VN5",
+    "https://www.amazon.com.br/dp/B077C3THHT",
+    "https://www.amazon.com.br/dp/B089T8ZDTL",
+    "https://www.amazon.com.br/dp/B0C2FZ7PT1",
+    "https://www.amazon.com.br/dp/B085Z21D65",
+    "https://www.amazon.com.br/dp/B08DRGMPJ8",
+    "https://www.amazon.com.br/dp/B085ZB4M5Y",
+    "https://www.amazon.com.br/dp/B08X8MTQWF",
+    "https://www.amazon.com.br/dp/B07CX97JHH",
+    "https://www.amazon.com.br/dp/B0BHWZ7M68",
+    "https://www.amazon.com.br/dp/B0CFHSXG21",
+    "https://www.amazon.com.br/dp/B07NPRBFM4",
+    "https://www.amazon.com.br/dp/B07BQD5KDW",
+    "https://www.amazon.com.br/dp/B07NMF6JRZ",
+    "https://www.amazon.com.br/dp/B07NXVWVG2",
+    "https://www.amazon.com.br/dp/B07FYLRHXP",
+    "https://www.amazon.com.br/dp/B07MBQY7K9",
+    "https://www.amazon.com.br/dp/B07MG6ZZDS",
+    "https://www.amazon.com.br/dp/B09X9KDZBB",
+    "https://www.amazon.com.br/dp/B0BXK4F8Z9",
+    "https://www.amazon.com.br/dp/B07QMZFJD6",
+    "https://www.amazon.com.br/dp/B08LHFS61Z",
+    "https://www.amazon.com.br/dp/B0C2FHH98G",
+    "https://www.amazon.com.br/dp/B01N2UMUA7",
+    "https://www.amazon.com.br/dp/B07FV5RLPN",
+    "https://www.amazon.com.br/dp/B0789QCHD4",
+    "https://www.amazon.com.br/dp/B09L6WJ88X",
+    "https://www.amazon.com.br/dp/B07FYTSX7P",
+    "https://www.amazon.com.br/dp/B083JTTBVK",
+    "https://www.amazon.com.br/dp/B085Z3LPFK",
+    "https://www.amazon.com.br/dp/B08LHDT86K",
+    "https://www.amazon.com.br/dp/B09L6Y323M",
+    "https://www.amazon.com.br/dp/B09NQKCRCW",
+    "https://www.amazon.com.br/dp/B08KHQ4TP5",
+    "https://www.amazon.com.br/dp/B07FVB39DH",
+    "https://www.amazon.com.br/dp/B086N2Z1VQ",
+    "https://www.amazon.com.br/dp/B089WKYCFF",
+    "https://www.amazon.com.br/dp/B07YX3YN4Y",
+    "https://www.amazon.com.br/dp/B000F4GLAY",
+    "https://www.amazon.com.br/dp/B077C3SPXV",
+    "https://www.amazon.com.br/dp/B07L6LK238",
+    "https://www.amazon.com.br/dp/B085Z2MYFL",
+    "https://www.amazon.com.br/dp/B07F1TKN9N",
+    "https://www.amazon.com.br/dp/B07LHGVF3P",
+    "https://www.amazon.com.br/dp/B0BNJT83K6",
+    "https://www.amazon.com.br/dp/B0CB1SFYTX",
+    "https://www.amazon.com.br/dp/B0DKXZTZKV",
+    "https://www.amazon.com.br/dp/B077C5FT38",
+    "https://www.amazon.com.br/dp/B07GWKGMJR",
+    "https://www.amazon.com.br/dp/B082QJ65K8",
+]
+
 async def run_combined_crawler():
     print(f'Executando scrape_combined_crawl4ai.py às {datetime.now()}')
     try:
-        combined_urls = [
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-by-boca-rosa-hair-oleo-capilar-quartzo-liquido-65ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-cpr-step-3-condicionador-1l",
-            "https://www.belezanaweb.com.br/joico-kpak-color-therapy-smart-release-condicionador-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-kpak-color-therapy-smart-release-shampoo-1-litro/ofertas-marketplace",
-            "https://www.epocacosmeticos.com.br/pesquisa?q=7896235353652",
-            "https://www.epocacosmeticos.com.br/pesquisa?q=4064666318356",
-            "https://www.mercadolivre.com.br/wella-professionals-invigo-nutri-enrich-shampoo-1000ml/p/MLB19702074/s?pdp_filters=seller_id%3A1190258457",
-            "https://www.mercadolivre.com.br/shampoo-wella-invigo-nutri-enrich-1-litro-profissional/p/MLB20570794/s?pdp_filters=seller_id%3A1190258457",
-            "https://www.mercadolivre.com.br/cadiveu-maxi-ondas-ativador-de-cachos-200ml-waves/p/MLB25477625/s?pdp_filters=seller_id%3A1190258457",
-            "https://www.mercadolivre.com.br/cadiveu-boca-rosa-hair-quartzo-shine-protetor-termico-200ml/p/MLB19566993/s?pdp_filters=seller_id%3A1190258457",
-            "https://www.mercadolivre.com.br/deva-curl-supercream-creme-de-coco-250g/p/MLB19514996/s?pdp_filters=seller_id%3A1190258457",
-            "https://www.mercadolivre.com.br/wella-professionals-condicionador-fusion-200ml/p/MLB22343829/s?pdp_filters=seller_id%3A1190258457",
-            "https://www.mercadolivre.com.br/wella-oil-reflections-luminous-oleo-30ml/p/MLB19515342/s?pdp_filters=official_store%3A3667",
-            "https://www.mercadolivre.com.br/shampoo-wella-professionals-invigo-nutri-enrich-250ml/p/MLB19704103/s?pdp_filters=official_store%3A3667&page=1",
-            "https://www.mercadolivre.com.br/wella-invigo-color-brilliance-shampoo-250ml/p/MLB24006354/s",
-            "https://www.mercadolivre.com.br/mascara-capilar-invigo-color-brilliance-500ml-wella-professionals/p/MLB19703901/s",
-            "https://www.mercadolivre.com.br/condicionador-invigo-color-brilliance-wella-professionals-1-litro/p/MLB19704364/s",
-            "https://www.mercadolivre.com.br/shampoo-invigo-color-brilliance-1l-wella-professionals/p/MLB19506213/s",
-            "https://www.epocacosmeticos.com.br/pesquisa?q=8005610672427",
-            'https://www.mercadolivre.com.br/shampoo-wella-invigo-nutri-enrich-1-litro-profissional/p/MLB20570794/s',
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-shampoo-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-condicionador-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-mascara-capilar-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-shampoo-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-condicionador-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-mascara-capilar-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-luminous-reveal-shampoo-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-luminous-reboost-mascara-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-oleo-capilar-100ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-oil-reflections-light-oleo-capilar-100ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-acai-oil-oleo-de-tratamento-60ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-cadiveu-professional-plastica-dos-fios-alinhamento-profissional-3-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-gradual-smoothing-mist-spray-protetor-termico-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-by-boca-rosa-hair-oleo-capilar-quartzo-liquido-65ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-one-condition-condicionador-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-mascara-capilar-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-heaven-in-hair-mascara-capilar-250g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-supercream-creme-modelador-250g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-leavein-protetor-termico-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-intensif-mascara-capilar-de-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-mascara-capilar-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-deep-moisturizing-conditioner-mascara-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-cpr-step-3-condicionador-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-condicionando-a-juba-hidronutritivo-condicionador-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-ondulando-a-juba-creme-de-pentear-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-modelando-a-juba-geleia-seladora-300g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-encrespando-a-juba-creme-de-pentear-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-juba-mascara-capilar-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-moisture-recovery-moisturizing-smart-release-shampoo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-kpak-to-repair-damage-hair-smart-release-shampoo-300ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-supercream-creme-modelador-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-one-condition-decadence-condicionador-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-proteina-condicionante-preshampoo-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-profissional-glamour-essentials-serum-capilar-65ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-leavein-nutritivo-215ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-glamour-essentials-fluido-condicionante-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-cadiveu-professional-essentials-hair-remedy-home-care-3-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-acai-oil-oleo-de-tratamento-60ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-acai-oil-oleo-de-acai-110ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-encrespando-a-juba-creme-de-pentear-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-cabeleira-crescimento-e-fortalecimento-fluido-fortificante-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-homecare-cadiveu-essentials-quartzo-shine-2-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-cadiveu-professional-plastica-dos-fios-alinhamento-profissional-3-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-homecare-cadiveu-essentials-quartzo-shine-2-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/aneethun-linha-a-mascara-capilar-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-styling-cream-creme-modelador-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-divine-antifrizz-condicionador-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-silk-moisture-condicionador-240ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-essentials-maxi-ondas-leavein-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-nutrienrich-warming-express-mascara-de-nutricao-150ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-angell-leave-in-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-mascara-reparadora-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-mascara-de-tratamento-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-no-poo-shampoo-cremoso-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-heaven-in-hair-mascara-capilar-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/aneethun-linha-a-silicone-com-tutano-e-queratina-creme-capilar-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-original-shampoo-nopoo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-balm-leavein-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-leavein-150ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-low-poo-deligh-shampoo-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-no-poo-decadence-shampoo-sem-espuma-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-stages-nutrition-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-one-condition-delight-condicionador-355ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-essential-power-dose-ampola-de-tratamento-capilar-13ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-leavein-reparador-215ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-sem-sulfato-shampoo-reparador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-care-angell-modelador-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/widi-care-blend-de-oleos-vegetais-tratamento-capilar-60ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-angell-leavein-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-quartzo-shine-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-go-curly-leavein-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-shampoo-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-cadiveu-professional-glamour-essentials-home-care-2-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-repair-solution-condicionador-reparador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-go-curly-mascara-capilar-200g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/prohall-cosmetic-btx-blend-repair-tratamento-disciplinante-300g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-divine-antifrizz-shampoo-1000ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-stages-treatment-leavein-multifuncional-em-spray-260ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-moisture-recovery-smart-release-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-stage-hydration-mascara-capilar-200g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-mask-mascara-capilar-condicionadora-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-essentials-bye-bye-frizz-killer-leave-in-120ml",
-            "https://www.belezanaweb.com.br/cadiveu-professional-glamour-essentials-mascara-capilar-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-intensif-mascara-capilar-de-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-shampoo-low-poo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-divine-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-essentials-bye-bye-frizz-conditioner-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/aneethun-linha-a-shampoo-300ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-styling-cream-creme-de-pentear-250g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/jacques-janine-professionnel-bb-cream-finalizador-240ml",
-            "https://www.belezanaweb.com.br/jacques-janine-professionnel-liso-absoluto-fluido-termoativado-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-bond-angel-blonde-repair-mascara-capilar-200g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-essentials-hair-remedy-leavein-condicionante-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-kpak-to-repair-damage-hair-smart-release-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-beach-hair-day-finalizador-capilar-260ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-delight-shampoo-low-poo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-bond-angel-thermal-blond-leavein-matizador-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-stagesnutrition-condicionador-250-ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/kit-cadiveu-professional-plastica-dos-fios-2-produtos/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-essential-fluido-reparador-leavein-60ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-one-condition-decadence-condicionador-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/aneethun-repair-system-mascara-posquimica-250g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-revival-condicionador-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-decadence-shampoo-no-poo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-invigo-color-brilliance-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-fiber-mask-efeito-teia-mascara-capilar-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-glamour-essentials-shampoo-250ml",
-            "https://www.belezanaweb.com.br/brae-divine-home-care-mascara-capilar-200g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-fusion-shampoo-1000ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-fusion-condicionador-1-litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-fusion-mascara-reparadora-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-mascara-capilar-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-cpr-step-0-shampoo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-silk-moisture-shampoo-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-silk-moisture-shampoo-280ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-intensif-mascara-capilar-de-500ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-balance-condicionador-240ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-true-hue-color-serum-capilar-55ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-balance-shampoo-280ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-smooth-shampoo-1000ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-silk-moisture-condicionador-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-fiber-mask-efeito-teia-mascara-capilar-500g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-revival-condicionador-1l",
-            "https://www.belezanaweb.com.br/brae-soul-color-condicionador-1litro/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-joifull-volumizing-smart-release-leavein-100ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/wella-professionals-color-motion-condicionador-1000ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/joico-blonde-life-brilliant-glow-brightening-oil-oleo-capilar-100ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/mp293269-mascara-cabelos-loiros-brae-stages-blonding-200g/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-shampoo-stages-blonding-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/mp293272-mascara-cabelos-coloridos-brae-stages-color-protect-200g",
-            "https://www.belezanaweb.com.br/brae-stages-colors-protect-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/brae-stage-hydration-shampoo-250ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-final-style-extra-shine-spray-de-brilho-150ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-true-hue-shampoo-sem-sulfato-280ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-inner-restore-deep-moisturizing-mascara-de-hidratacao-50ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-true-hue-condicionador-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/senscience-cpr-step-1-porosity-reconstructor-tratamento-reconstrutor1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-blonde-reconstructor-ph-balancing-mask-mascara-capilar-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-soft-sense-condicionador-3l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-hair-remedy-condicionador-980ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-mascara-capilar-980ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-condicionador-980ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/cadiveu-professional-nutri-glow-shampoo-980ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-wave-maker-ativador-de-cachos-180ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-mist-er-right-finalizador-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-bleave-in-finalizador-condicionante-200ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-b-leavein-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-set-it-free-finalizador-120ml/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-one-condition-delight-condicionador-1l/ofertas-marketplace",
-            "https://www.belezanaweb.com.br/deva-curl-low-poo-shampoo-355ml/ofertas-marketplace",
-            "https://www.amazon.com.br/dp/B07KSDBVJW",
-            "https://www.amazon.com.br/dp/B0933L5RJC",
-            "https://www.amazon.com.br/dp/B0DJ1QCJL9",
-            "https://www.amazon.com.br/dp/B07KSFWRK7",
-            "https://www.amazon.com.br/dp/B085Z2MYFL",
-            "https://www.amazon.com.br/dp/B01F9ZSZ8O",
-            "https://www.amazon.com.br/dp/B00CZC5F0G",
-            "https://www.amazon.com.br/dp/B07KSD84NN",
-            "https://www.amazon.com.br/dp/B076JS1JG5",
-            "https://www.amazon.com.br/dp/B01F9ZSWLY",
-            "https://www.amazon.com.br/dp/B07FYV4WK3",
-            "https://www.amazon.com.br/dp/B07KSDBVJW",
-            "https://www.amazon.com.br/dp/B07KSFF8TB",
-            "https://www.amazon.com.br/dp/B07FYX2LGM",
-            "https://www.amazon.com.br/dp/B07YD6C2WH",
-            "https://www.amazon.com.br/dp/B07LH9F1LX",
-            "https://www.amazon.com.br/dp/B09MNL1QZQ",
-            "https://www.amazon.com.br/dp/B083JT5T7Q",
-            "https://www.amazon.com.br/dp/B07LH7ZSWK",
-            "https://www.amazon.com.br/dp/B07FZ6PKJF",
-            "https://www.amazon.com.br/dp/B00FAQRKT8",
-            "https://www.amazon.com.br/dp/B0719FDXCP",
-            "https://www.amazon.com.br/dp/B098CF44X7",
-            "https://www.amazon.com.br/dp/B097ZBHF6N",
-            "https://www.amazon.com.br/dp/B085ZB4ZY1",
-            "https://www.amazon.com.br/dp/B06Y2D6KSZ",
-            "https://www.amazon.com.br/dp/B077C3QD52",
-            "https://www.amazon.com.br/dp/B085Z3K3S1",
-            "https://www.amazon.com.br/dp/B06Y2H832L",
-            "https://www.amazon.com.br/dp/B07GKQ3QXH",
-            "https://www.amazon.com.br/dp/B07N6NQ53K",
-            "https://www.amazon.com.br/dp/B085YZLF97",
-            "https://www.amazon.com.br/dp/B085ZYF5BC",
-            "https://www.amazon.com.br/dp/B00JPZAJPM",
-            "https://www.amazon.com.br/dp/B01FVH8Z6W",
-            "https://www.amazon.com.br/dp/B08LHDPVRL",
-            "https://www.amazon.com.br/dp/B085ZJ5CN1",
-            "https://www.amazon.com.br/dp/B07V5JJPMY",
-            "https://www.amazon.com.br/dp/B07KSGCC6L",
-            "https://www.amazon.com.br/dp/B09X8CZW18",
-            "https://www.amazon.com.br/dp/B07M9WGSJJ",
-            "https://www.amazon.com.br/dp/B07MG75WL3",
-            "https://www.amazon.com.br/dp/B0C2G5DQV3",
-            "https://www.amazon.com.br/dp/B07L6L2YWY",
-            "https://www.amazon.com.br/dp/B07Y3YRWCB",
-            "https://www.amazon.com.br/dp/B0C2FX5XV9",
-            "https://www.amazon.com.br/dp/B0BNCBX6NT",
-            "https://www.amazon.com.br/dp/B06Y1YBBMV",
-            "https://www.amazon.com.br/dp/B010EF137O",
-            "https://www.amazon.com.br/dp/B06Y22T1NJ",
-            "https://www.amazon.com.br/dp/B085ZJL7V3",
-            "https://www.amazon.com.br/dp/B07V1X42LR",
-            "https://www.amazon.com.br/dp/B0C2FYX26R",
-            "https://www.amazon.com.br/dp/B077BY8NR5",
-            "https://www.amazon.com.br/dp/B077T49BGR",
-            "https://www.amazon.com.br/dp/B00YS699ZY",
-            "https://www.amazon.com.br/dp/B085Z1D33T",
-            "https://www.amazon.com.br/dp/B09563VJCG",
-            "https://www.amazon.com.br/dp/B0CB1SFYTX",
-            "https://www.amazon.com.br/dp/B09563VJCG",
-            "https://www.amazon.com.br/dp/B0DKY5W4ZC",
-            "https://www.amazon.com.br/dp/B07LH9HCV8",
-            "https://www.amazon.com.br/dp/B098CF44X7",
-            "https://www.amazon.com.br/dp/B06Y2D2XVW",
-            "https://www.amazon.com.br/dp/B0DHLFQXDM",
-            "https://www.amazon.com.br/dp/B07MG8G9NB",
-            "https://www.amazon.com.br/dp/B077C475QK",
-            "https://www.amazon.com.br/dp/B09Q5KNWLX",
-            "https://www.amazon.com.br/dp/B010EF0WOO",
-            "https://www.amazon.com.br/dp/B0D2PKQVM6",
-            "https://www.amazon.com.br/dp/B0D2PKQVM6",
-            "https://www.amazon.com.br/dp/B09L6WQVW5",
-            "https://www.amazon.com.br/dp/B07YCSV7TW",
-            "https://www.amazon.com.br/dp/B09NGP5PBN",
-            "https://www.amazon.com.br/dp/B0056J1WFM",
-            "https://www.amazon.com.br/dp/B07FV2M2WW",
-            "https://www.amazon.com.br/dp/B07N1HWSH2",
-            "https://www.amazon.com.br/dp/B083M7WZBZ",
-            "https://www.amazon.com.br/dp/B08FZLLMZ3",
-            "https://www.amazon.com.br/dp/B07NVXKHWB",
-            "https://www.amazon.com.br/dp/B09GBFYX9C",
-            "https://www.amazon.com.br/dp/B07NVX24DS",
-            "https://www.amazon.com.br/dp/B07YCSV7TW",
-            "https://www.amazon.com.br/dp/B0DHLFDT2Y",
-            "https://www.amazon.com.br/dp/B0DKY5Q1B8",
-            "https://www.amazon.com.br/dp/B085Z5WKBB",
-            "https://www.amazon.com.br/dp/B085ZKX86Q",
-            "https://www.amazon.com.br/dp/B0BCL4F5RR",
-            "https://www.amazon.com.br/dp/B09ZGTC91G",
-            "https://www.amazon.com.br/dp/B077BY5VN5",
-            "https://www.amazon.com.br/dp/B077C3THHT",
-            "https://www.amazon.com.br/dp/B089T8ZDTL",
-            "https://www.amazon.com.br/dp/B0C2FZ7PT1",
-            "https://www.amazon.com.br/dp/B085Z21D65",
-            "https://www.amazon.com.br/dp/B08DRGMPJ8",
-            "https://www.amazon.com.br/dp/B085ZB4M5Y",
-            "https://www.amazon.com.br/dp/B08X8MTQWF",
-            "https://www.amazon.com.br/dp/B07CX97JHH",
-            "https://www.amazon.com.br/dp/B0BHWZ7M68",
-            "https://www.amazon.com.br/dp/B0CFHSXG21",
-            "https://www.amazon.com.br/dp/B07NPRBFM4",
-            "https://www.amazon.com.br/dp/B07BQD5KDW",
-            "https://www.amazon.com.br/dp/B07NMF6JRZ",
-            "https://www.amazon.com.br/dp/B07NXVWVG2",
-            "https://www.amazon.com.br/dp/B07FYLRHXP",
-            "https://www.amazon.com.br/dp/B07MBQY7K9",
-            "https://www.amazon.com.br/dp/B07MG6ZZDS",
-            "https://www.amazon.com.br/dp/B09X9KDZBB",
-            "https://www.amazon.com.br/dp/B0BXK4F8Z9",
-            "https://www.amazon.com.br/dp/B07QMZFJD6",
-            "https://www.amazon.com.br/dp/B08LHFS61Z",
-            "https://www.amazon.com.br/dp/B0C2FHH98G",
-            "https://www.amazon.com.br/dp/B01N2UMUA7",
-            "https://www.amazon.com.br/dp/B07FV5RLPN",
-            "https://www.amazon.com.br/dp/B0789QCHD4",
-            "https://www.amazon.com.br/dp/B09L6WJ88X",
-            "https://www.amazon.com.br/dp/B07FYTSX7P",
-            "https://www.amazon.com.br/dp/B083JTTBVK",
-            "https://www.amazon.com.br/dp/B085Z3LPFK",
-            "https://www.amazon.com.br/dp/B08LHDT86K",
-            "https://www.amazon.com.br/dp/B09L6Y323M",
-            "https://www.amazon.com.br/dp/B09NQKCRCW",
-            "https://www.amazon.com.br/dp/B08KHQ4TP5",
-            "https://www.amazon.com.br/dp/B07FVB39DH",
-            "https://www.amazon.com.br/dp/B086N2Z1VQ",
-            "https://www.amazon.com.br/dp/B089WKYCFF",
-            "https://www.amazon.com.br/dp/B07YX3YN4Y",
-            "https://www.amazon.com.br/dp/B000F4GLAY",
-            "https://www.amazon.com.br/dp/B077C3SPXV",
-            "https://www.amazon.com.br/dp/B07L6LK238",
-            "https://www.amazon.com.br/dp/B085Z2MYFL",
-            "https://www.amazon.com.br/dp/B07F1TKN9N",
-            "https://www.amazon.com.br/dp/B07LHGVF3P",
-            "https://www.amazon.com.br/dp/B0BNJT83K6",
-            "https://www.amazon.com.br/dp/B0CB1SFYTX",
-            "https://www.amazon.com.br/dp/B0DKXZTZKV",
-            "https://www.amazon.com.br/dp/B077C5FT38",
-            "https://www.amazon.com.br/dp/B07GWKGMJR",
-            "https://www.amazon.com.br/dp/B082QJ65K8",
-        ]
-        
-        await process_urls(combined_urls)
+        await process_urls(COMBINED_URLS)
     except Exception as e:
         print(f'Erro ao executar scrape_combined_crawl4ai.py: {e}')
 
@@ -0,0 +1,202 @@
+"""Simulador de marketplaces para os testes de escala do pipeline (bench_pipeline.py).
+
+Uso: python marketplace_sim.py [porta]
+
+Serve páginas geradas no formato de cada marketplace, para qualquer id, com
+o host real como primeiro trecho do caminho (os adaptadores reconhecem as URLs):
+  /www.mercadolivre.com.br/p/MLB<n>              HTML com o melidata
+  /www.epocacosmeticos.com.br/pesquisa?q=<EAN>   HTML com o estado __NEXT_DATA__
+  /www.amazon.com.br/dp/<ASIN>                   HTML com título, imagem e ofertas
+  /www.belezanaweb.com.br/produto-<n>            markdown como o do crawl4ai
+  POST/PUT /api/products                         API de preços (201/202)
+  GET /health
+
+O produto n tem o mesmo EAN em todos os marketplaces e a página de um id é
+sempre a mesma. A latência segue uma lognormal com mediana SIM_LATENCY_MS e
+uma fração SIM_FAILURE_RATE das respostas é 503 ou 429.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+
+SIM_PORT = int(os.environ.get('SIM_PORT', '8090'))
+SIM_LATENCY_MS = float(os.environ.get('SIM_LATENCY_MS', '80'))
+SIM_LATENCY_SIGMA = float(os.environ.get('SIM_LATENCY_SIGMA', '0.6'))
+SIM_FAILURE_RATE = float(os.environ.get('SIM_FAILURE_RATE', '0.02'))
+# Máximo de vendedores por produto
+SIM_SELLERS = int(os.environ.get('SIM_SELLERS', '6'))
+
+HOSTS = {
+    'Mercado Livre': 'www.mercadolivre.com.br',
+    'Época Cosméticos': 'www.epocacosmeticos.com.br',
+    'Amazon': 'www.amazon.com.br',
+    'Beleza na Web': 'www.belezanaweb.com.br',
+}
+_ASIN_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def ean_for(n):
+    """EAN-13 válido do produto n (prefixo 789)."""
+    base = f'789{n:09d}'
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return f'{base}{(10 - total % 10) % 10}'
+
+
+def asin_for(n):
+    digits = ''
+    for _ in range(9):
+        n, rest = divmod(n, 36)
+        digits = _ASIN_DIGITS[rest] + digits
+    return f'B{digits}'
+
+
+def product_url(base_url, marketplace, n):
+    """URL simulada do produto n no marketplace."""
+    host = f'{base_url}/{HOSTS[marketplace]}'
+    if marketplace == 'Mercado Livre':
+        return f'{host}/p/MLB{1000000 + n}'
+    if marketplace == 'Época Cosméticos':
+        return f'{host}/pesquisa?q={ean_for(n)}'
+    if marketplace == 'Amazon':
+        return f'{host}/dp/{asin_for(n)}'
+    return f'{host}/produto-{n}'
+
+
+def catalog(base_url, size):
+    """size URLs, alternando os marketplaces (cada produto aparece em até quatro)."""
+    marketplaces = list(HOSTS)
+    return [product_url(base_url, marketplaces[i % len(marketplaces)], i // len(marketplaces)) for i in range(size)]
+
+
+def sellers_for(marketplace, n):
+    """[(loja, preço)] do produto n no marketplace: sempre os mesmos para o mesmo id."""
+    rng = random.Random(f'{marketplace}:{n}')
+    base = round(rng.uniform(20, 400), 2)
+    count = rng.randint(1, SIM_SELLERS)
+    return [(f'Loja {rng.randint(1, 200)}', round(base * rng.uniform(0.85, 1.2), 2)) for _ in range(count)]
+
+
+def _brl(value):
+    return f'{value:,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def meli_page(n):
+    items = [{'seller_name': loja, 'price': preco} for loja, preco in sellers_for('Mercado Livre', n)]
+    return (
+        f'<html><head><title>Produto {n} | Mercado Livre</title>'
+        f'<meta property="og:image" content="https://http2.mlstatic.com/{n}.jpg"></head><body>'
+        f'<h1 class="ui-pdp-title">Produto simulado {n}</h1>'
+        f'<span class="ui-pdp-reviews__rating__summary__average">4.{n % 10}</span>'
+        f'<table><tr><th>Código universal de produto</th><td>{ean_for(n)}</td></tr></table>'
+        f'<script>melidata("add", "event_data", {json.dumps({"items": items})});</script>'
+        f'</body></html>'
+    )
+
+
+def epoca_page(n):
+    sellers = [
+        {'sellerName': loja, 'commertialOffer': {'Price': preco, 'AvailableQuantity': 10}}
+        for loja, preco in sellers_for('Época Cosméticos', n)
+    ]
+    state = {'props': {'pageProps': {'search': {'products': [{
+        'productName': f'Produto simulado {n}',
+        'items': [{
+            'ean': ean_for(n),
+            'referenceId': [{'Key': 'RefId', 'Value': ean_for(n)}],
+            'images': [{'imageUrl': f'https://epocacosmeticos.vteximg.com.br/{n}.jpg'}],
+            'sellers': sellers,
+        }],
+    }]}}}}
+    return (
+        f'<html><head><title>{ean_for(n)} - Época Cosméticos</title></head><body>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+        f'</body></html>'
+    )
+
+
+def amazon_page(n):
+    offers = ''.join(
+        f'<div class="offer"><a class="seller">{loja}</a><span class="a-offscreen">R$ {_brl(preco)}</span></div>'
+        for loja, preco in sellers_for('Amazon', n)
+    )
+    return (
+        f'<html><head><title>Amazon.com.br: Produto {n}</title></head><body>'
+        f'<span id="productTitle">Produto simulado {n}</span>'
+        f'<img id="landingImage" src="https://m.media-amazon.com/images/I/{n}.jpg">'
+        f'<table><tr><th>EAN</th><td>{ean_for(n)}</td></tr></table>{offers}</body></html>'
+    )
+
+
+def beleza_markdown(n):
+    blocos = '\n'.join(
+        f'Vendido por **{loja}** Entregue por Beleza na Web\nR$ {_brl(preco)}\n'
+        for loja, preco in sellers_for('Beleza na Web', n)
+    )
+    return (
+        f'[Voltar para a página do produto](https://www.belezanaweb.com.br/produto-{n})\n'
+        f'**Cod:** MP{n}\nEAN: {ean_for(n)}\nReview: 4.{n % 10}\n'
+        f'![](https://res.cloudinary.com/beleza-na-web/image/upload/f_auto/v1/imagens/product/MP{n}/{n}.png)\n'
+        f'{blocos}'
+    )
+
+
+def render(path, query):
+    """(content_type, corpo) da página simulada do caminho, ou None se não existe."""
+    host, _, rest = path.lstrip('/').partition('/')
+    if host == HOSTS['Mercado Livre'] and rest.startswith('p/MLB'):
+        return 'text/html', meli_page(int(rest[5:]) - 1000000)
+    if host == HOSTS['Época Cosméticos'] and rest == 'pesquisa' and len(query.get('q', '')) == 13:
+        return 'text/html', epoca_page(int(query['q'][3:12]))
+    if host == HOSTS['Amazon'] and rest.startswith('dp/'):
+        return 'text/html', amazon_page(int(rest[4:], 36))
+    if host == HOSTS['Beleza na Web'] and rest.startswith('produto-'):
+        return 'text/markdown', beleza_markdown(int(rest[8:]))
+    return None
+
+
+async def serve(port=None):
+    from aiohttp import web
+
+    median_s = SIM_LATENCY_MS / 1000
+
+    async def page(request):
+        await asyncio.sleep(random.lognormvariate(math.log(median_s), SIM_LATENCY_SIGMA) if median_s > 0 else 0)
+        if random.random() < SIM_FAILURE_RATE:
+            return web.Response(status=random.choice((503, 429)), text='<title>Indisponível</title>')
+        rendered = render(request.path, request.query)
+        if rendered is None:
+            return web.Response(status=404, text='<title>Página não encontrada</title>')
+        content_type, body = rendered
+        return web.Response(text=body, content_type=content_type)
+
+    async def api(request):
+        await request.read()
+        return web.Response(status=201 if request.method == 'POST' else 202)
+
+    async def health(request):
+        return web.json_response({'status': 'ok'})
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_get('/health', health)
+    app.router.add_route('POST', '/api/products', api)
+    app.router.add_route('PUT', '/api/products', api)
+    app.router.add_get('/{path:.*}', page)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    port = port or SIM_PORT
+    await web.TCPSite(runner, '127.0.0.1', port, backlog=1024).start()
+    print(f'Simulador de marketplaces em http://127.0.0.1:{port}', flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(serve(int(sys.argv[1]) if len(sys.argv) > 1 else None))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import tracemalloc
+from contextlib import asynccontextmanager
+
+import psutil
+
+# Reinicia o navegador compartilhado após N páginas ou acima deste RSS (MB)
+BROWSER_RECYCLE_PAGES = int(os.environ.get('BROWSER_RECYCLE_PAGES', '200'))
+BROWSER_RSS_CEILING_MB = float(os.environ.get('BROWSER_RSS_CEILING_MB', '2048'))
+# Pausa novas páginas enquanto a memória livre do sistema estiver abaixo disso (MB)
+MIN_AVAILABLE_MB = float(os.environ.get('MIN_AVAILABLE_MB', '500'))
+# TRACEMALLOC=1 guarda snapshots das alocações do Python a cada recycle e no fim
+TRACEMALLOC = os.environ.get('TRACEMALLOC', '0') == '1'
+
+MB = 1024 * 1024
+
+
+class MemoryGovernor:
+    """Controla a memória dos navegadores durante a execução.
+
+    - page(marketplace) envolve cada página: espera enquanto a memória livre
+      do sistema está baixa e registra em metrics quanto o RSS do processo
+      (Python + navegadores) cresceu durante a página. Com marketplaces em
+      paralelo o crescimento inclui as outras páginas: é uma aproximação;
+    - maybe_recycle(crawler) reinicia o navegador do AsyncWebCrawler após
+      BROWSER_RECYCLE_PAGES páginas ou com os navegadores acima de
+      BROWSER_RSS_CEILING_MB, quando nenhuma página o está usando. Antes de
+      fechá-lo, chama os callbacks assíncronos de before_recycle (ex.: salvar
+      e esquecer o contexto da sessão, que morre com o navegador);
+    - com TRACEMALLOC=1, compara snapshots do tracemalloc e lista as linhas
+      que mais cresceram.
+
+    Um mesmo governor pode atravessar várias execuções (ex.: o do daemon,
+    que assim é o único a reciclar o crawler); cada execução troca metrics.
+    """
+
+    def __init__(self, metrics=None, max_pages=None, rss_ceiling_mb=None,
+                 min_available_mb=None, trace=None, pause_interval=1.0):
+        self.metrics = metrics
+        self.max_pages = max_pages or BROWSER_RECYCLE_PAGES
+        self.rss_ceiling = (rss_ceiling_mb or BROWSER_RSS_CEILING_MB) * MB
+        self.min_available = (min_available_mb if min_available_mb is not None else MIN_AVAILABLE_MB) * MB
+        self.trace = TRACEMALLOC if trace is None else trace
+        self.pause_interval = pause_interval
+        self.pages_since_recycle = 0
+        self.recycles = 0
+        self.pauses = 0
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._recycle_lock = asyncio.Lock()
+        self._baseline = None
+        self.top_growth = []
+        self.before_recycle = []
+        if self.trace:
+            tracemalloc.start(10)
+            self._baseline = tracemalloc.take_snapshot()
+
+    async def wait_for_memory(self):
+        """Segura o agendamento enquanto a memória livre do sistema estiver baixa."""
+        paused = False
+        while psutil.virtual_memory().available < self.min_available:
+            if not paused:
+                paused = True
+                self.pauses += 1
+                print(f'Memória livre abaixo de {self.min_available / MB:.0f} MB, pausando novas páginas')
+            await asyncio.sleep(self.pause_interval)
+
+    @asynccontextmanager
+    async def page(self, marketplace, uses_crawler=False, pages=1):
+        """Envolve uma página (ou um lote de pages páginas) de um marketplace.
+
+        uses_crawler indica que a página usa o navegador compartilhado do
+        AsyncWebCrawler, que então não pode ser reciclado enquanto ela roda.
+        """
+        await self.wait_for_memory()
+        rss_before = self.metrics.sample_memory()
+        # Não começa uma página no navegador compartilhado durante um recycle
+        if uses_crawler:
+            async with self._recycle_lock:
+                self._in_flight += 1
+                self._idle.clear()
+        try:
+            yield
+        finally:
+            if uses_crawler:
+                self._in_flight -= 1
+                self.pages_since_recycle += pages
+                if self._in_flight == 0:
+                    self._idle.set()
+            self.metrics.record_marketplace_memory(marketplace, self.metrics.sample_memory() - rss_before)
+
+    def should_recycle(self):
+        _, browser_rss = self.metrics.rss_breakdown()
+        return self.pages_since_recycle >= self.max_pages or browser_rss > self.rss_ceiling
+
+    async def maybe_recycle(self, crawler):
+        """Reinicia o navegador do crawler se passou do limite de páginas ou de memória."""
+        if not self.should_recycle():
+            return False
+        async with self._recycle_lock:
+            if not self.should_recycle():
+                return False
+            await self._idle.wait()
+            _, before = self.metrics.rss_breakdown()
+            print(f'Reciclando o navegador após {self.pages_since_recycle} páginas ({before / MB:.0f} MB)')
+            try:
+                for callback in self.before_recycle:
+                    await callback()
+                await crawler.close()
+                await crawler.start()
+            except Exception as e:
+                print(f'Erro ao reciclar o navegador: {e}')
+                return False
+            self.pages_since_recycle = 0
+            self.recycles += 1
+            self.snapshot()
+            return True
+
+    def snapshot(self):
+        """Compara as alocações do Python com o início da execução (TRACEMALLOC=1)."""
+        if not self.trace or self._baseline is None:
+            return
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self._baseline, 'lineno')
+        self.top_growth = [
+            f'{stat.traceback[0].filename}:{stat.traceback[0].lineno} +{stat.size_diff / 1024:.0f} KB'
+            for stat in stats[:10]
+            if stat.size_diff > 0
+        ]
+
+    def print_report(self):
+        print(f'Navegador reciclado {self.recycles} vezes; {self.pauses} pausas por falta de memória')
+        self.snapshot()
+        if self.top_growth:
+            print('Maior crescimento de memória do Python (tracemalloc):')
+            for line in self.top_growth:
+                print(f'  {line}')
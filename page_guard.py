@@ -0,0 +1,124 @@
+import re
+from dataclasses import dataclass
+
+# Tipos de página que não têm ofertas para extrair
+OK = 'ok'
+CAPTCHA = 'captcha'
+LOGIN = 'login'
+INDISPONIVEL = 'indisponivel'
+ERRO_HTTP = 'erro_http'
+
+# Quantos caracteres do texto visível da página são inspecionados
+TEXT_SAMPLE = 5000
+
+# (tipo, onde, padrão[, exceto]): onde é 'url' (URL final, após redirects), 'title'
+# ou 'text'; se exceto também aparece no mesmo campo, o marcador não vale
+_COMMON_MARKERS = [
+    (CAPTCHA, 'url', r'captcha|/challenge|cf_chl'),
+    (CAPTCHA, 'title', r'just a moment|attention required|access denied|robot check|acesso negado'),
+    (CAPTCHA, 'text', r'verifique se você é humano|confirme que você é humano|are you a human'),
+]
+
+MARKERS = {
+    'Amazon': [
+        (CAPTCHA, 'url', r'/errors/validatecaptcha'),
+        (CAPTCHA, 'text', r'digite os caracteres que você vê|type the characters you see'),
+        (LOGIN, 'url', r'/ap/signin'),
+        (INDISPONIVEL, 'title', r'página não encontrada|page not found'),
+        # Só o buybox está indisponível se outros vendedores ainda têm ofertas
+        (INDISPONIVEL, 'text', r'não sabemos quando ou se este item estará disponível',
+         r'comparar outras.*?ofertas|ver todas as (?:ofertas|opções de compra)|outras ofertas'),
+    ],
+    'Mercado Livre': [
+        (LOGIN, 'url', r'/jms/|/lgz/|/login|account-verification'),
+        (INDISPONIVEL, 'text', r'publicação pausada|anúncio pausado|esta publicação está pausada'
+                               r'|parece que esta página não existe'),
+    ],
+    'Época Cosméticos': [
+        (INDISPONIVEL, 'text', r'nenhum resultado encontrado|não encontramos resultados'),
+    ],
+    'Beleza na Web': [
+        (LOGIN, 'url', r'/login'),
+        (INDISPONIVEL, 'text', r'produto indisponível|avise-me quando chegar'),
+    ],
+}
+
+
+
+def _compile(markers):
+    compiled = []
+    for kind, where, pattern, *unless in markers:
+        unless = re.compile(unless[0], re.IGNORECASE) if unless else None
+        compiled.append((kind, where, re.compile(pattern, re.IGNORECASE), unless))
+    return compiled
+
+
+_COMPILED = {marketplace: _compile(markers + _COMMON_MARKERS) for marketplace, markers in MARKERS.items()}
+_COMPILED_COMMON = _compile(_COMMON_MARKERS)
+
+
+@dataclass(slots=True, frozen=True)
+class PageVerdict:
+    """Classificação de uma página logo após a navegação."""
+
+    kind: str
+    motivo: str = ''
+
+    @property
+    def blocked(self):
+        return self.kind != OK
+
+
+class PageBlocked(Exception):
+    """A página é captcha, login, produto indisponível ou erro HTTP: não há o que extrair."""
+
+    def __init__(self, marketplace, url, verdict):
+        super().__init__(f'[{marketplace}] Página de {verdict.kind} em {url}: {verdict.motivo}')
+        self.marketplace = marketplace
+        self.url = url
+        self.verdict = verdict
+
+
+def classify(marketplace, status=None, url='', title='', text=''):
+    """Classifica uma página pelo status HTTP, URL final, título e texto visível."""
+    if status in (404, 410):
+        return PageVerdict(INDISPONIVEL, f'status {status}')
+    if status in (403, 429):
+        return PageVerdict(CAPTCHA, f'status {status}')
+    if status is not None and status >= 400:
+        return PageVerdict(ERRO_HTTP, f'status {status}')
+    fields = {'url': url or '', 'title': title or '', 'text': (text or '')[:TEXT_SAMPLE]}
+    for kind, where, pattern, unless in _COMPILED.get(marketplace, _COMPILED_COMMON):
+        match = pattern.search(fields[where])
+        if match and not (unless is not None and unless.search(fields[where])):
+            return PageVerdict(kind, f'{where}: {match.group(0)!r}')
+    return PageVerdict(OK)
+
+
+async def check_page(page, response, marketplace):
+    """Classifica a página do Playwright logo após o goto; levanta PageBlocked se não há ofertas.
+
+    Só lê o que já está carregado (status, URL, título e texto do body), sem
+    esperar seletores, então uma página bloqueada custa milissegundos.
+    """
+    status = response.status if response is not None else None
+    try:
+        title = await page.title()
+        text = await page.evaluate(
+            f"() => document.body ? document.body.innerText.slice(0, {TEXT_SAMPLE}) : ''"
+        )
+    except Exception:
+        title = text = ''
+    verdict = classify(marketplace, status, page.url, title, text)
+    if verdict.blocked:
+        raise PageBlocked(marketplace, page.url, verdict)
+    return verdict
+
+
+def check_crawl_result(result, marketplace):
+    """Mesma classificação para um resultado do crawl4ai (status, URL final e markdown)."""
+    url = getattr(result, 'redirected_url', None) or result.url
+    verdict = classify(marketplace, getattr(result, 'status_code', None), url, '', result.markdown or '')
+    if verdict.blocked:
+        raise PageBlocked(marketplace, result.url, verdict)
+    return verdict
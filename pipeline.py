@@ -0,0 +1,142 @@
+import asyncio
+
+# Marca de fim de fila entre os estágios
+_FIM = object()
+# Resultado de uma URL de source que não foi crawleada (ex.: circuito aberto)
+ADIADO = object()
+
+
+class StagedPipeline:
+    """Pipeline crawl → parse → upload em estágios ligados por filas limitadas.
+
+    - produtor: coloca as URLs na fila de crawl;
+    - crawl_workers: chamam crawl(url) e entregam o resultado bruto ao parse;
+    - parse: chama parse(bruto) e entrega os itens normalizados ao upload;
+    - upload_workers: chamam upload(url, itens), que retorna True se salvou.
+
+    Como as filas têm tamanho máximo, uma API lenta enche a fila de upload,
+    que trava o parse, que trava os workers de crawl: o crawl desacelera em vez
+    de acumular resultados na memória. sources são iteráveis assíncronos
+    extras de (url, bruto) que entram direto no parse (ex.: o lote da Beleza);
+    bruto ADIADO marca a URL como 'adiado'.
+    skip(url), se informado, é consultado antes do crawl: URLs recusadas
+    são marcadas 'adiado' na hora, sem crawl nem espera.
+    """
+
+    def __init__(self, crawl, parse, upload, crawl_workers=3, upload_workers=2,
+                 queue_size=10, crawl_delay=1.0, metrics=None, sample_interval=0.5, skip=None):
+        self.crawl = crawl
+        self.parse = parse
+        self.upload = upload
+        self.crawl_workers = crawl_workers
+        self.upload_workers = upload_workers
+        self.queue_size = queue_size
+        self.crawl_delay = crawl_delay
+        self.metrics = metrics
+        self.sample_interval = sample_interval
+        self.skip = skip
+        self.outcomes = {}
+        self._total = 0
+
+    def _done(self, url, status):
+        self.outcomes[url] = status
+        print(f'Processado {len(self.outcomes)}/{self._total} URLs ({status}): {url}')
+
+    async def _produce(self, urls, url_queue):
+        for url in urls:
+            await url_queue.put(url)
+        for _ in range(self.crawl_workers):
+            await url_queue.put(_FIM)
+
+    async def _crawl_worker(self, url_queue, parse_queue):
+        while True:
+            url = await url_queue.get()
+            if url is _FIM:
+                return
+            if self.skip is not None and self.skip(url):
+                self._done(url, 'adiado')
+                continue
+            try:
+                raw = await self.crawl(url)
+            except Exception as e:
+                print(f'Erro ao crawlear a URL {url}: {e}')
+                raw = None
+            await parse_queue.put((url, raw))
+            if self.crawl_delay:
+                await asyncio.sleep(self.crawl_delay)
+
+    async def _drain_source(self, source, parse_queue):
+        async for url, raw in source:
+            if raw is ADIADO:
+                self._done(url, 'adiado')
+                continue
+            await parse_queue.put((url, raw))
+
+    async def _parse_worker(self, parse_queue, upload_queue):
+        while True:
+            item = await parse_queue.get()
+            if item is _FIM:
+                break
+            url, raw = item
+            try:
+                items = self.parse(raw) if raw else []
+            except Exception as e:
+                print(f'Erro ao normalizar dados de {url}: {e}')
+                items = []
+            if not items:
+                print(f'Sem dados para {url}, marcando para lista de URLs sem dados')
+                self._done(url, 'sem_dados')
+                continue
+            await upload_queue.put((url, items))
+        for _ in range(self.upload_workers):
+            await upload_queue.put(_FIM)
+
+    async def _upload_worker(self, upload_queue):
+        while True:
+            item = await upload_queue.get()
+            if item is _FIM:
+                return
+            url, items = item
+            try:
+                ok = await self.upload(url, items)
+            except Exception as e:
+                print(f'Erro ao enviar dados de {url}: {e}')
+                ok = False
+            self._done(url, 'ok' if ok else 'falha')
+
+    async def _sample_queues(self, queues):
+        while True:
+            for name, queue in queues.items():
+                self.metrics.record_queue_depth(name, queue.qsize())
+            await asyncio.sleep(self.sample_interval)
+
+    async def run(self, urls, sources=(), total=None):
+        """Executa o pipeline e retorna {url: 'ok' | 'sem_dados' | 'falha' | 'adiado'}."""
+        self._total = total if total is not None else len(urls)
+        url_queue = asyncio.Queue(self.queue_size)
+        parse_queue = asyncio.Queue(self.queue_size)
+        upload_queue = asyncio.Queue(self.queue_size)
+
+        sampler = None
+        if self.metrics is not None:
+            sampler = asyncio.create_task(self._sample_queues({
+                'crawl': url_queue, 'parse': parse_queue, 'upload': upload_queue,
+            }))
+
+        parser = asyncio.create_task(self._parse_worker(parse_queue, upload_queue))
+        uploaders = [asyncio.create_task(self._upload_worker(upload_queue))
+                     for _ in range(self.upload_workers)]
+        producers = [self._produce(urls, url_queue)]
+        producers += [self._crawl_worker(url_queue, parse_queue) for _ in range(self.crawl_workers)]
+        producers += [self._drain_source(source, parse_queue) for source in sources]
+        try:
+            await asyncio.gather(*producers)
+            await parse_queue.put(_FIM)
+            await parser
+            await asyncio.gather(*uploaders)
+        finally:
+            for task in [parser, *uploaders]:
+                task.cancel()
+            if sampler is not None:
+                sampler.cancel()
+        return self.outcomes
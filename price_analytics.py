@@ -0,0 +1,252 @@
+"""Análise de preços entre vendedores ao fim de cada execução.
+
+As ofertas da execução viram arrays NumPy (produto, loja, preço) e as
+estatísticas por produto saem de uma ordenação só: menor preço, mediana,
+spread, vencedor do buy box (o menor preço), posição das nossas lojas
+(OWN_STORES, por key_loja) e quedas de preço em relação à execução anterior,
+guardada em ANALYTICS_SNAPSHOT.
+
+Saída: dados/analise-<run_id>.json, com as colunas por produto e a lista de
+alertas (só os ANALYTICS_KEEP_REPORTS mais recentes ficam), e um resumo no console. O snapshot acumula: cada execução
+atualiza os produtos e ofertas que viu e mantém os demais, para que
+execuções parciais (ex.: os lotes do daemon) ainda tenham com o que comparar.
+"""
+import glob
+import os
+import time
+
+import numpy as np
+
+from sinks import DATA_DIR
+from state_files import write_file_atomic, write_json_atomic
+
+# key_loja das nossas lojas, separados por vírgula (ex.: 'minhaloja,minhaloja2')
+OWN_STORES = [
+    store.strip().lower().replace(' ', '')
+    for store in os.environ.get('OWN_STORES', '').split(',') if store.strip()
+]
+# Queda mínima, em %, para gerar alerta
+PRICE_DROP_ALERT_PCT = float(os.environ.get('PRICE_DROP_ALERT_PCT', '5'))
+ANALYTICS_SNAPSHOT = os.path.join(DATA_DIR, 'analise-ultima.npz')
+# Relatórios analise-<run_id>.json mantidos (o daemon grava um por lote; 0 = todos)
+ANALYTICS_KEEP_REPORTS = int(os.environ.get('ANALYTICS_KEEP_REPORTS', '20'))
+
+
+def product_key(offer):
+    return f'{offer.marketplace}:{offer.sku}'
+
+
+def _price(value):
+    # preco_final ainda vem como str de alguns extratores
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def offer_arrays(offers, key_func=product_key):
+    """(produto, loja, preço) das ofertas com preço válido, como arrays."""
+    produtos = np.asarray([key_func(offer) for offer in offers], dtype=str)
+    lojas = np.asarray([offer.key_loja or '' for offer in offers], dtype=str)
+    precos = np.asarray([_price(offer.preco_final) for offer in offers], dtype=np.float64)
+    valid = np.isfinite(precos) & (precos > 0)
+    return produtos[valid], lojas[valid], precos[valid]
+
+
+def load_snapshot(path=ANALYTICS_SNAPSHOT):
+    """Preços da execução anterior, ou None na primeira execução."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _merge(previous_keys, previous_values, keys, values):
+    """Chaves anteriores mais as atuais (que prevalecem), ordenadas para o _lookup."""
+    if previous_keys is None or not len(previous_keys):
+        return keys, values
+    kept = ~np.isin(previous_keys, keys)
+    merged_keys = np.concatenate([previous_keys[kept], keys])
+    merged_values = np.concatenate([previous_values[kept], values])
+    order = np.argsort(merged_keys, kind='stable')
+    return merged_keys[order], merged_values[order]
+
+
+def merge_snapshot(previous, current):
+    """Snapshot com os produtos e ofertas de current sobre os de previous."""
+    if not previous:
+        return current
+    produtos, minimo = _merge(previous.get('produtos'), previous.get('minimo'), current['produtos'], current['minimo'])
+    ofertas, precos = _merge(previous.get('ofertas'), previous.get('precos'), current['ofertas'], current['precos'])
+    return {'produtos': produtos, 'minimo': minimo, 'ofertas': ofertas, 'precos': precos}
+
+
+def prune_reports(directory=DATA_DIR, keep=ANALYTICS_KEEP_REPORTS):
+    """Apaga os analise-<run_id>.json além dos keep mais recentes (run_id ordena pela data)."""
+    reports = sorted(glob.glob(os.path.join(directory, 'analise-*.json')))
+    for path in reports[:-keep] if keep > 0 else []:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f'Erro ao apagar o relatório antigo {path}: {e}')
+
+
+def _lookup(keys, previous_keys, previous_values):
+    """Valor anterior de cada chave (NaN se ela não existia), via busca binária."""
+    result = np.full(len(keys), np.nan)
+    if previous_keys is None or not len(previous_keys) or not len(keys):
+        return result
+    idx = np.clip(np.searchsorted(previous_keys, keys), 0, len(previous_keys) - 1)
+    found = previous_keys[idx] == keys
+    result[found] = previous_values[idx[found]]
+    return result
+
+
+class PriceReport:
+    """Estatísticas por produto de uma execução e os alertas gerados."""
+
+    def __init__(self, produtos, ofertas, minimo, mediana, spread, vencedor, rank_proprio,
+                 preco_proprio, minimo_anterior, alertas, snapshot):
+        self.produtos = produtos
+        self.ofertas = ofertas
+        self.minimo = minimo
+        self.mediana = mediana
+        self.spread = spread
+        self.vencedor = vencedor
+        self.rank_proprio = rank_proprio
+        self.preco_proprio = preco_proprio
+        self.minimo_anterior = minimo_anterior
+        self.alertas = alertas
+        self.snapshot = snapshot
+
+    def as_dict(self):
+        """Formato compacto: uma lista por coluna, na ordem de produtos."""
+        def column(values):
+            return [None if isinstance(v, float) and np.isnan(v) else v for v in values.tolist()]
+
+        return {
+            'produtos': self.produtos.tolist(),
+            'ofertas': self.ofertas.tolist(),
+            'minimo': column(self.minimo),
+            'mediana': column(self.mediana),
+            'spread': column(self.spread),
+            'vencedor': self.vencedor.tolist(),
+            'rank_proprio': self.rank_proprio.tolist(),
+            'preco_proprio': column(self.preco_proprio),
+            'minimo_anterior': column(self.minimo_anterior),
+            'alertas': self.alertas,
+        }
+
+    def save(self, run_id, directory=DATA_DIR, keep=None):
+        """Grava o relatório (escrita atômica) e apaga os mais antigos que os keep mais recentes."""
+        path = os.path.join(directory, f'analise-{run_id}.json')
+        write_json_atomic(path, {'run_id': run_id, **self.as_dict()})
+        prune_reports(directory, ANALYTICS_KEEP_REPORTS if keep is None else keep)
+        return path
+
+    def save_snapshot(self, path=ANALYTICS_SNAPSHOT, previous=None):
+        """Junta os preços desta execução ao snapshot previous e grava para a próxima (escrita atômica)."""
+        snapshot = merge_snapshot(previous, self.snapshot)
+        write_file_atomic(path, lambda f: np.savez(f, **snapshot), binary=True)
+
+    def print_report(self):
+        total = len(self.produtos)
+        if not total:
+            print('Análise de preços: nenhuma oferta com preço válido')
+            return
+        com_loja_propria = self.rank_proprio > 0
+        print(f'Análise de preços: {total} produtos, {int(self.ofertas.sum())} ofertas, '
+              f'spread mediano {np.median(self.spread / self.minimo) * 100:.1f}%')
+        if com_loja_propria.any():
+            print(f'  Nossas lojas: presentes em {int(com_loja_propria.sum())} produtos, '
+                  f'vencem o buy box em {int((self.rank_proprio == 1).sum())}')
+        print(f'  Alertas: {len(self.alertas)}')
+        for alerta in self.alertas[:10]:
+            print(f'    {alerta}')
+
+
+def analyze(offers, own_stores=None, previous=None, key_func=product_key, drop_pct=None):
+    """Estatísticas por produto das ofertas, comparadas com o snapshot previous."""
+    own_stores = OWN_STORES if own_stores is None else own_stores
+    drop_pct = PRICE_DROP_ALERT_PCT if drop_pct is None else drop_pct
+    keys, lojas, precos = offer_arrays(offers, key_func)
+
+    produtos, grupo = np.unique(keys, return_inverse=True)
+    # Ordena por produto e, dentro dele, por preço: cada grupo vira uma fatia contígua
+    order = np.lexsort((precos, grupo))
+    grupo, lojas, precos, keys = grupo[order], lojas[order], precos[order], keys[order]
+    ofertas = np.bincount(grupo, minlength=len(produtos))
+    inicio = np.cumsum(ofertas) - ofertas
+    fim = inicio + ofertas - 1
+
+    minimo = precos[inicio]
+    mediana = (precos[inicio + (ofertas - 1) // 2] + precos[inicio + ofertas // 2]) / 2
+    spread = precos[fim] - minimo
+    vencedor = lojas[inicio]
+
+    # Posição com empates (1, 2, 2, 4): índice do primeiro preço igual dentro do grupo
+    posicoes = np.arange(len(precos))
+    novo_preco = np.ones(len(precos), dtype=bool)
+    novo_preco[1:] = (grupo[1:] != grupo[:-1]) | (precos[1:] != precos[:-1])
+    primeiro_igual = np.maximum.accumulate(np.where(novo_preco, posicoes, 0))
+    rank = primeiro_igual - inicio[grupo] + 1
+
+    proprias = np.isin(lojas, own_stores) if own_stores else np.zeros(len(lojas), dtype=bool)
+    sem_rank = np.iinfo(np.int64).max
+    rank_proprio = np.full(len(produtos), sem_rank, dtype=np.int64)
+    np.minimum.at(rank_proprio, grupo[proprias], rank[proprias])
+    rank_proprio[rank_proprio == sem_rank] = 0
+    preco_proprio = np.full(len(produtos), np.inf)
+    np.minimum.at(preco_proprio, grupo[proprias], precos[proprias])
+    preco_proprio[np.isinf(preco_proprio)] = np.nan
+
+    # Preço por (produto, loja): o menor, se a loja aparece mais de uma vez
+    oferta_keys = np.char.add(np.char.add(keys, '|'), lojas)
+    oferta_keys, primeira = np.unique(oferta_keys, return_index=True)
+    oferta_precos = precos[primeira]
+
+    previous = previous or {}
+    minimo_anterior = _lookup(produtos, previous.get('produtos'), previous.get('minimo'))
+    preco_anterior = _lookup(oferta_keys, previous.get('ofertas'), previous.get('precos'))
+
+    alertas = []
+    with np.errstate(invalid='ignore', divide='ignore'):
+        queda = (preco_anterior - oferta_precos) / preco_anterior * 100
+        queda_minimo = (minimo_anterior - minimo) / minimo_anterior * 100
+    for idx in np.flatnonzero(queda >= drop_pct).tolist():
+        produto, loja = oferta_keys[idx].rsplit('|', 1)
+        alertas.append({
+            'tipo': 'queda_preco', 'produto': produto, 'loja': loja,
+            'preco_anterior': float(preco_anterior[idx]), 'preco': float(oferta_precos[idx]),
+            'queda_pct': round(float(queda[idx]), 1),
+        })
+    for idx in np.flatnonzero(queda_minimo >= drop_pct).tolist():
+        alertas.append({
+            'tipo': 'queda_minimo', 'produto': str(produtos[idx]), 'vencedor': str(vencedor[idx]),
+            'minimo_anterior': float(minimo_anterior[idx]), 'minimo': float(minimo[idx]),
+            'queda_pct': round(float(queda_minimo[idx]), 1),
+        })
+    for idx in np.flatnonzero(rank_proprio > 1).tolist():
+        alertas.append({
+            'tipo': 'buy_box_perdido', 'produto': str(produtos[idx]), 'vencedor': str(vencedor[idx]),
+            'minimo': float(minimo[idx]), 'preco_proprio': float(preco_proprio[idx]),
+            'posicao': int(rank_proprio[idx]),
+        })
+
+    snapshot = {'produtos': produtos, 'minimo': minimo, 'ofertas': oferta_keys, 'precos': oferta_precos}
+    return PriceReport(produtos, ofertas, minimo, mediana, spread, vencedor, rank_proprio,
+                       preco_proprio, minimo_anterior, alertas, snapshot)
+
+
+def analyze_run(run_id, offers, snapshot_path=ANALYTICS_SNAPSHOT, key_func=product_key):
+    """Analisa as ofertas de uma execução, grava o relatório e atualiza o snapshot."""
+    started = time.perf_counter()
+    previous = load_snapshot(snapshot_path)
+    report = analyze(offers, previous=previous, key_func=key_func)
+    elapsed = time.perf_counter() - started
+    if len(report.produtos):
+        path = report.save(run_id)
+        report.save_snapshot(snapshot_path, previous)
+        print(f'Relatório de preços gravado em {path} ({elapsed * 1000:.0f} ms)')
+    report.print_report()
+    return report
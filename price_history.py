@@ -0,0 +1,369 @@
+"""Histórico local de preços em colunas NumPy, particionado por dia e marketplace.
+
+dados/historico/
+    dicionario.json                      skus e lojas -> ids inteiros (só cresce)
+    historico.lock                       trava entre processos das escritas
+    dia=2025-01-01/marketplace=amazon/
+        part-<run_id>.npz                uma parte por execução
+        dia.npz                          partes do dia compactadas num arquivo só
+
+Cada parte guarda as colunas ts (epoch em segundos, int64), sku e loja
+(ids int32 do dicionário) e preco (float64). As consultas só leem as
+partições do intervalo pedido, mantêm as colunas carregadas em memória e
+filtram com máscaras vetorizadas.
+
+O daemon, a execução agendada e a compactação pela linha de comando podem
+escrever no mesmo diretório: cada escrita (recarregar o dicionário, dar ids,
+gravá-lo e gravar as partes) e cada compactação acontece sob historico.lock,
+para dois processos nunca darem o mesmo id a skus diferentes.
+
+Uso: python price_history.py serie <sku> [dias]
+     python price_history.py menor [dias] [marketplace]
+     python price_history.py compactar
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from filelock import FileLock
+
+from sinks import DATA_DIR, BatchedFileSink
+from state_files import write_file_atomic, write_json_atomic
+
+HISTORY_DIR = os.path.join(DATA_DIR, 'historico')
+COLUMNS = ('ts', 'sku', 'loja', 'preco')
+# Intervalos de consulta recentes mantidos já concatenados
+CONCAT_CACHE_SIZE = 8
+DTYPES = {'ts': np.int64, 'sku': np.int32, 'loja': np.int32, 'preco': np.float64}
+
+
+def marketplace_slug(marketplace):
+    text = unicodedata.normalize('NFKD', marketplace or 'desconhecido').encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def parse_timestamp(data_hora):
+    """data_hora dos extratores ('...Z', com ou sem microssegundos) em epoch UTC."""
+    parsed = datetime.fromisoformat(data_hora.rstrip('Z'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _as_day(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def _as_ts(value, end=False):
+    """Limite do intervalo em epoch; um dia sem hora cobre o dia inteiro."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        moment = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp())
+    day = _as_day(value)
+    moment = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    if end:
+        moment += timedelta(days=1)
+    return int(moment.timestamp()) - (1 if end else 0)
+
+
+def _write_npz(path, columns):
+    """Grava as colunas num .npz (escrita atômica)."""
+    write_file_atomic(path, lambda f: np.savez(f, **columns), binary=True)
+
+
+class _Dictionary:
+    """skus e lojas -> ids estáveis, persistidos em dicionario.json."""
+
+    def __init__(self, path):
+        self.path = path
+        self.skus = []
+        self.lojas = []
+        self._sku_ids = {}
+        self._loja_ids = {}
+        self._mtime = None
+        self.reload()
+
+    def reload(self, force=False):
+        mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        if mtime == self._mtime and not force:
+            return
+        self._mtime = mtime
+        if mtime is None:
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.skus, self.lojas = data['skus'], data['lojas']
+        self._sku_ids = {sku: i for i, sku in enumerate(self.skus)}
+        self._loja_ids = {loja: i for i, loja in enumerate(self.lojas)}
+
+    def ids(self, values, kind):
+        table = self.skus if kind == 'sku' else self.lojas
+        index = self._sku_ids if kind == 'sku' else self._loja_ids
+        out = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            value_id = index.get(value)
+            if value_id is None:
+                value_id = index[value] = len(table)
+                table.append(value)
+            out[i] = value_id
+        return out
+
+    def sku_id(self, sku):
+        self.reload()
+        return self._sku_ids.get(sku)
+
+    def names(self, codes, kind):
+        """Nomes dos ids em codes; ids que o dicionário não tem viram None.
+
+        O dicionário é gravado antes das partes, então um id desconhecido só
+        aparece com um dicionário em memória mais antigo que o arquivo (o
+        reload resolve) ou com um arquivo danificado.
+        """
+        self.reload()
+        table = self.skus if kind == 'sku' else self.lojas
+        return [table[code] if code < len(table) else None for code in codes]
+
+    def save(self):
+        write_json_atomic(self.path, {'skus': self.skus, 'lojas': self.lojas})
+        self._mtime = os.path.getmtime(self.path)
+
+
+class PriceHistory:
+    """Leitura e escrita do histórico de preços."""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.dictionary = _Dictionary(os.path.join(root, 'dicionario.json'))
+        self._cache = {}
+        self._concat_cache = {}
+        self._lock = threading.Lock()
+        # Trava entre processos que escrevem no mesmo diretório (o _lock só vale para as threads deste)
+        self._file_lock = FileLock(os.path.join(root, 'historico.lock'))
+
+    # --- escrita ---
+
+    def append(self, run_id, rows):
+        """Acrescenta linhas (dicts no formato de Offer.as_dict()) numa parte por partição."""
+        partitions = {}
+        for row in rows:
+            try:
+                ts = parse_timestamp(row['data_hora'])
+                preco = float(row['preco_final'])
+            except (TypeError, ValueError, AttributeError):
+                continue
+            day = datetime.fromtimestamp(ts, timezone.utc).date().isoformat()
+            key = (day, marketplace_slug(row.get('marketplace')))
+            partitions.setdefault(key, []).append((ts, row['sku'], row['loja'], preco))
+        if not partitions:
+            return
+        with self._lock, self._file_lock:
+            # Sob a trava, o arquivo tem os ids de todos os processos: os novos continuam dele
+            self.dictionary.reload(force=True)
+            parts = {}
+            for (day, marketplace), values in partitions.items():
+                ts, skus, lojas, precos = zip(*values)
+                parts[(day, marketplace)] = {
+                    'ts': np.asarray(ts, dtype=np.int64),
+                    'sku': self.dictionary.ids(skus, 'sku'),
+                    'loja': self.dictionary.ids(lojas, 'loja'),
+                    'preco': np.asarray(precos, dtype=np.float64),
+                }
+            # Dicionário antes das partes: quem lê nunca encontra um id que ele não tem
+            self.dictionary.save()
+            for (day, marketplace), columns in parts.items():
+                directory = os.path.join(self.root, f'dia={day}', f'marketplace={marketplace}')
+                os.makedirs(directory, exist_ok=True)
+                _write_npz(os.path.join(directory, f'part-{run_id}.npz'), columns)
+
+    def compact(self, before=None):
+        """Junta as partes de cada partição dos dias anteriores a before (padrão: hoje) em dia.npz."""
+        before = _as_day(before) or datetime.now(timezone.utc).date()
+        compacted = 0
+        with self._lock, self._file_lock:
+            for day, directory in self._partition_dirs(None, before - timedelta(days=1), None):
+                parts = sorted(name for name in os.listdir(directory) if name.startswith('part-'))
+                if not parts:
+                    continue
+                columns = self._read_dir(directory)
+                _write_npz(os.path.join(directory, 'dia.npz'), columns)
+                for name in parts:
+                    os.remove(os.path.join(directory, name))
+                compacted += 1
+        return compacted
+
+    # --- leitura ---
+
+    def _partition_dirs(self, start_day, end_day, marketplace):
+        slug = marketplace_slug(marketplace) if marketplace else None
+        if not os.path.isdir(self.root):
+            return
+        for day_dir in sorted(os.listdir(self.root)):
+            if not day_dir.startswith('dia='):
+                continue
+            day = date.fromisoformat(day_dir[4:])
+            if start_day and day < start_day or end_day and day > end_day:
+                continue
+            day_path = os.path.join(self.root, day_dir)
+            for market_dir in sorted(os.listdir(day_path)):
+                if slug and market_dir != f'marketplace={slug}':
+                    continue
+                yield day, os.path.join(day_path, market_dir)
+
+    @staticmethod
+    def _read_dir(directory):
+        files = sorted(name for name in os.listdir(directory) if name.endswith('.npz'))
+        loaded = []
+        for name in files:
+            with np.load(os.path.join(directory, name)) as data:
+                loaded.append({column: data[column] for column in COLUMNS})
+        if not loaded:
+            return {column: np.empty(0, dtype=DTYPES[column]) for column in COLUMNS}
+        return {column: np.concatenate([part[column] for part in loaded]) for column in COLUMNS}
+
+    @staticmethod
+    def _stamp(directory):
+        return tuple(
+            (name, os.path.getmtime(os.path.join(directory, name)))
+            for name in sorted(os.listdir(directory)) if name.endswith('.npz')
+        )
+
+    def _load(self, directory, stamp):
+        """Colunas de uma partição, mantidas em memória enquanto os arquivos não mudam."""
+        cached = self._cache.get(directory)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        columns = self._read_dir(directory)
+        self._cache[directory] = (stamp, columns)
+        return columns
+
+    def columns(self, start=None, end=None, marketplace=None):
+        """Colunas de todas as partições do intervalo, já filtradas por ts."""
+        stamps = tuple(
+            (d, self._stamp(d)) for _, d in self._partition_dirs(_as_day(start), _as_day(end), marketplace)
+        )
+        if not stamps:
+            return {column: np.empty(0, dtype=DTYPES[column]) for column in COLUMNS}
+        # Mesmo conjunto de partições sem mudanças: reaproveita a concatenação anterior
+        columns = self._concat_cache.get(stamps)
+        if columns is None:
+            parts = [self._load(d, stamp) for d, stamp in stamps]
+            columns = {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+            if len(self._concat_cache) >= CONCAT_CACHE_SIZE:
+                self._concat_cache.pop(next(iter(self._concat_cache)))
+            self._concat_cache[stamps] = columns
+        start_ts, end_ts = _as_ts(start), _as_ts(end, end=True)
+        if start_ts is not None or end_ts is not None:
+            mask = np.ones(len(columns['ts']), dtype=bool)
+            if start_ts is not None:
+                mask &= columns['ts'] >= start_ts
+            if end_ts is not None:
+                mask &= columns['ts'] <= end_ts
+            columns = {column: values[mask] for column, values in columns.items()}
+        return columns
+
+    def series(self, sku, start=None, end=None, marketplace=None):
+        """Série de preços de um sku: {'ts', 'preco', 'loja'} ordenada por ts."""
+        columns = self.columns(start, end, marketplace)
+        sku_id = self.dictionary.sku_id(sku)
+        if sku_id is None:
+            mask = np.zeros(len(columns['ts']), dtype=bool)
+        else:
+            mask = columns['sku'] == sku_id
+        order = np.argsort(columns['ts'][mask], kind='stable')
+        lojas = self.dictionary.names(columns['loja'][mask][order].tolist(), 'loja')
+        return {
+            'ts': columns['ts'][mask][order],
+            'preco': columns['preco'][mask][order],
+            'loja': np.asarray(lojas, dtype=object),
+        }
+
+    def lowest(self, start=None, end=None, marketplace=None):
+        """Menor preço de cada sku no intervalo: {sku: (preco, loja, ts)}."""
+        columns = self.columns(start, end, marketplace)
+        skus, precos = columns['sku'], columns['preco']
+        if not len(skus):
+            return {}
+        # Dimensionado pelos ids lidos: as partes podem ser mais novas que o dicionário
+        minimo = np.full(int(skus.max()) + 1, np.inf)
+        np.minimum.at(minimo, skus, precos)
+        # Primeira linha de cada sku que atinge o mínimo
+        hits = np.flatnonzero(precos == minimo[skus])
+        unique_skus, first = np.unique(skus[hits], return_index=True)
+        rows = hits[first]
+        nomes = self.dictionary.names(unique_skus.tolist(), 'sku')
+        lojas = self.dictionary.names(columns['loja'][rows].tolist(), 'loja')
+        return {
+            sku: (float(precos[row]), loja, int(columns['ts'][row]))
+            for sku, loja, row in zip(nomes, lojas, rows.tolist())
+            if sku is not None
+        }
+
+
+class PriceHistorySink(BatchedFileSink):
+    """Sink local que acrescenta as ofertas de cada execução ao histórico de preços."""
+
+    name = 'historico'
+
+    def __init__(self, run_id, batch_size=1000, root=HISTORY_DIR):
+        super().__init__(run_id, batch_size)
+        self.history = PriceHistory(root)
+        self._part = 0
+
+    def _write_rows(self, rows):
+        self.history.append(f'{self.run_id}-{self._part:04d}', rows)
+        self._part += 1
+
+    async def close(self):
+        await super().close()
+        # Dias já fechados viram um arquivo por partição, para consultas longas lerem menos arquivos
+        await asyncio.to_thread(self.history.compact)
+
+
+def _print_series(history, sku, dias):
+    start = datetime.now(timezone.utc).date() - timedelta(days=dias)
+    started = time.perf_counter()
+    serie = history.series(sku, start=start)
+    elapsed = (time.perf_counter() - started) * 1000
+    for ts, preco, loja in zip(serie['ts'].tolist(), serie['preco'].tolist(), serie['loja'].tolist()):
+        print(f"{datetime.fromtimestamp(ts, timezone.utc).isoformat()}  {preco:10.2f}  {loja}")
+    print(f'{len(serie["ts"])} pontos em {elapsed:.1f} ms')
+
+
+def _print_lowest(history, dias, marketplace=None):
+    start = datetime.now(timezone.utc).date() - timedelta(days=dias)
+    started = time.perf_counter()
+    menores = history.lowest(start=start, marketplace=marketplace)
+    elapsed = (time.perf_counter() - started) * 1000
+    for sku, (preco, loja, ts) in sorted(menores.items()):
+        print(f"{sku:20}  {preco:10.2f}  {loja}  {datetime.fromtimestamp(ts, timezone.utc).date()}")
+    print(f'{len(menores)} skus em {elapsed:.1f} ms')
+
+
+if __name__ == '__main__':
+    history = PriceHistory()
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    if command == 'serie' and len(sys.argv) > 2:
+        _print_series(history, sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 30)
+    elif command == 'menor':
+        _print_lowest(history, int(sys.argv[2]) if len(sys.argv) > 2 else 30,
+                      sys.argv[3] if len(sys.argv) > 3 else None)
+    elif command == 'compactar':
+        print(f'{history.compact()} partições compactadas')
+    else:
+        print(__doc__)
@@ -0,0 +1,158 @@
+"""Índice de identidade de produtos entre marketplaces.
+
+O mesmo produto aparece como EAN na Época (pesquisa?q=<EAN>), ASIN na
+Amazon, MLB no Mercado Livre e Cod: na Beleza na Web. O índice liga cada
+'<marketplace>:<sku>' a um produto canônico ('ean:<EAN>' quando o EAN é
+conhecido; senão a própria chave) a partir do que é raspado: o EAN que a
+Época já confere na página do produto e o EAN/GTIN que aparece nas páginas
+dos outros marketplaces (ProductHeader.ean).
+
+Com o índice, descrição e imagem são extraídas uma vez por produto canônico
+(os extratores pulam essas esperas quando metadata() já as conhece) e a
+análise de preços agrupa as ofertas pelo produto canônico.
+"""
+import json
+import os
+import re
+
+from sinks import DATA_DIR
+from state_files import write_json_atomic
+
+IDENTITY_FILE = os.path.join(DATA_DIR, 'identidades.json')
+EAN_PATTERN = re.compile(
+    r'(?:EAN|GTIN(?:-13)?|[Cc]ódigo de barras|[Cc]ódigo universal(?: de produto)?)\D{0,200}?(\d{13})(?!\d)'
+)
+# Valores que os extratores usam quando não acham o dado
+MISSING_VALUES = {None, '', 'Descrição não encontrada', 'Imagem não encontrada'}
+
+
+def valid_ean(code):
+    """True se code é um EAN-13 com dígito verificador correto."""
+    if not code or len(code) != 13 or not code.isdigit():
+        return False
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(code[:12]))
+    return (10 - total % 10) % 10 == int(code[12])
+
+
+def find_ean(text):
+    """Primeiro EAN-13 válido rotulado como EAN/GTIN/código de barras em text, ou None."""
+    if not text:
+        return None
+    for match in EAN_PATTERN.finditer(text):
+        if valid_ean(match.group(1)):
+            return match.group(1)
+    return None
+
+
+def identity_key(marketplace, sku):
+    return f'{marketplace}:{sku}'
+
+
+class ProductIdentityIndex:
+    """'<marketplace>:<sku>' -> produto canônico, com os metadados compartilhados."""
+
+    def __init__(self, path=IDENTITY_FILE):
+        self.path = path
+        self._aliases = None
+        self._products = None
+        self._dirty = False
+
+    def load(self):
+        """Lê o arquivo do índice na primeira chamada.
+
+        Os extratores consultam o índice no event loop: quem os roda chama
+        load() antes, numa thread (asyncio.to_thread), para a leitura não
+        acontecer no meio do crawl.
+        """
+        if self._aliases is not None:
+            return
+        self._aliases, self._products = {}, {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._aliases = data.get('ids', {})
+            self._products = data.get('produtos', {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f'Erro ao carregar o índice de identidades {self.path}: {e}')
+
+    def canonical(self, marketplace, sku):
+        self.load()
+        key = identity_key(marketplace, sku)
+        return self._aliases.get(key, key)
+
+    def product_key(self, offer):
+        """Chave de agrupamento de uma oferta (ex.: key_func de price_analytics.analyze)."""
+        return self.canonical(offer.marketplace, offer.sku)
+
+    def metadata(self, marketplace, sku):
+        """Descrição e imagem já extraídas para o produto canônico, ou None."""
+        if not sku:
+            return None
+        self.load()
+        product = self._products.get(self.canonical(marketplace, sku))
+        if product is None or product.get('descricao') in MISSING_VALUES or product.get('imagem') in MISSING_VALUES:
+            return None
+        return product
+
+    def _link(self, key, canonical):
+        """Aponta key para canonical, levando junto o que estava sob a chave antiga."""
+        old = self._aliases.get(key, key)
+        if old == canonical:
+            return
+        if old.startswith('ean:'):
+            print(f'{key} mudou de produto: {old} -> {canonical}')
+        old_product = self._products.get(old)
+        product = self._products.setdefault(canonical, {'ids': []})
+        if old_product is not None and old.startswith('ean:'):
+            if key in old_product['ids']:
+                old_product['ids'].remove(key)
+        elif old_product is not None:
+            del self._products[old]
+            for field, value in old_product.items():
+                if field != 'ids':
+                    product.setdefault(field, value)
+        self._aliases[key] = canonical
+        if key not in product['ids']:
+            product['ids'].append(key)
+        self._dirty = True
+
+    def observe(self, header):
+        """Registra um ProductHeader raspado; retorna o produto canônico dele."""
+        if not header.sku or header.sku == 'SKU não encontrado':
+            return None
+        self.load()
+        key = identity_key(header.marketplace, header.sku)
+        ean = header.ean if valid_ean(header.ean) else None
+        if ean is not None:
+            self._link(key, f'ean:{ean}')
+        canonical = self._aliases.get(key, key)
+        product = self._products.get(canonical)
+        if product is None:
+            product = self._products[canonical] = {'ids': [key]}
+            self._dirty = True
+        if ean is not None and product.get('ean') != ean:
+            product['ean'] = ean
+            self._dirty = True
+        for field in ('descricao', 'imagem'):
+            value = getattr(header, field)
+            if product.get(field) in MISSING_VALUES and value not in MISSING_VALUES:
+                product[field] = value
+                self._dirty = True
+        return canonical
+
+    def linked(self):
+        """Quantos produtos canônicos juntam ids de mais de um marketplace."""
+        self.load()
+        return sum(1 for product in self._products.values() if len(product['ids']) > 1)
+
+    def save(self):
+        """Grava o índice, se mudou (escrita atômica)."""
+        if not self._dirty:
+            return
+        write_json_atomic(self.path, {'ids': self._aliases, 'produtos': self._products})
+        self._dirty = False
+
+
+IDENTITY = ProductIdentityIndex()
@@ -0,0 +1,131 @@
+import os
+from dataclasses import dataclass
+
+# Formato do corpo enviado à API: 'flat' (uma entrada completa por vendedor,
+# compatível com a API atual) ou 'grouped' (ofertas agrupadas por produto)
+PAYLOAD_FORMAT = os.environ.get('PAYLOAD_FORMAT', 'flat')
+
+
+@dataclass(slots=True, frozen=True)
+class ProductHeader:
+    """Dados do produto, iguais para todos os vendedores de uma página."""
+
+    sku: str
+    marketplace: str
+    descricao: str
+    review: float
+    imagem: str
+    # EAN/GTIN lido na página, quando há (não vai para a API; ver product_identity)
+    ean: str = None
+
+
+@dataclass(slots=True)
+class Offer:
+    """Oferta de um vendedor. O cabeçalho do produto é compartilhado, não copiado."""
+
+    product: ProductHeader
+    loja: str
+    preco_final: float
+    data_hora: str
+    key_loja: str
+    key_sku: str
+    status: str = 'ativo'
+
+    @property
+    def sku(self):
+        return self.product.sku
+
+    @property
+    def marketplace(self):
+        return self.product.marketplace
+
+    def as_dict(self):
+        """Oferta no formato plano original (um dicionário por vendedor)."""
+        return {
+            'sku': self.product.sku,
+            'loja': self.loja,
+            'preco_final': self.preco_final,
+            'data_hora': self.data_hora,
+            'marketplace': self.product.marketplace,
+            'key_loja': self.key_loja,
+            'key_sku': self.key_sku,
+            'descricao': self.product.descricao,
+            'review': self.product.review,
+            'imagem': self.product.imagem,
+            'status': self.status,
+        }
+
+
+def to_flat(offers):
+    """Lista de dicionários no formato plano, aceito pela API atual."""
+    return [offer.as_dict() for offer in offers]
+
+
+def to_grouped(offers):
+    """Agrupa as ofertas sob um único cabeçalho por produto.
+
+    {"produtos": [{"sku", "marketplace", "descricao", "review", "imagem",
+                   "ofertas": [{"loja", "preco_final", "data_hora", "key_loja",
+                                "key_sku", "status"}, ...]}]}
+    """
+    grupos = {}
+    for offer in offers:
+        grupo = grupos.get(offer.product)
+        if grupo is None:
+            header = offer.product
+            grupo = grupos[header] = {
+                'sku': header.sku,
+                'marketplace': header.marketplace,
+                'descricao': header.descricao,
+                'review': header.review,
+                'imagem': header.imagem,
+                'ofertas': [],
+            }
+        grupo['ofertas'].append({
+            'loja': offer.loja,
+            'preco_final': offer.preco_final,
+            'data_hora': offer.data_hora,
+            'key_loja': offer.key_loja,
+            'key_sku': offer.key_sku,
+            'status': offer.status,
+        })
+    return {'produtos': list(grupos.values())}
+
+
+def from_flat(items):
+    """Reconstrói as ofertas a partir do formato plano, compartilhando cabeçalhos iguais."""
+    headers = {}
+    offers = []
+    for item in items:
+        header = ProductHeader(
+            item.get('sku'), item.get('marketplace'), item.get('descricao'),
+            item.get('review'), item.get('imagem'),
+        )
+        header = headers.setdefault(header, header)
+        offers.append(Offer(
+            header, item.get('loja'), item.get('preco_final'), item.get('data_hora'),
+            item.get('key_loja'), item.get('key_sku'), item.get('status', 'ativo'),
+        ))
+    return offers
+
+
+def from_grouped(payload):
+    """Reconstrói as ofertas a partir do formato agrupado (ou plano, se for uma lista)."""
+    if isinstance(payload, list):
+        return from_flat(payload)
+    offers = []
+    for grupo in payload.get('produtos', []):
+        header = ProductHeader(
+            grupo['sku'], grupo['marketplace'], grupo['descricao'],
+            grupo['review'], grupo['imagem'],
+        )
+        for oferta in grupo['ofertas']:
+            offers.append(Offer(header, **oferta))
+    return offers
+
+
+def build_payload(offers, payload_format=None):
+    """Corpo da requisição à API no formato configurado (PAYLOAD_FORMAT)."""
+    if (payload_format or PAYLOAD_FORMAT) == 'grouped':
+        return to_grouped(offers)
+    return to_flat(offers)
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import time
+from collections import defaultdict
+
+import psutil
+
+
+def percentile(values, pct):
+    """Retorna o percentil pct (0-100) de uma lista de valores, ou 0.0 se vazia."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class RunMetrics:
+    """Coleta métricas de uma execução: latência por URL, pico de memória (RSS),
+    crescimento aproximado do RSS por página de cada marketplace e
+    profundidade das filas do pipeline.
+
+    O RSS é a soma do processo Python com os processos filhos (Chromium do
+    Playwright/crawl4ai), amostrado em segundo plano por sample_forever.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.latencies = defaultdict(list)
+        self.queue_depths = defaultdict(list)
+        self.peak_rss = 0
+        self.peak_python_rss = 0
+        self.peak_browser_rss = 0
+        self.memory_by_marketplace = defaultdict(int)
+        self.blocks = defaultdict(lambda: defaultdict(int))
+        self.budget_exhausted = defaultdict(list)
+        self._process = psutil.Process(os.getpid())
+
+    def record_latency(self, marketplace, seconds):
+        self.latencies[marketplace].append(seconds)
+
+    def record_block(self, marketplace, kind):
+        """Conta páginas abortadas logo após a navegação (captcha, login, indisponível...)."""
+        self.blocks[marketplace][kind] += 1
+
+    def record_budget_exhausted(self, marketplace, seconds):
+        """Guarda a duração de uma URL que esgotou o orçamento de tempo (cauda da latência)."""
+        self.budget_exhausted[marketplace].append(seconds)
+
+    def record_queue_depth(self, queue, depth):
+        self.queue_depths[queue].append(depth)
+
+    def record_marketplace_memory(self, marketplace, growth):
+        """Guarda o maior crescimento do RSS do processo durante uma página do marketplace.
+
+        O RSS é do processo inteiro: com marketplaces em paralelo, o crescimento
+        inclui as outras páginas abertas ao mesmo tempo (valor aproximado).
+        """
+        self.memory_by_marketplace[marketplace] = max(self.memory_by_marketplace[marketplace], growth)
+
+    def rss_breakdown(self):
+        """RSS atual (bytes) do processo Python e dos processos filhos (navegadores)."""
+        python_rss = browser_rss = 0
+        try:
+            python_rss = self._process.memory_info().rss
+            for child in self._process.children(recursive=True):
+                try:
+                    browser_rss += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except psutil.Error:
+            pass
+        return python_rss, browser_rss
+
+    def current_rss(self):
+        """RSS atual (bytes) do processo Python somado ao dos processos filhos."""
+        return sum(self.rss_breakdown())
+
+    def sample_memory(self):
+        python_rss, browser_rss = self.rss_breakdown()
+        rss = python_rss + browser_rss
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_python_rss = max(self.peak_python_rss, python_rss)
+        self.peak_browser_rss = max(self.peak_browser_rss, browser_rss)
+        return rss
+
+    async def sample_forever(self, interval=1.0):
+        """Amostra a memória periodicamente até ser cancelado."""
+        while True:
+            self.sample_memory()
+            await asyncio.sleep(interval)
+
+    def report(self):
+        """Resumo da execução como dicionário."""
+        self.sample_memory()
+        por_marketplace = {}
+        for marketplace, values in self.latencies.items():
+            por_marketplace[marketplace] = {
+                'urls': len(values),
+                'media_s': round(sum(values) / len(values), 2),
+                'p50_s': round(percentile(values, 50), 2),
+                'p95_s': round(percentile(values, 95), 2),
+                'max_s': round(max(values), 2),
+            }
+        filas = {}
+        for queue, depths in self.queue_depths.items():
+            filas[queue] = {
+                'media': round(sum(depths) / len(depths), 1),
+                'p95': percentile(depths, 95),
+                'max': max(depths),
+            }
+        mb = 1024 * 1024
+        return {
+            'duracao_s': round(time.time() - self.started_at, 2),
+            'pico_rss_mb': round(self.peak_rss / mb, 1),
+            'pico_python_mb': round(self.peak_python_rss / mb, 1),
+            'pico_navegadores_mb': round(self.peak_browser_rss / mb, 1),
+            'crescimento_por_pagina_mb': {
+                marketplace: round(rss / mb, 1)
+                for marketplace, rss in self.memory_by_marketplace.items()
+            },
+            'latencia': por_marketplace,
+            'prazo_esgotado': {
+                marketplace: {'urls': len(values), 'max_s': round(max(values), 2)}
+                for marketplace, values in self.budget_exhausted.items()
+            },
+            'bloqueios': {marketplace: dict(kinds) for marketplace, kinds in self.blocks.items()},
+            'filas': filas,
+        }
+
+    def print_report(self):
+        report = self.report()
+        print(
+            f"Métricas da execução: duração {report['duracao_s']}s, pico de memória {report['pico_rss_mb']} MB "
+            f"(Python {report['pico_python_mb']} MB, navegadores {report['pico_navegadores_mb']} MB)"
+        )
+        for marketplace, growth_mb in report['crescimento_por_pagina_mb'].items():
+            print(f"  [{marketplace}] maior crescimento de memória numa página: ~{growth_mb} MB "
+                  f"(RSS do processo, inclui páginas em paralelo)")
+        for marketplace, stats in report['latencia'].items():
+            print(
+                f"  [{marketplace}] {stats['urls']} URLs, média {stats['media_s']}s, "
+                f"p50 {stats['p50_s']}s, p95 {stats['p95_s']}s, máx {stats['max_s']}s"
+            )
+        for marketplace, stats in report['prazo_esgotado'].items():
+            print(f"  [{marketplace}] {stats['urls']} URLs esgotaram o orçamento de tempo (máx {stats['max_s']}s)")
+        for marketplace, kinds in report['bloqueios'].items():
+            resumo = ', '.join(f'{count} {kind}' for kind, count in sorted(kinds.items()))
+            print(f"  [{marketplace}] páginas abortadas: {resumo}")
+        for queue, stats in report['filas'].items():
+            print(f"  Fila {queue}: média {stats['media']}, p95 {stats['p95']}, máx {stats['max']}")
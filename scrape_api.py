@@ -0,0 +1,173 @@
+"""Serviço HTTP local para raspar uma URL sob demanda.
+
+Uso: python scrape_api.py
+     curl 'http://127.0.0.1:8081/scrape?url=https://www.amazon.com.br/dp/B07KSDBVJW'
+
+Chama crawl_url para a URL pedida e devolve as ofertas em JSON. Resultados
+ficam em cache por SCRAPE_CACHE_TTL_S segundos (SCRAPE_EMPTY_TTL_S quando
+não há ofertas), e pedidos simultâneos do mesmo produto (mesma chave
+canônica, ADAPTERS.product_key) esperam a mesma raspagem em andamento.
+fresh=1 ignora o cache, mas ainda aproveita uma raspagem em andamento.
+"""
+import asyncio
+import os
+import time
+
+from deadline import URL_DEADLINE_S, Deadline, DeadlineExceeded, use_deadline
+from page_guard import PageBlocked
+from product_identity import IDENTITY
+from scrape_combined_crawl4ai import ADAPTERS, build_browser_config, crawl_url
+from shared_resources import BrowserPool, install
+from state_files import AUTH_STATE
+
+SCRAPE_API_HOST = os.environ.get('SCRAPE_API_HOST', '127.0.0.1')
+SCRAPE_API_PORT = int(os.environ.get('SCRAPE_API_PORT', '8081'))
+SCRAPE_CACHE_TTL_S = float(os.environ.get('SCRAPE_CACHE_TTL_S', '300'))
+SCRAPE_EMPTY_TTL_S = float(os.environ.get('SCRAPE_EMPTY_TTL_S', '60'))
+# Raspagens simultâneas no serviço inteiro (cada marketplace ainda tem o seu limite)
+SCRAPE_API_MAX_CONCURRENCY = int(os.environ.get('SCRAPE_API_MAX_CONCURRENCY', '4'))
+
+
+class ScrapeService:
+    """Cache com TTL e coalescência de pedidos em volta de crawl_url."""
+
+    def __init__(self, ttl=None, empty_ttl=None, max_concurrency=None):
+        self.ttl = SCRAPE_CACHE_TTL_S if ttl is None else ttl
+        self.empty_ttl = SCRAPE_EMPTY_TTL_S if empty_ttl is None else empty_ttl
+        self._semaphore = asyncio.Semaphore(max_concurrency or SCRAPE_API_MAX_CONCURRENCY)
+        self._cache = {}
+        self._in_flight = {}
+        self._crawler = None
+        self._crawler_lock = asyncio.Lock()
+        self.stats = {'pedidos': 0, 'cache': 0, 'coalescidos': 0, 'raspagens': 0}
+
+    async def _get_crawler(self, adapter):
+        """O AsyncWebCrawler só sobe quando um adaptador que o usa é pedido."""
+        if not adapter.uses_crawler:
+            return None
+        async with self._crawler_lock:
+            if self._crawler is None:
+                from crawl4ai import AsyncWebCrawler
+
+                self._crawler = AsyncWebCrawler(config=await build_browser_config())
+                await self._crawler.start()
+        return self._crawler
+
+    async def _scrape(self, key, url, adapter):
+        """Raspa a URL, guarda o resultado no cache e o devolve."""
+        self.stats['raspagens'] += 1
+        status, lojas = await self._crawl(url, adapter)
+        entry = self._cache[key] = {
+            'status': status,
+            'ofertas': [offer.as_dict() for offer in lojas],
+            'raspado_em': time.time(),
+            'expira': time.monotonic() + (self.ttl if lojas else self.empty_ttl),
+        }
+        return entry
+
+    async def _crawl(self, url, adapter):
+        """Raspa a URL com o prazo de URL_DEADLINE_S e devolve (status, ofertas)."""
+        async with self._semaphore, adapter.semaphore:
+            crawler = await self._get_crawler(adapter)
+            deadline = Deadline(URL_DEADLINE_S)
+            try:
+                with use_deadline(deadline):
+                    lojas = await asyncio.wait_for(crawl_url(crawler, url), URL_DEADLINE_S or None)
+            except PageBlocked as e:
+                return e.verdict.kind, []
+            except (asyncio.TimeoutError, DeadlineExceeded):
+                return 'prazo_esgotado', []
+        return ('ok' if lojas else 'sem_dados'), lojas
+
+    async def get(self, url, fresh=False):
+        """Ofertas da URL: do cache, de uma raspagem em andamento ou de uma nova."""
+        self.stats['pedidos'] += 1
+        adapter = ADAPTERS.for_url(url)
+        if adapter is None:
+            raise ValueError(f'URL não reconhecida: {url}')
+        key = ADAPTERS.product_key(url)
+        cached = self._cache.get(key)
+        if cached is not None and not fresh and time.monotonic() < cached['expira']:
+            self.stats['cache'] += 1
+            return key, cached, True
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._scrape(key, url, adapter))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats['coalescidos'] += 1
+        # shield: um cliente que desiste não cancela a raspagem dos outros
+        entry = await asyncio.shield(task)
+        return key, entry, False
+
+    def cached(self):
+        return len(self._cache)
+
+    def purge(self):
+        now = time.monotonic()
+        for key in [key for key, entry in self._cache.items() if entry['expira'] <= now]:
+            del self._cache[key]
+
+    async def close(self):
+        if self._crawler is not None:
+            await self._crawler.close()
+
+
+async def serve(host=None, port=None):
+    import aiohttp
+    from aiohttp import web
+
+    service = ScrapeService()
+    # Os extratores consultam o índice de identidades: lido agora, fora do event loop
+    await asyncio.to_thread(IDENTITY.load)
+    browser_pool = await BrowserPool().start()
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20))
+    install(browser_pool, session)
+
+    async def scrape(request):
+        url = request.query.get('url')
+        if not url:
+            return web.json_response({'erro': 'informe ?url='}, status=400)
+        service.purge()
+        try:
+            key, entry, em_cache = await service.get(url, fresh=request.query.get('fresh') == '1')
+        except ValueError as e:
+            return web.json_response({'erro': str(e)}, status=400)
+        return web.json_response({
+            'url': url,
+            'produto': key,
+            'status': entry['status'],
+            'em_cache': em_cache,
+            'idade_s': round(time.time() - entry['raspado_em'], 1),
+            'ofertas': entry['ofertas'],
+        })
+
+    async def stats(request):
+        return web.json_response({**service.stats, 'em_cache': service.cached()})
+
+    app = web.Application()
+    app.router.add_get('/scrape', scrape)
+    app.router.add_get('/stats', stats)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    host, port = host or SCRAPE_API_HOST, port or SCRAPE_API_PORT
+    await web.TCPSite(runner, host, port).start()
+    print(f'Serviço de raspagem em http://{host}:{port}/scrape?url=...')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        install()
+        await AUTH_STATE.flush()
+        await service.close()
+        await session.close()
+        await browser_pool.close()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
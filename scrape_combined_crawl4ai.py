@@ -1,160 +1,268 @@
 import asyncio
+import functools
 import json
 import os
 import re
+import sys
 import time
+from contextlib import AsyncExitStack
 from datetime import datetime
 from pprint import pprint
 
-import aiohttp
-from crawl4ai import AsyncWebCrawler
-from playwright.async_api import Error as PlaywrightError
-from playwright.async_api import async_playwright
+# crawl4ai, playwright e aiohttp são importados só quando um adaptador que os
+# usa roda pela primeira vez: execuções sem Beleza na Web não carregam o crawl4ai
+from adapters import BROWSER, CRAWL4AI, HTTP, AdapterRegistry, FetchStrategy, MarketplaceAdapter
+from api_client import BatchedApiClient
+from circuit_breaker import MarketplaceBreakers
+from deadline import RUN_DEADLINE_S, URL_DEADLINE_S, Deadline, DeadlineExceeded, current_deadline, timeout_ms, use_deadline
+from dedup import OfferDedup, ScrapeDedup, expand_duplicates
+from diagnostics import finish_diagnostics, start_diagnostics, stop_diagnostics
+from details import DETAILS_API_URL, DetailsUploader
+from memory_governor import MemoryGovernor
+from page_guard import INDISPONIVEL, PageBlocked, check_crawl_result, check_page, classify
+from pipeline import ADIADO, StagedPipeline
+from product_identity import IDENTITY, find_ean
+from records import Offer, ProductHeader, build_payload
+from run_metrics import RunMetrics
+from serialization import encode_body, wire_stats
+from shared_resources import http_session, playwright_browser
+from state_files import AUTH_STATE, load_json, save_json
+from sinks import ApiSink, Outbox, OutboxUploader, build_local_sinks, new_run_id, replay_outbox
 
+# Modo em lote da Beleza na Web: todas as URLs vão numa única chamada arun_many
+BELEZA_BATCH_MODE = os.environ.get('BELEZA_BATCH_MODE', '1') == '1'
+BELEZA_BATCH_MAX_SESSIONS = int(os.environ.get('BELEZA_BATCH_MAX_SESSIONS', '5'))
+BELEZA_BATCH_MEMORY_THRESHOLD = float(os.environ.get('BELEZA_BATCH_MEMORY_THRESHOLD', '80.0'))
+BELEZA_PAGE_TIMEOUT = 180000  # ms, mesmo limite do modo por URL
+BELEZA_AUTH_FILE = "beleza_auth.json"
+# Modo combinado: o mesmo crawl da Beleza na Web alimenta preços e detalhes do produto
+BELEZA_WITH_DETAILS = os.environ.get('BELEZA_WITH_DETAILS', '0') == '1'
+# Idade máxima (horas) dos detalhes antes de extrair de novo no modo combinado
+DETAILS_TTL_HOURS = float(os.environ.get('DETAILS_TTL_HOURS', '24'))
+# Pipeline crawl → parse → upload: workers por estágio e tamanho das filas
+CRAWL_WORKERS = int(os.environ.get('CRAWL_WORKERS', '3'))
+UPLOAD_WORKERS = int(os.environ.get('UPLOAD_WORKERS', '2'))
+PIPELINE_QUEUE_SIZE = int(os.environ.get('PIPELINE_QUEUE_SIZE', '10'))
+# Pausa de cada worker de crawl entre uma URL e a próxima
+CRAWL_DELAY_S = float(os.environ.get('CRAWL_DELAY_S', '1.0'))
+# Análise de preços entre vendedores ao final da execução (price_analytics)
+PRICE_ANALYTICS = os.environ.get('PRICE_ANALYTICS', '1') == '1'
+BELEZA_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 
 async def scrape_epoca_cosmeticos(url):
     print(f"[Época] Iniciando raspagem para: {url}")
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.launch(headless=False)
+    async with playwright_browser(headless=False) as browser:
         context = await browser.new_context()
-        page = await context.new_page()
-        print("[Época] Página criada, navegando para a URL...")
-        await page.goto(url)
-        await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_timeout(3000)
-        print("[Época] Página carregada.")
-
-        # Extrair SKU da URL
-        sku = None
         try:
-            match = re.search(r'q=([\d]+)', url)
-            sku = match.group(1) if match else None
-        except Exception as e:
-            print(f"[Época] Erro ao extrair SKU: {e}")
-        if not sku:
-            print(f'[Época] SKU não encontrado na URL: {url}')
-            return []
+            page = await context.new_page()
+            print("[Época] Página criada, navegando para a URL...")
+            response = await page.goto(url, timeout=timeout_ms(30000))
+            await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms(30000))
+            await check_page(page, response, 'Época Cosméticos')
+            await page.wait_for_timeout(timeout_ms(3000))
+            print("[Época] Página carregada.")
+
+            # Extrair SKU da URL
+            sku = None
+            try:
+                match = re.search(r'q=([\d]+)', url)
+                sku = match.group(1) if match else None
+            except Exception as e:
+                print(f"[Época] Erro ao extrair SKU: {e}")
+            if not sku:
+                print(f'[Época] SKU não encontrado na URL: {url}')
+                return []
 
-        print(f"[Época] SKU extraído: {sku}")
-        products = await page.query_selector_all('div[data-testid="productItemComponent"]')
-        print(f"[Época] {len(products)} produtos encontrados na página.")
+            print(f"[Época] SKU extraído: {sku}")
+            products = await page.query_selector_all('div[data-testid="productItemComponent"]')
+            print(f"[Época] {len(products)} produtos encontrados na página.")
 
-        lojas = []
+            lojas = []
+
+            for idx, product in enumerate(products):
+                print(f"[Época] Processando produto {idx+1}/{len(products)}")
+                try:
+                    # Nome do produto
+                    nome = await product.query_selector('.name')
+                    nome = await nome.inner_text() if nome else ""
+                    nome = nome.strip()
+                    print(f"[Época] Nome do produto: {nome}")
+
+                    # Link
+                    link_el = await product.query_selector('a[data-content-item="true"]')
+                    link = await link_el.get_attribute("href") if link_el else ""
+                    if link and not link.startswith("http"):
+                        link = "https://www.epocacosmeticos.com.br" + link
+
+                    # Abre nova aba para detalhes
+                    detail_page = await context.new_page()
+                    await detail_page.goto(link, timeout=timeout_ms(30000))
+                    await detail_page.wait_for_load_state("domcontentloaded", timeout=timeout_ms(30000))
+                    await detail_page.wait_for_timeout(timeout_ms(1500))
+                    print(f"[Época] Página de detalhes carregada.")
+
+                    # --- Validação do EAN ---
+                    ean_html = None
+                    ean_el = await detail_page.query_selector('div.pdp-buybox_referCodeEan__5mCsd')
+                    if ean_el:
+                        ean_text = await ean_el.inner_text()
+                        match_ean = re.search(r'Ref:\s*(\d+)', ean_text)
+                        if match_ean:
+                            ean_html = match_ean.group(1)
+                    if not ean_html or ean_html != sku:
+                        print(f"[Época] EAN divergente ou não encontrado: {ean_html} (esperado: {sku})")
+                        await detail_page.close()
+                        break  # Finaliza o loop ao primeiro EAN divergente
+
+                    # Preço (pega o preço à vista, se disponível)
+                    preco_el = await product.query_selector('.product-price_spotPrice__k_4YC')
+                    if not preco_el:
+                        preco_el = await product.query_selector('.product-price_priceList__uepac')
+                    preco = await preco_el.inner_text() if preco_el else ""
+                    preco_final_str = re.sub(r"[^\d,]", "", preco).replace(",", ".")
+                    preco_final = preco_final_str
+                    print(f"[Época] Preço final: {preco_final}")
+
+                    # Review (pega o número entre parênteses)
+                    review = 4.5  # Valor padrão, como na Beleza na Web
+                    review_el = await product.query_selector('.rate p')
+                    if review_el:
+                        review_text = await review_el.inner_text()
+                        review_text = review_text.strip()
+                        match = re.search(r"\\(([0-9.,]+)\\)", review_text)
+                        if match:
+                            review = float(match.group(1).replace(",", "."))
+                    print(f"[Época] Review: {review}")
+
+                    # Imagem
+                    img_el = await product.query_selector("img")
+                    imagem = await img_el.get_attribute("src") if img_el else ""
+                    if imagem and imagem.startswith("//"):
+                        imagem = f"https:{imagem}"
+                    print(f"[Época] Imagem: {imagem}")
+
+                    # Descrição (curta)
+                    descricao = ""
+                    desc_el = await detail_page.query_selector('p[data-product-title="true"]')
+                    if desc_el:
+                        descricao = await desc_el.inner_text()
+                        descricao = descricao.strip()
+                    else:
+                        meta_desc = await detail_page.query_selector('meta[name="description"]')
+                        if meta_desc:
+                            descricao = await meta_desc.get_attribute("content")
+                    print(f"[Época] Descrição: {descricao}")
+
+                    # Nome da loja (quem vende e entrega)
+                    loja = "Época Cosméticos"
+                    loja_el = await detail_page.query_selector('.pdp-buybox-seller_sellerInfo__BmOa4 a span')
+                    if loja_el:
+                        loja = await loja_el.inner_text()
+                        loja = loja.strip()
+                    print(f"[Época] Loja: {loja}")
 
-        for idx, product in enumerate(products):
-            print(f"[Época] Processando produto {idx+1}/{len(products)}")
-            try:
-                # Nome do produto
-                nome = await product.query_selector('.name')
-                nome = await nome.inner_text() if nome else ""
-                nome = nome.strip()
-                print(f"[Época] Nome do produto: {nome}")
-
-                # Link
-                link_el = await product.query_selector('a[data-content-item="true"]')
-                link = await link_el.get_attribute("href") if link_el else ""
-                if link and not link.startswith("http"):
-                    link = "https://www.epocacosmeticos.com.br" + link
-
-                # Abre nova aba para detalhes
-                detail_page = await context.new_page()
-                await detail_page.goto(link)
-                await detail_page.wait_for_load_state("domcontentloaded")
-                await detail_page.wait_for_timeout(1500)
-                print(f"[Época] Página de detalhes carregada.")
-
-                # --- Validação do EAN ---
-                ean_html = None
-                ean_el = await detail_page.query_selector('div.pdp-buybox_referCodeEan__5mCsd')
-                if ean_el:
-                    ean_text = await ean_el.inner_text()
-                    match_ean = re.search(r'Ref:\s*(\d+)', ean_text)
-                    if match_ean:
-                        ean_html = match_ean.group(1)
-                if not ean_html or ean_html != sku:
-                    print(f"[Época] EAN divergente ou não encontrado: {ean_html} (esperado: {sku})")
                     await detail_page.close()
-                    break  # Finaliza o loop ao primeiro EAN divergente
-
-                # Preço (pega o preço à vista, se disponível)
-                preco_el = await product.query_selector('.product-price_spotPrice__k_4YC')
-                if not preco_el:
-                    preco_el = await product.query_selector('.product-price_priceList__uepac')
-                preco = await preco_el.inner_text() if preco_el else ""
-                preco_final_str = re.sub(r"[^\d,]", "", preco).replace(",", ".")
-                preco_final = preco_final_str
-                print(f"[Época] Preço final: {preco_final}")
-
-                # Review (pega o número entre parênteses)
-                review = 4.5  # Valor padrão, como na Beleza na Web
-                review_el = await product.query_selector('.rate p')
-                if review_el:
-                    review_text = await review_el.inner_text()
-                    review_text = review_text.strip()
-                    match = re.search(r"\\(([0-9.,]+)\\)", review_text)
-                    if match:
-                        review = float(match.group(1).replace(",", "."))
-                print(f"[Época] Review: {review}")
-
-                # Imagem
-                img_el = await product.query_selector("img")
-                imagem = await img_el.get_attribute("src") if img_el else ""
-                if imagem and imagem.startswith("//"):
-                    imagem = f"https:{imagem}"
-                print(f"[Época] Imagem: {imagem}")
-
-                # Descrição (curta)
-                descricao = ""
-                desc_el = await detail_page.query_selector('p[data-product-title="true"]')
-                if desc_el:
-                    descricao = await desc_el.inner_text()
-                    descricao = descricao.strip()
-                else:
-                    meta_desc = await detail_page.query_selector('meta[name="description"]')
-                    if meta_desc:
-                        descricao = await meta_desc.get_attribute("content")
-                print(f"[Época] Descrição: {descricao}")
-
-                # Nome da loja (quem vende e entrega)
-                loja = "Época Cosméticos"
-                loja_el = await detail_page.query_selector('.pdp-buybox-seller_sellerInfo__BmOa4 a span')
-                if loja_el:
-                    loja = await loja_el.inner_text()
-                    loja = loja.strip()
-                print(f"[Época] Loja: {loja}")
-
-                await detail_page.close()
-
-                data_hora = datetime.utcnow().isoformat() + "Z"
-                status = "ativo"
-                marketplace = "Época Cosméticos"
-                key_loja = loja.lower().replace(" ", "")
-                key_sku = f"{key_loja}_{sku}" if sku else None
-
-                result = {
-                    "sku": sku if sku else "SKU não encontrado",
-                    "loja": loja,
-                    "preco_final": preco_final,
-                    "data_hora": data_hora,
-                    "marketplace": marketplace,
-                    "key_loja": key_loja,
-                    "key_sku": key_sku,
-                    "descricao": descricao,
-                    "review": review,
-                    "imagem": imagem,
-                    "status": status
-                }
-                print(f"[Época] Produto final: {result}")
-                lojas.append(result)
-            except Exception as e:
-                print(f"[Época] Erro ao processar produto {idx}: {e}")
 
-        await context.close()
-        await browser.close()
+                    data_hora = datetime.utcnow().isoformat() + "Z"
+                    status = "ativo"
+                    marketplace = "Época Cosméticos"
+                    key_loja = loja.lower().replace(" ", "")
+                    key_sku = f"{key_loja}_{sku}" if sku else None
+
+                    # O EAN da página já foi conferido com o pesquisado
+                    header = ProductHeader(sku if sku else "SKU não encontrado", marketplace, descricao, review, imagem, ean=ean_html)
+                    result = Offer(header, loja, preco_final, data_hora, key_loja, key_sku, status)
+                    print(f"[Época] Produto final: {result}")
+                    lojas.append(result)
+                except Exception as e:
+                    print(f"[Época] Erro ao processar produto {idx}: {e}")
+
+        finally:
+            await context.close()
         print(f"[Época] Raspagem finalizada para: {url}")
         return lojas
 
+EPOCA_STATE_PATTERN = r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>'
+
+def epoca_products_from_state(state):
+    """Produtos do estado embutido na busca da Época: dicts com 'items' que têm 'sellers'."""
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.get('items')
+            if isinstance(items, list) and any(isinstance(item, dict) and 'sellers' in item for item in items):
+                yield node
+                continue
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+def epoca_item_eans(item):
+    """EANs de um item do estado: o campo ean e as referências (o 'Ref:' da página do produto)."""
+    eans = {str(item.get('ean') or '')}
+    for ref in item.get('referenceId') or []:
+        if isinstance(ref, dict):
+            eans.add(str(ref.get('Value') or ''))
+    eans.discard('')
+    return eans
+
+def offers_from_epoca_state(state, sku):
+    """Ofertas do EAN sku a partir do estado da busca; itens com outro EAN são descartados."""
+    lojas = []
+    data_hora = datetime.utcnow().isoformat() + "Z"
+    for product in epoca_products_from_state(state):
+        for item in product['items']:
+            if not isinstance(item, dict) or sku not in epoca_item_eans(item):
+                continue
+            images = item.get('images') or []
+            imagem = images[0].get('imageUrl', '') if images and isinstance(images[0], dict) else ''
+            descricao = product.get('productName') or item.get('nameComplete') or item.get('name') or ''
+            header = ProductHeader(sku, 'Época Cosméticos', descricao, 4.5, imagem, ean=sku)
+            for seller in item.get('sellers') or []:
+                offer = seller.get('commertialOffer') or {}
+                preco_final = float(offer.get('Price') or 0)
+                if preco_final <= 0 or not offer.get('AvailableQuantity', 1):
+                    continue
+                loja = (seller.get('sellerName') or 'Época Cosméticos').strip()
+                key_loja = loja.lower().replace(" ", "")
+                lojas.append(Offer(header, loja, preco_final, data_hora, key_loja, f"{key_loja}_{sku}"))
+    return lojas
+
+async def extract_data_from_epoca_http(url: str) -> list:
+    """Época sem navegador: vendedores, preços e EAN vêm do estado (__NEXT_DATA__) da busca."""
+    import aiohttp
+
+    match = re.search(r'q=(\d+)', url)
+    sku = match.group(1) if match else None
+    if not sku:
+        print(f'[Época] SKU não encontrado na URL: {url}')
+        return []
+    print(f"[Época] Buscando via HTTP: {url}")
+    headers = {'User-Agent': BELEZA_USER_AGENT, 'Accept-Language': 'pt-BR,pt;q=0.9'}
+    timeout = aiohttp.ClientTimeout(total=timeout_ms(20000) / 1000)
+    async with http_session() as session:
+        async with session.get(url, headers=headers, timeout=timeout) as response:
+            html = await response.text()
+            final_url = str(response.url)
+            status = response.status
+    title_match = re.search(r'<title[^>]*>(.*?)</title>', html, re.DOTALL)
+    verdict = classify('Época Cosméticos', status, final_url, title_match.group(1) if title_match else '')
+    if verdict.blocked:
+        raise PageBlocked('Época Cosméticos', url, verdict)
+    state_match = re.search(EPOCA_STATE_PATTERN, html, re.DOTALL)
+    if not state_match:
+        print(f"[Época] Estado da busca não encontrado no HTML de {url}")
+        return []
+    try:
+        lojas = offers_from_epoca_state(json.loads(state_match.group(1)), sku)
+    except (json.JSONDecodeError, TypeError, ValueError, AttributeError) as e:
+        print(f"[Época] Erro ao ler o estado da busca: {e}")
+        return []
+    print(f"[Época] {len(lojas)} ofertas com EAN {sku} via HTTP")
+    return lojas
+
 async def extract_data_from_amazon(target_url: str) -> list:
     print(f"[Amazon] Iniciando raspagem para: {target_url}")
     start_time = time.time()
@@ -165,8 +273,7 @@ async def extract_data_from_amazon(target_url: str) -> list:
         print(f"[Amazon] Erro: Arquivo de autenticação {storage_file} não encontrado.")
         return lojas
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+    async with playwright_browser(headless=True) as browser:
         context = await browser.new_context()
         page = await context.new_page()
         print("[Amazon] Página criada, carregando cookies e navegando para a URL...")
@@ -174,9 +281,8 @@ async def extract_data_from_amazon(target_url: str) -> list:
         try:
             # Carregar cookies
             try:
-                with open(storage_file, 'r') as f:
-                    auth_data = json.load(f)
-                    await context.add_cookies(auth_data.get('cookies', []))
+                auth_data = await AUTH_STATE.load(storage_file) or {}
+                await context.add_cookies(auth_data.get('cookies', []))
                 print(f"[Amazon] Cookies carregados.")
             except Exception as e:
                 print(f"[Amazon] Erro ao carregar cookies: {e}")
@@ -184,11 +290,10 @@ async def extract_data_from_amazon(target_url: str) -> list:
 
             # Navegar para a URL
             print(f"[Amazon] Navegando para {target_url}")
-            response = await page.goto(target_url, timeout=30000)
-            if response and response.status != 200:
-                print(f"[Amazon] Falha ao carregar página {target_url}. Status: {response.status}")
-                return lojas
-            await page.wait_for_load_state('domcontentloaded', timeout=15000)
+            response = await page.goto(target_url, timeout=timeout_ms(30000))
+            # Captcha, login ou produto indisponível: aborta antes das esperas por seletor
+            await check_page(page, response, 'Amazon')
+            await page.wait_for_load_state('domcontentloaded', timeout=timeout_ms(15000))
             print(f"[Amazon] Página carregada.")
 
             # Extrair SKU
@@ -204,7 +309,7 @@ async def extract_data_from_amazon(target_url: str) -> list:
             # Funções para extração concorrente
             async def get_description():
                 try:
-                    await page.wait_for_selector('#productTitle', timeout=7000)
+                    await page.wait_for_selector('#productTitle', timeout=timeout_ms(7000))
                     return (await page.locator('#productTitle').first.inner_text()).strip()
                 except Exception as e:
                     print(f"Erro ao extrair descrição: {e}")
@@ -212,7 +317,7 @@ async def extract_data_from_amazon(target_url: str) -> list:
 
             async def get_image():
                 try:
-                    await page.wait_for_selector('#landingImage', timeout=7000)
+                    await page.wait_for_selector('#landingImage', timeout=timeout_ms(7000))
                     return await page.locator('#landingImage').first.get_attribute('src')
                 except Exception as e:
                     print(f"Erro ao extrair imagem: {e}")
@@ -221,7 +326,7 @@ async def extract_data_from_amazon(target_url: str) -> list:
             async def get_review():
                 try:
                     review_span = page.locator('a.a-popover-trigger span[aria-hidden="true"]').first
-                    review_text = (await review_span.inner_text(timeout=7000)).strip()
+                    review_text = (await review_span.inner_text(timeout=timeout_ms(7000))).strip()
                     print(f"Texto da review capturado: '{review_text}'")
                     if review_text and re.match(r'^\d+\.\d$', review_text.replace(',', '.')):
                         return float(review_text.replace(',', '.'))
@@ -231,13 +336,31 @@ async def extract_data_from_amazon(target_url: str) -> list:
                     print(f"Erro ao extrair review: {e}")
                     return 4.5
 
-            # Executar extração concorrente
-            descricao, imagem, review = await asyncio.gather(
-                get_description(),
-                get_image(),
-                get_review()
-            )
-            print(f"[Amazon] Descrição: {descricao}, Imagem: {imagem}, Review: {review}")
+            # Produto já conhecido pelo índice de identidades: descrição e imagem não são extraídas de novo
+            known = IDENTITY.metadata('Amazon', sku)
+
+            async def get_ean():
+                if known and known.get('ean'):
+                    return known['ean']
+                try:
+                    return find_ean(await page.content())
+                except Exception as e:
+                    print(f"Erro ao extrair EAN: {e}")
+                    return None
+
+            if known:
+                descricao, imagem = known['descricao'], known['imagem']
+                review, ean = await asyncio.gather(get_review(), get_ean())
+            else:
+                # Executar extração concorrente
+                descricao, imagem, review, ean = await asyncio.gather(
+                    get_description(),
+                    get_image(),
+                    get_review(),
+                    get_ean(),
+                )
+            print(f"[Amazon] Descrição: {descricao}, Imagem: {imagem}, Review: {review}, EAN: {ean}")
+            header = ProductHeader(sku, 'Amazon', descricao, review, imagem, ean=ean)
 
             # Extrair vendedor principal e preço
             print(f"[Amazon] Extraindo vendedor principal e preço...")
@@ -245,11 +368,11 @@ async def extract_data_from_amazon(target_url: str) -> list:
             preco_final = 0.0
             try:
                 seller = page.locator("#sellerProfileTriggerId").first
-                seller_name = (await seller.inner_text(timeout=7000)).strip()
+                seller_name = (await seller.inner_text(timeout=timeout_ms(7000))).strip()
                 seller_name = re.sub(r'Vendido por\s*', '', seller_name).strip()
 
                 price_span = page.locator('div.a-section.a-spacing-micro span.a-offscreen').first
-                price_text = re.sub(r'[^\d,.]', '', (await price_span.inner_text(timeout=7000)).strip()).replace(',', '.')
+                price_text = re.sub(r'[^\d,.]', '', (await price_span.inner_text(timeout=timeout_ms(7000))).strip()).replace(',', '.')
                 if re.match(r'^\d+\.\d+$', price_text):
                     preco_final = float(price_text)
                 else:
@@ -258,19 +381,10 @@ async def extract_data_from_amazon(target_url: str) -> list:
                 if seller_name != "Não informado" and preco_final > 0.0:
                     key_loja = seller_name.lower().replace(' ', '')
                     key_sku = f"{key_loja}_{sku}" if sku != "SKU não encontrado" else f"{key_loja}_sem_sku"
-                    lojas.append({
-                        'sku': sku,
-                        'loja': seller_name,
-                        'preco_final': preco_final,
-                        'data_hora': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
-                        'marketplace': 'Amazon',
-                        'key_loja': key_loja,
-                        'key_sku': key_sku,
-                        'descricao': descricao,
-                        'review': review,
-                        'imagem': imagem,
-                        'status': 'ativo'
-                    })
+                    lojas.append(Offer(
+                        header, seller_name, preco_final,
+                        datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'), key_loja, key_sku,
+                    ))
                     print(f"Vendedor principal capturado: {seller_name}, Preço: {preco_final}")
             except Exception as e:
                 print(f"Erro ao extrair vendedor/preço da página principal: {e}")
@@ -278,20 +392,20 @@ async def extract_data_from_amazon(target_url: str) -> list:
             # Acessar página de ofertas
             try:
                 compare_button = page.get_by_role("button", name=re.compile("Comparar outras.*ofertas|Ver todas as ofertas"))
-                await compare_button.wait_for(state='visible', timeout=10000)
+                await compare_button.wait_for(state='visible', timeout=timeout_ms(10000))
                 print("Botão de comparação encontrado")
-                await compare_button.click(timeout=10000)
+                await compare_button.click(timeout=timeout_ms(10000))
                 print(f"After clicking compare button: {time.time() - start_time:.2f} seconds")
 
                 details_link = page.get_by_role("link", name="Ver mais detalhes sobre esta")
-                await details_link.wait_for(state='visible', timeout=10000)
+                await details_link.wait_for(state='visible', timeout=timeout_ms(10000))
                 print("Link 'Ver mais detalhes' encontrado")
-                await details_link.click(timeout=10000)
+                await details_link.click(timeout=timeout_ms(10000))
                 print(f"After clicking details link: {time.time() - start_time:.2f} seconds")
 
-                await page.wait_for_load_state('domcontentloaded', timeout=15000)
+                await page.wait_for_load_state('domcontentloaded', timeout=timeout_ms(15000))
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(2000)
+                await page.wait_for_timeout(timeout_ms(2000))
                 print(f"After loading offers page: {time.time() - start_time:.2f} seconds")
             except Exception as e:
                 print(f"Erro ao acessar página de ofertas: {e}")
@@ -300,7 +414,7 @@ async def extract_data_from_amazon(target_url: str) -> list:
 
             # Extrair ofertas
             try:
-                await page.wait_for_selector("#aod-offer", timeout=10000)
+                await page.wait_for_selector("#aod-offer", timeout=timeout_ms(10000))
                 offer_elements = await page.locator("#aod-offer").all()
                 print(f"Encontradas {len(offer_elements)} ofertas")
                 for i, offer in enumerate(offer_elements, 1):
@@ -308,15 +422,15 @@ async def extract_data_from_amazon(target_url: str) -> list:
                         preco_final = 0.0
                         try:
                             price_span = offer.locator('span.aok-offscreen').first
-                            price_text = re.sub(r'[^\d,.]', '', (await price_span.inner_text(timeout=5000)).strip()).replace(',', '.')
+                            price_text = re.sub(r'[^\d,.]', '', (await price_span.inner_text(timeout=timeout_ms(5000))).strip()).replace(',', '.')
                             if re.match(r'^\d+\.\d+$', price_text):
                                 preco_final = float(price_text)
                             else:
                                 print(f"Preço inválido na oferta {i}: {price_text}")
                         except Exception:
                             try:
-                                price_whole = (await offer.locator("span.a-price-whole").first.inner_text(timeout=5000)).strip()
-                                price_fraction = (await offer.locator("span.a-price-fraction").first.inner_text(timeout=5000)).strip()
+                                price_whole = (await offer.locator("span.a-price-whole").first.inner_text(timeout=timeout_ms(5000))).strip()
+                                price_fraction = (await offer.locator("span.a-price-fraction").first.inner_text(timeout=timeout_ms(5000))).strip()
                                 price_text = f"{re.sub(r'[^\d]', '', price_whole)}.{price_fraction}"
                                 if re.match(r'^\d+\.\d+$', price_text):
                                     preco_final = float(price_text)
@@ -329,31 +443,22 @@ async def extract_data_from_amazon(target_url: str) -> list:
                         seller_name = "Não informado"
                         try:
                             seller = offer.locator("a.a-size-small.a-link-normal").first
-                            seller_name = (await seller.inner_text(timeout=5000)).strip()
+                            seller_name = (await seller.inner_text(timeout=timeout_ms(5000))).strip()
                             seller_name = re.sub(r'Vendido por\s*', '', seller_name).strip()
                         except Exception as e:
                             print(f"Erro ao extrair vendedor na oferta {i}: {e}")
                             continue
 
-                        if any(s['loja'] == seller_name for s in lojas):
+                        if any(s.loja == seller_name for s in lojas):
                             print(f"Vendedor {seller_name} já capturado, ignorando duplicata")
                             continue
 
                         key_loja = seller_name.lower().replace(' ', '')
                         key_sku = f"{key_loja}_{sku}" if sku != "SKU não encontrado" else f"{key_loja}_sem_sku"
-                        lojas.append({
-                            'sku': sku,
-                            'loja': seller_name,
-                            'preco_final': preco_final,
-                            'data_hora': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
-                            'marketplace': 'Amazon',
-                            'key_loja': key_loja,
-                            'key_sku': key_sku,
-                            'descricao': descricao,
-                            'review': review,
-                            'imagem': imagem,
-                            'status': 'ativo'
-                        })
+                        lojas.append(Offer(
+                            header, seller_name, preco_final,
+                            datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'), key_loja, key_sku,
+                        ))
                         print(f"Oferta {i} capturada: {seller_name}, Preço: {preco_final}")
                     except Exception as e:
                         print(f"Erro ao processar oferta {i}: {e}")
@@ -363,9 +468,9 @@ async def extract_data_from_amazon(target_url: str) -> list:
                 print("Page content for debugging:", await page.content()[:1000])
 
         finally:
-            await context.storage_state(path="amz_auth.json")
+            # Gravação atômica e agrupada com a das outras páginas da Amazon
+            AUTH_STATE.save(storage_file, await context.storage_state())
             await context.close()
-            await browser.close()
             print(f"[Amazon] Raspagem finalizada para: {target_url}")
 
     end_time = time.time()
@@ -420,6 +525,8 @@ def extract_data_from_markdown_beleza(markdown):
             else 'Imagem não encontrada'
         )
 
+    header = ProductHeader(sku, 'Beleza na Web', descricao, review, imagem, ean=find_ean(markdown))
+
     # Extrai lojas e preços
     loja_pattern = r'Vendido por \*\*(.*?)\*\* Entregue por Beleza na Web'
     preco_com_desconto_pattern = r'-[\d]+%.*?\nR\$ ([\d,\.]+)'
@@ -449,33 +556,99 @@ def extract_data_from_markdown_beleza(markdown):
         else:
             preco_final = 0.0
         key_loja = nome_loja.lower().replace(' ', '')
-        loja = {
-            'sku': sku,
-            'loja': nome_loja,
-            'preco_final': preco_final,
-            'data_hora': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'marketplace': 'Beleza na Web',
-            'key_loja': key_loja,
-            'key_sku': f'{key_loja}_{sku}',
-            'descricao': descricao,
-            'review': review,
-            'imagem': imagem,
-            'status': 'ativo',
-        }
+        loja = Offer(
+            header, nome_loja, preco_final,
+            datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'), key_loja, f'{key_loja}_{sku}',
+        )
         lojas.append(loja)
 
     return lojas
 
+MELI_SKU_PATTERN = r'(?:/p/|item_id%3A)(MLB\d+)'
+MELI_AUTH_FILE = 'meli_auth.json'
+
+def offers_from_melidata(script_content, header, sku):
+    """Ofertas do evento melidata("add", "event_data", {...}) de uma página do Mercado Livre."""
+    pattern = r'melidata\("add", "event_data", ({.*?})\);'
+    match = re.search(pattern, script_content, re.DOTALL)
+    if not match:
+        print("Melidata event_data not found in script content")
+        return []
+    event_data = json.loads(match.group(1))
+    lojas = []
+    for item in event_data.get('items', []):
+        nome_loja = item.get('seller_name', 'Mercado Livre')
+        key_loja = nome_loja.lower().replace(' ', '')
+        lojas.append(Offer(
+            header, nome_loja, float(item.get('price', 0.0)),
+            datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'), key_loja,
+            f'{key_loja}_{sku}' if key_loja and sku else None,
+        ))
+    return lojas
+
+def cookie_header(storage_state, domain):
+    """Cabeçalho Cookie com os cookies de um storage_state do Playwright para um domínio."""
+    cookies = (storage_state or {}).get('cookies', [])
+    return '; '.join(
+        f"{cookie['name']}={cookie['value']}"
+        for cookie in cookies
+        if domain in cookie.get('domain', '')
+    )
+
+async def extract_data_from_meli_http(url: str) -> list:
+    """Mercado Livre sem navegador: o melidata já vem no HTML do servidor."""
+    import aiohttp
+
+    print(f"[Mercado Livre] Buscando via HTTP: {url}")
+    headers = {'User-Agent': BELEZA_USER_AGENT, 'Accept-Language': 'pt-BR,pt;q=0.9'}
+    try:
+        storage_state = await AUTH_STATE.load(MELI_AUTH_FILE)
+    except (OSError, json.JSONDecodeError):
+        storage_state = None
+    cookies = cookie_header(storage_state, 'mercadolivre')
+    if cookies:
+        headers['Cookie'] = cookies
+    timeout = aiohttp.ClientTimeout(total=timeout_ms(20000) / 1000)
+    async with http_session() as session:
+        async with session.get(url, headers=headers, timeout=timeout) as response:
+            html = await response.text()
+            final_url = str(response.url)
+            status = response.status
+    title_match = re.search(r'<title[^>]*>(.*?)</title>', html, re.DOTALL)
+    verdict = classify('Mercado Livre', status, final_url, title_match.group(1) if title_match else '')
+    if verdict.blocked:
+        raise PageBlocked('Mercado Livre', url, verdict)
+
+    match = re.search(MELI_SKU_PATTERN, url)
+    sku = match.group(1) if match else None
+    desc_match = re.search(r'<h1[^>]*class="ui-pdp-title"[^>]*>(.*?)</h1>', html, re.DOTALL)
+    img_match = re.search(r'<meta[^>]*property="og:image"[^>]*content="([^"]+)"', html)
+    review_match = re.search(r'ui-pdp-reviews__rating__summary__average"[^>]*>(\d+\.\d+)<', html)
+    header = ProductHeader(
+        sku if sku else 'SKU não encontrado', 'Mercado Livre',
+        desc_match.group(1).strip() if desc_match else 'Descrição não encontrada',
+        float(review_match.group(1)) if review_match else 4.5,
+        img_match.group(1) if img_match else 'Imagem não encontrada',
+        ean=find_ean(html),
+    )
+    try:
+        return offers_from_melidata(html, header, sku)
+    except json.JSONDecodeError as e:
+        print(f"[Mercado Livre] Error parsing melidata JSON: {e}")
+        return []
+
 async def extract_data_from_meli(url: str) -> list:
     print(f"[Mercado Livre] Iniciando raspagem para: {url}")
     start_time = time.time()
     lojas = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+    async with playwright_browser(headless=True) as browser:
         try:
+            storage_state = await AUTH_STATE.load(MELI_AUTH_FILE)
+            if storage_state is None:
+                raise FileNotFoundError(MELI_AUTH_FILE)
             # Configure context with minimal settings for speed
             context = await browser.new_context(
-                storage_state="meli_auth.json",
+                storage_state=storage_state,
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 viewport={"width": 1280, "height": 720}
             )
@@ -486,16 +659,15 @@ async def extract_data_from_meli(url: str) -> list:
                 await context.route("**/*.{png,jpg,jpeg,webp,gif,mp4,webm}", lambda route: route.abort())
                 
                 # Navigate to the URL
-                response = await page.goto(url, timeout=30000)  # 30-second timeout
+                response = await page.goto(url, timeout=timeout_ms(30000))  # 30-second timeout
                 print(f"[Mercado Livre] After navigation: {time.time() - start_time:.2f} seconds")
-                if response.status != 200:
-                    print(f"[Mercado Livre] Failed to load page {url}. Status code: {response.status}")
-                    return lojas
+                # Status != 200, login ou anúncio pausado: aborta antes das esperas por seletor
+                await check_page(page, response, 'Mercado Livre')
                 
                 # Extract SKU from URL (fast regex operation)
                 sku = None
                 try:
-                    match = re.search(r'(?:/p/|item_id%3A)(MLB\d+)', url)
+                    match = re.search(MELI_SKU_PATTERN, url)
                     sku = match.group(1) if match else None
                     if not sku:
                         print(f"[Mercado Livre] SKU not found in URL: {url}")
@@ -505,7 +677,7 @@ async def extract_data_from_meli(url: str) -> list:
                 # Parallelize extraction of description, image, and review
                 async def get_description():
                     try:
-                        await page.wait_for_selector('h1.ui-pdp-title', timeout=7000)
+                        await page.wait_for_selector('h1.ui-pdp-title', timeout=timeout_ms(7000))
                         return await page.locator('h1.ui-pdp-title').inner_text()
                     except Exception as e:
                         print(f"[Mercado Livre] Error extracting description: {e}")
@@ -513,7 +685,7 @@ async def extract_data_from_meli(url: str) -> list:
                 
                 async def get_image():
                     try:
-                        await page.wait_for_selector('img.ui-pdp-image', timeout=7000)
+                        await page.wait_for_selector('img.ui-pdp-image', timeout=timeout_ms(7000))
                         return await page.locator('img.ui-pdp-image').first.get_attribute('src')
                     except Exception as e:
                         print(f"[Mercado Livre] Error extracting image: {e}")
@@ -521,7 +693,7 @@ async def extract_data_from_meli(url: str) -> list:
                 
                 async def get_review():
                     try:
-                        await page.wait_for_selector('.ui-pdp-reviews__rating__summary__average', timeout=7000)
+                        await page.wait_for_selector('.ui-pdp-reviews__rating__summary__average', timeout=timeout_ms(7000))
                         review_text = await page.locator('.ui-pdp-reviews__rating__summary__average').inner_text()
                         review_match = re.search(r'(\d+\.\d+)', review_text)
                         return float(review_match.group(1)) if review_match else 4.5
@@ -529,17 +701,34 @@ async def extract_data_from_meli(url: str) -> list:
                         print(f"[Mercado Livre] Error extracting review: {e}")
                         return 4.5
                 
+                # Known products (identity index) skip description and image
+                known = IDENTITY.metadata('Mercado Livre', sku)
+
+                async def get_ean():
+                    if known and known.get('ean'):
+                        return known['ean']
+                    try:
+                        return find_ean(await page.content())
+                    except Exception as e:
+                        print(f"[Mercado Livre] Error extracting EAN: {e}")
+                        return None
+
                 # Run extraction tasks concurrently
                 try:
-                    descricao, imagem, review = await asyncio.gather(
-                        get_description(),
-                        get_image(),
-                        get_review()
-                    )
+                    if known:
+                        descricao, imagem = known['descricao'], known['imagem']
+                        review, ean = await asyncio.gather(get_review(), get_ean())
+                    else:
+                        descricao, imagem, review, ean = await asyncio.gather(
+                            get_description(),
+                            get_image(),
+                            get_review(),
+                            get_ean(),
+                        )
                     print(f"[Mercado Livre] After element extraction: {time.time() - start_time:.2f} seconds")
                 except Exception as e:
                     print(f"[Mercado Livre] Error during concurrent element extraction: {e}")
-                    descricao, imagem, review = "Descrição não encontrada", "Imagem não encontrada", 4.5
+                    descricao, imagem, review, ean = "Descrição não encontrada", "Imagem não encontrada", 4.5, None
                 
                 # Extract seller data from melidata
                 try:
@@ -556,32 +745,11 @@ async def extract_data_from_meli(url: str) -> list:
                     )
                     
                     if script_content:
-                        pattern = r'melidata\("add", "event_data", ({.*?})\);'
-                        match = re.search(pattern, script_content, re.DOTALL)
-                        if match:
-                            event_data = json.loads(match.group(1))
-                            items = event_data.get('items', [])
-                            
-                            for item in items:
-                                nome_loja = item.get('seller_name', 'Mercado Livre')
-                                key_loja = nome_loja.lower().replace(' ', '')
-                                
-                                seller = {
-                                    'sku': sku if sku else 'SKU não encontrado',
-                                    'loja': nome_loja,
-                                    'preco_final': float(item.get('price', 0.0)),
-                                    'data_hora': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                    'marketplace': 'Mercado Livre',
-                                    'key_loja': key_loja,
-                                    'key_sku': f'{key_loja}_{sku}' if key_loja and sku else None,
-                                    'descricao': descricao,
-                                    'review': review,
-                                    'imagem': imagem,
-                                    'status': 'ativo'
-                                }
-                                lojas.append(seller)
-                        else:
-                            print("Melidata event_data not found in script content")
+                        header = ProductHeader(
+                            sku if sku else 'SKU não encontrado', 'Mercado Livre',
+                            descricao, review, imagem, ean=ean,
+                        )
+                        lojas.extend(offers_from_melidata(script_content, header, sku))
                     else:
                         print("No melidata script found")
                     print(f"[Mercado Livre] After melidata extraction: {time.time() - start_time:.2f} seconds")
@@ -592,10 +760,12 @@ async def extract_data_from_meli(url: str) -> list:
                 
                 # Save session state
                 try:
-                    await context.storage_state(path='meli_auth.json')
+                    AUTH_STATE.save(MELI_AUTH_FILE, await context.storage_state())
                 except Exception as e:
                     print(f"[Mercado Livre] Error saving storage state: {e}")
                     
+            except PageBlocked:
+                raise
             except Exception as e:
                 print(f"[Mercado Livre] Error processing page {url}: {e}")
             finally:
@@ -604,10 +774,10 @@ async def extract_data_from_meli(url: str) -> list:
             print("Error: meli_auth.json file not found. Please ensure it exists in the script's directory.")
         except json.JSONDecodeError:
             print("Error: meli_auth.json is invalid or corrupted. Please verify its contents.")
+        except PageBlocked:
+            raise
         except Exception as e:
             print(f"[Mercado Livre] Error setting up context: {e}")
-        finally:
-            await browser.close()
     
     end_time = time.time()
     execution_time = end_time - start_time
@@ -615,97 +785,358 @@ async def extract_data_from_meli(url: str) -> list:
     
     return lojas
 
-async def crawl_url(crawler, url, max_retries=3):
-    """Extrai dados de uma URL usando Crawl4AI ou Playwright (para Mercado Livre, Amazon e Beleza na Web) com re-tentativas."""
-    for attempt in range(max_retries):
-        try:
-            print(f'Extraindo dados da URL: {url} (Tentativa {attempt + 1}/{max_retries})')
-            if 'mercadolivre' in url.lower():
-                lojas = await extract_data_from_meli(url)
-            elif 'amazon' in url.lower():
-                lojas = await extract_data_from_amazon(url)
-            elif 'epoca' in url.lower():
-                lojas = await scrape_epoca_cosmeticos(url)
-            elif 'belezanaweb' in url.lower():
-                # Configuração para Beleza na Web com autenticação
-                storage_file = "beleza_auth.json"
-                
-                # Verificar se o arquivo de autenticação existe
-                if not os.path.exists(storage_file):
-                    print(f"[Beleza na Web] Erro: Arquivo de autenticação {storage_file} não encontrado.")
-                    return []
+async def load_beleza_cookies():
+    """Carrega os cookies de beleza_auth.json (formato storage_state do Playwright)."""
+    try:
+        auth_data = await AUTH_STATE.load(BELEZA_AUTH_FILE)
+        if auth_data is None:
+            return []
+        cookies = auth_data.get('cookies', [])
+        print(f"[Beleza na Web] {len(cookies)} cookies carregados de {BELEZA_AUTH_FILE}.")
+        return cookies
+    except Exception as e:
+        print(f"[Beleza na Web] Erro ao carregar cookies: {e}")
+        return []
 
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    context = await browser.new_context(
-                        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        viewport={"width": 1280, "height": 720}
-                    )
-                    try:
-                        # Carregar cookies
-                        try:
-                            with open(storage_file, 'r') as f:
-                                auth_data = json.load(f)
-                                await context.add_cookies(auth_data.get('cookies', []))
-                            print(f"[Beleza na Web] Cookies carregados de {storage_file}.")
-                        except Exception as e:
-                            print(f"[Beleza na Web] Erro ao carregar cookies: {e}")
-                            await context.close()
-                            await browser.close()
-                            return []
-
-                        # Configurar o crawler com o contexto autenticado
-                        result = await crawler.arun(
-                            url=url,
-                            timeout=180,
-                            js_enabled=True,
-                            bypass_cache=True,
-                            headers={
-                                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                            },
-                            browser_context=context
-                        )
-                        markdown_content = result.markdown
-                        print('[Beleza na Web] Markdown gerado:')
-                        lojas = extract_data_from_markdown_beleza(markdown_content)
-                    except Exception as e:
-                        print(f"[Beleza na Web] Erro ao crawlear: {e}")
-                        lojas = []
-                    finally:
-                        # Salvar estado da sessão
-                        try:
-                            await context.storage_state(path=storage_file)
-                            print(f"[Beleza na Web] Estado da sessão salvo em {storage_file}.")
-                        except Exception as e:
-                            print(f"[Beleza na Web] Erro ao salvar estado da sessão: {e}")
-                        await context.close()
-                        await browser.close()
-            else:
-                print(f'URL não reconhecida: {url}')
-                return []
+async def build_browser_config():
+    """Configuração do navegador do AsyncWebCrawler, com a sessão da Beleza na Web.
+
+    Os cookies e o user agent são aplicados uma única vez ao contexto do crawler,
+    que é reaproveitado por todas as URLs da Beleza na Web.
+    """
+    from crawl4ai import BrowserConfig
+
+    return BrowserConfig(
+        headless=True,
+        verbose=True,
+        user_agent=BELEZA_USER_AGENT,
+        viewport_width=1280,
+        viewport_height=720,
+        cookies=await load_beleza_cookies(),
+    )
+
+def beleza_run_config(stream=False, page_timeout=None):
+    """Configuração de cada crawl da Beleza na Web (sem cache, mesmo timeout de antes)."""
+    from crawl4ai import CacheMode, CrawlerRunConfig
+
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        page_timeout=page_timeout or BELEZA_PAGE_TIMEOUT,
+        stream=stream,
+    )
+
+def track_beleza_session(crawler):
+    """Guarda o contexto do navegador do crawler para salvar o estado da sessão ao final."""
+    holder = {}
+
+    async def on_page_context_created(page, context, **kwargs):
+        holder['context'] = context
+        return page
+
+    crawler.crawler_strategy.set_hook('on_page_context_created', on_page_context_created)
+    return holder
+
+async def save_beleza_session(holder):
+    """Salva o estado da sessão da Beleza na Web (cookies renovados) em BELEZA_AUTH_FILE."""
+    context = holder.get('context')
+    if context is None:
+        return
+    try:
+        AUTH_STATE.save(BELEZA_AUTH_FILE, await context.storage_state())
+        print(f"[Beleza na Web] Estado da sessão salvo em {BELEZA_AUTH_FILE}.")
+    except Exception as e:
+        print(f"[Beleza na Web] Erro ao salvar estado da sessão: {e}")
+
+async def release_beleza_session(holder):
+    """Salva a sessão e esquece o contexto, que morre quando o navegador é reciclado."""
+    await save_beleza_session(holder)
+    holder.pop('context', None)
+
+async def fetch_beleza_crawl4ai(crawler, url, on_markdown=None):
+    """Beleza na Web pelo navegador do próprio crawler, já configurado com os cookies.
+
+    on_markdown, se informado, recebe (url, markdown) da página crawleada.
+    """
+    if not os.path.exists(BELEZA_AUTH_FILE):
+        print(f"[Beleza na Web] Erro: Arquivo de autenticação {BELEZA_AUTH_FILE} não encontrado.")
+        return []
+    try:
+        result = await crawler.arun(
+            url=url, config=beleza_run_config(page_timeout=timeout_ms(BELEZA_PAGE_TIMEOUT)),
+        )
+        markdown_content = result.markdown
+        print('[Beleza na Web] Markdown gerado:')
+        lojas = extract_data_from_markdown_beleza(markdown_content)
+        if not lojas:
+            check_crawl_result(result, 'Beleza na Web')
+        if on_markdown is not None and result.success:
+            await on_markdown(url, markdown_content)
+    except PageBlocked:
+        raise
+    except Exception as e:
+        print(f"[Beleza na Web] Erro ao crawlear: {e}")
+        lojas = []
+    return lojas
 
+def own_browser(extract):
+    """Adapta um extrator que abre o próprio navegador (ou sessão HTTP) a fetch(crawler, url, on_markdown)."""
+    async def fetch(crawler, url, on_markdown=None):
+        return await extract(url)
+    return fetch
+
+# Cada marketplace declara seus padrões de URL, as estratégias de busca
+# (tentadas da mais barata para a mais cara) e os limites padrão
+ADAPTERS = AdapterRegistry([
+    MarketplaceAdapter('Mercado Livre', (r'mercadolivre',), [
+        FetchStrategy(HTTP, own_browser(extract_data_from_meli_http), requires=('aiohttp',)),
+        FetchStrategy(BROWSER, own_browser(extract_data_from_meli), requires=('playwright.async_api',)),
+    ], product_id_pattern=MELI_SKU_PATTERN),
+    MarketplaceAdapter('Amazon', (r'amazon',), [
+        FetchStrategy(BROWSER, own_browser(extract_data_from_amazon), requires=('playwright.async_api',)),
+    ], product_id_pattern=r'/dp/([A-Z0-9]{10})'),
+    # Navegador visível e uma aba por produto (só quando o HTTP falha): menos páginas simultâneas
+    MarketplaceAdapter('Época Cosméticos', (r'epoca',), [
+        FetchStrategy(HTTP, own_browser(extract_data_from_epoca_http), requires=('aiohttp',)),
+        FetchStrategy(BROWSER, own_browser(scrape_epoca_cosmeticos), requires=('playwright.async_api',)),
+    ], max_concurrency=2, product_id_pattern=r'q=(\d+)'),
+    # Erros do crawl4ai já viram lista vazia; não há o que tentar de novo
+    MarketplaceAdapter('Beleza na Web', (r'belezanaweb',), [
+        FetchStrategy(
+            CRAWL4AI, fetch_beleza_crawl4ai, uses_crawler=True,
+            requires=('crawl4ai', 'crawl4ai.async_dispatcher'),
+        ),
+    ], max_retries=1, product_id_pattern=r'belezanaweb\.com\.br/([^/?#]+)'),
+])
+
+def marketplace_from_url(url):
+    """Nome do marketplace de uma URL, usado nas métricas."""
+    adapter = ADAPTERS.for_url(url)
+    return adapter.name if adapter is not None else 'Desconhecido'
+
+async def crawl_url(crawler, url, max_retries=None, on_markdown=None):
+    """Extrai dados de uma URL pelo adaptador do marketplace (ADAPTERS), com re-tentativas.
+
+    As estratégias do adaptador são tentadas da mais barata para a mais cara;
+    a seguinte só entra quando a anterior não traz ofertas ou é bloqueada.
+    max_retries (padrão: o do adaptador) vale para cada estratégia.
+    on_markdown, se informado, recebe (url, markdown) de cada página da Beleza na Web.
+    Os timeouts de cada passo descontam do prazo corrente (deadline.use_deadline),
+    e não há nova tentativa quando ele acaba.
+    """
+    adapter = ADAPTERS.for_url(url)
+    if adapter is None:
+        print(f'URL não reconhecida: {url}')
+        return []
+    strategies = ADAPTERS.strategies(adapter)
+    for idx, strategy in enumerate(strategies):
+        last = idx == len(strategies) - 1
+        try:
+            lojas = await fetch_with_retries(strategy, crawler, url, max_retries or adapter.max_retries, on_markdown)
+        except PageBlocked as e:
+            # Produto indisponível não muda com outra estratégia
+            if e.verdict.kind == INDISPONIVEL:
+                raise
+            ADAPTERS.record(adapter, strategy, False)
+            if last:
+                raise
+            print(f'[{adapter.name}] {strategy.kind} bloqueado ({e.verdict.kind}), tentando via {strategies[idx + 1].kind}')
+            continue
+        ADAPTERS.record(adapter, strategy, bool(lojas))
+        if lojas:
+            return lojas
+        if not last:
+            print(f'[{adapter.name}] Sem dados via {strategy.kind}, tentando via {strategies[idx + 1].kind}')
+    return []
+
+async def fetch_with_retries(strategy, crawler, url, max_retries, on_markdown=None):
+    """Executa uma estratégia de busca, tentando de novo em erros do Playwright."""
+    for attempt in range(max_retries):
+        deadline = current_deadline()
+        if attempt and deadline is not None and deadline.expired:
+            print(f'Orçamento de tempo esgotado para {url} após {attempt} tentativas')
+            return []
+        try:
+            print(f'Extraindo dados da URL: {url} via {strategy.kind} (Tentativa {attempt + 1}/{max_retries})')
+            lojas = await strategy.fetch(crawler, url, on_markdown)
             if not lojas:
                 print(f'Sem dados ou SKU não encontrado para {url}')
                 return []
             return lojas
-        except PlaywrightError as e:
+        except PageBlocked as e:
+            # Página classificada logo após a navegação: não adianta tentar de novo
+            print(e)
+            raise
+        except Exception as e:
+            if not is_playwright_error(e):
+                print(f'Erro ao crawlear a URL {url} na tentativa {attempt + 1}: {e}')
+                return []
             print(f'Erro do Playwright na tentativa {attempt + 1}: {e}')
             if attempt < max_retries - 1:
                 print('Tentando novamente...')
-                await asyncio.sleep(2)
+                await asyncio.sleep(min(2, deadline.remaining()) if deadline is not None else 2)
             else:
                 print(f'Erro ao crawlear a URL {url} após {max_retries} tentativas: {e}')
                 return []
-        except Exception as e:
-            print(f'Erro ao crawlear a URL {url} na tentativa {attempt + 1}: {e}')
-            return []
-            
+
+def is_playwright_error(error):
+    """True para erros do Playwright, sem importá-lo: se ele não foi carregado, o erro não é dele."""
+    playwright_api = sys.modules.get('playwright.async_api')
+    return playwright_api is not None and isinstance(error, playwright_api.Error)
+
+def dispatch_seconds(result):
+    """Duração do crawl de um resultado do arun_many, segundo o dispatcher (ou None)."""
+    dispatch = getattr(result, 'dispatch_result', None)
+    if dispatch is None or not dispatch.start_time or not dispatch.end_time:
+        return None
+    elapsed = dispatch.end_time - dispatch.start_time
+    return elapsed.total_seconds() if hasattr(elapsed, 'total_seconds') else float(elapsed)
+
+async def crawl_beleza_batch(crawler, urls, max_sessions=None, memory_threshold=None, metrics=None, on_markdown=None, governor=None, deadline=None, breakers=None):
+    """Crawleia todas as URLs da Beleza na Web numa única chamada arun_many.
+
+    Os resultados são entregues conforme ficam prontos, como pares (url, lojas).
+    A concorrência e o limite de memória vêm do MemoryAdaptiveDispatcher.
+    on_markdown, se informado, recebe (url, markdown) de cada página crawleada.
+    Com um MemoryGovernor, as URLs vão em blocos de governor.max_pages e o
+    navegador pode ser reciclado entre um bloco e outro. Cada página tem o
+    timeout de um Deadline(URL_DEADLINE_S, parent=deadline), e com deadline (o
+    prazo da execução) nenhum bloco novo começa depois que ele acaba e o bloco
+    em andamento é interrompido; as URLs que faltam saem como ADIADO. Com breakers
+    (MarketplaceBreakers), cada URL passa pelo circuito da Beleza na Web antes
+    do crawl e tem o resultado registrado nele; as recusadas, e as que faltam
+    no bloco quando o circuito abre, saem como ADIADO.
+    """
+    if not urls:
+        return
+    if not os.path.exists(BELEZA_AUTH_FILE):
+        print(f"[Beleza na Web] Erro: Arquivo de autenticação {BELEZA_AUTH_FILE} não encontrado.")
+        for url in urls:
+            yield url, []
+        return
+
+    from crawl4ai.async_dispatcher import MemoryAdaptiveDispatcher
+
+    dispatcher = MemoryAdaptiveDispatcher(
+        memory_threshold_percent=memory_threshold or BELEZA_BATCH_MEMORY_THRESHOLD,
+        max_session_permit=max_sessions or BELEZA_BATCH_MAX_SESSIONS,
+    )
+    print(f'[Beleza na Web] Iniciando lote com {len(urls)} URLs')
+    chunk_size = governor.max_pages if governor is not None else len(urls)
+    for start in range(0, len(urls), chunk_size):
+        chunk = urls[start:start + chunk_size]
+        if deadline is not None and deadline.expired:
+            print(f'[Beleza na Web] Prazo da execução esgotado, {len(urls) - start} URLs ficam para a próxima')
+            for url in chunk:
+                yield url, ADIADO
+            continue
+        if breakers is not None:
+            admitted = [url for url in chunk if breakers.allow('Beleza na Web')]
+            for url in chunk:
+                if url not in admitted:
+                    print(f'[Beleza na Web] Circuito aberto, adiando {url} para a próxima execução')
+                    yield url, ADIADO
+            chunk = admitted
+            if not chunk:
+                continue
+        # Mesmo orçamento por página do modo por URL, limitado pelo que resta da execução
+        page_deadline = Deadline(URL_DEADLINE_S, parent=deadline)
+        config = beleza_run_config(stream=True, page_timeout=page_deadline.timeout_ms(BELEZA_PAGE_TIMEOUT))
+        if governor is None:
+            async for item in _crawl_beleza_chunk(crawler, chunk, config, dispatcher, metrics, on_markdown, breakers, deadline):
+                yield item
+            continue
+        async with governor.page('Beleza na Web', uses_crawler=True, pages=len(chunk)):
+            async for item in _crawl_beleza_chunk(crawler, chunk, config, dispatcher, metrics, on_markdown, breakers, deadline):
+                yield item
+        await governor.maybe_recycle(crawler)
+
+async def _next_result(results, deadline):
+    """Próximo resultado do stream do arun_many; asyncio.TimeoutError se o prazo da execução acabar."""
+    remaining = deadline.remaining() if deadline is not None else float('inf')
+    if remaining == float('inf'):
+        return await results.__anext__()
+    return await asyncio.wait_for(results.__anext__(), max(remaining, 0))
+
+async def _crawl_beleza_chunk(crawler, urls, config, dispatcher, metrics, on_markdown, breakers=None, deadline=None):
+    """Um arun_many sobre um bloco de URLs da Beleza na Web."""
+    pendentes = set(urls)
+    batch_start = time.time()
+    circuit_opened = False
+    deadline_hit = False
+    try:
+        results = await crawler.arun_many(urls=urls, config=config, dispatcher=dispatcher)
+        while True:
+            try:
+                result = await _next_result(results, deadline)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                # Prazo da execução esgotado no meio do bloco: para o stream
+                deadline_hit = True
+                print(f'[Beleza na Web] Prazo da execução esgotado, interrompendo o lote com {len(pendentes)} URLs')
+                await results.aclose()
+                break
+            pendentes.discard(result.url)
+            if metrics is not None:
+                elapsed = dispatch_seconds(result)
+                metrics.record_latency('Beleza na Web', elapsed if elapsed is not None else time.time() - batch_start)
+            # Produto indisponível é uma resposta normal do site e não conta para o circuito
+            site_ok = False
+            if not result.success:
+                print(f"[Beleza na Web] Erro ao crawlear {result.url}: {result.error_message}")
+                lojas = []
+            else:
+                try:
+                    lojas = extract_data_from_markdown_beleza(result.markdown)
+                    if not lojas:
+                        check_crawl_result(result, 'Beleza na Web')
+                    site_ok = bool(lojas)
+                except PageBlocked as e:
+                    print(e)
+                    if metrics is not None:
+                        metrics.record_block('Beleza na Web', e.verdict.kind)
+                    site_ok = e.verdict.kind == INDISPONIVEL
+                    lojas = []
+                except Exception as e:
+                    print(f"[Beleza na Web] Erro ao extrair dados de {result.url}: {e}")
+                    lojas = []
+                if on_markdown is not None:
+                    await on_markdown(result.url, result.markdown)
+            if breakers is not None:
+                breakers.record('Beleza na Web', site_ok)
+                circuit_opened = bool(pendentes) and not breakers.closed('Beleza na Web')
+            yield result.url, lojas
+            if circuit_opened:
+                # Para o lote: o que ainda não voltou fica para a próxima execução
+                await results.aclose()
+                break
+    except Exception as e:
+        print(f"[Beleza na Web] Erro no lote: {e}")
+    for url in pendentes:
+        if deadline_hit:
+            if metrics is not None:
+                metrics.record_budget_exhausted('Beleza na Web', time.time() - batch_start)
+            # Parada nossa, não do site: não conta para o circuito (e libera a URL de teste)
+            if breakers is not None:
+                breakers.release('Beleza na Web')
+            yield url, ADIADO
+            continue
+        if circuit_opened:
+            print(f'[Beleza na Web] Circuito aberto, adiando {url} para a próxima execução')
+            yield url, ADIADO
+            continue
+        # URLs que o dispatcher não devolveu (ex.: lote interrompido) contam como sem dados e falha do site
+        if breakers is not None:
+            breakers.record('Beleza na Web', False)
+        yield url, []
+
 async def send_to_api(data):
     """Envia os dados dos vendedores para a API (POST)."""
     api_url = os.environ.get('API_URL', 'https://www.price.kamico.com.br/api/products')
-    async with aiohttp.ClientSession() as session:
+    body, headers = encode_body(data)
+    async with http_session() as session:
         try:
-            async with session.post(api_url, json=data, headers={'Content-Type': 'application/json'}) as response:
+            async with session.post(api_url, data=body, headers=headers) as response:
                 print(f"Status da resposta (POST): {response.status}")
                 return response.status
         except Exception as e:
@@ -715,12 +1146,13 @@ async def send_to_api(data):
 async def update_to_api(data):
     """Atualiza os dados dos vendedores na API (PUT)."""
     api_url = 'https://www.price.kamico.com.br/api/products'
-    async with aiohttp.ClientSession() as session:
+    body, headers = encode_body(data)
+    async with http_session() as session:
         try:
             async with session.put(
                 api_url,
-                json=data,
-                headers={'Content-Type': 'application/json'},
+                data=body,
+                headers=headers,
             ) as response:
                 print(f'Status da resposta (PUT): {response.status}')
                 return response.status
@@ -728,69 +1160,309 @@ async def update_to_api(data):
             print(f'Erro ao enviar dados para a API (PUT): {e}')
             return None
 
-def save_sem_dados_urls(sem_dados):
-    """Salva URLs sem dados em um arquivo JSON."""
+async def save_sem_dados_urls(sem_dados):
+    """Salva URLs sem dados em um arquivo JSON (numa thread, com escrita atômica)."""
     try:
-        with open('sem_dados_urls.json', 'w', encoding='utf-8') as f:
-            json.dump(sem_dados, f, ensure_ascii=False, indent=2)
+        await save_json('sem_dados_urls.json', sem_dados, indent=2)
     except Exception as e:
         print(f'Erro ao salvar sem_dados_urls.json: {e}')
 
-def carregar_sem_dados_url():
+async def carregar_sem_dados_url():
     """Carrega URLs que falharam em execuções anteriores de um arquivo JSON."""
     try:
-        if os.path.exists('sem_dados_urls.json'):
-            with open('sem_dados_urls.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
+        return await load_json('sem_dados_urls.json', [])
     except Exception as e:
         print(f'Erro ao carregar sem_dados_urls.json: {e}')
         return []
 
-async def process_urls(urls):
-    """Processa URLs de Amazon, Beleza na Web e Mercado Livre e envia os itens para a API."""
-    sem_dado = carregar_sem_dados_url()
-    combined_urls = list(dict.fromkeys(sem_dado + urls))
-    total_urls = len(combined_urls)
-    processed_count = 0
-    sem_dados = []
-    successful_urls = 0
+async def upload_result(url, result):
+    """Envia as ofertas de uma URL para a API (POST, com PUT em caso de 400). Retorna True se salvou.
+
+    O corpo segue PAYLOAD_FORMAT: plano (padrão, compatível) ou agrupado por produto.
+    """
+    payload = build_payload(result)
+    post_status = await send_to_api(payload)
+    if post_status in (200, 201):
+        print(f'Dados salvos com sucesso para {url}, POST concluído.')
+        return True
+    if post_status == 400:
+        put_status = await update_to_api(payload)
+        if put_status != 202:
+            print(f'Falha ao atualizar dados de {url} (Status: {put_status})')
+            return False
+        print(f'Dados atualizados com sucesso para {url}, PUT concluído.')
+        return True
+    print(f'Falha ao salvar dados de {url} (Status: {post_status})')
+    return False
+
+def normalize_offers(lojas):
+    """Normaliza as ofertas antes do envio: preço sempre como float."""
+    for loja in lojas:
+        preco = loja.preco_final
+        if isinstance(preco, str):
+            try:
+                loja.preco_final = float(preco) if preco else 0.0
+            except ValueError:
+                print(f"Preço inválido para {loja.key_sku}: {preco!r}")
+                loja.preco_final = 0.0
+    return lojas
+
+async def cancel_task(task):
+    """Cancela uma task e espera ela terminar."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+async def process_urls(urls, beleza_batch=None, with_details=None, crawler=None, metrics=None,
+                       breakers=None, governor=None, retry_sem_dados=True):
+    """Processa URLs de Amazon, Beleza na Web e Mercado Livre e envia os itens para a API.
+
+    O crawl, a normalização e a gravação rodam em estágios ligados por filas
+    limitadas (pipeline.StagedPipeline). Cada URL é gravada primeiro nos sinks
+    locais (LOCAL_SINKS) e na outbox; o envio à API acontece em paralelo a
+    partir da outbox, então o scraping não depende da API estar no ar e
+    envios que falham são refeitos na próxima execução sem raspar de novo.
+
+    Com beleza_batch (padrão: BELEZA_BATCH_MODE), as URLs da Beleza na Web são
+    crawleadas num único lote via crawl_beleza_batch. Com with_details (padrão:
+    BELEZA_WITH_DETAILS), o mesmo markdown também alimenta os detalhes do
+    produto, enviados à API de detalhes quando o cache de DETAILS_TTL_HOURS expira.
+
+    crawler, se informado, é um AsyncWebCrawler já iniciado (ex.: o do daemon),
+    usado no lugar de um novo e não fechado ao final. metrics, se informado, é o
+    RunMetrics que recebe as métricas da execução (ex.: bench_pipeline).
+    breakers (MarketplaceBreakers) e governor (MemoryGovernor), se informados,
+    vêm de quem chama e mantêm o estado entre execuções (ex.: o daemon, em que
+    o governor é o único que recicla o crawler). Com retry_sem_dados (padrão),
+    as URLs de sem_dados_urls.json entram nesta execução e as que ficarem sem
+    dados são gravadas lá; o daemon desliga isso e reagenda as suas.
+    Retorna o status de cada URL.
+    """
+    if beleza_batch is None:
+        beleza_batch = BELEZA_BATCH_MODE
+    if with_details is None:
+        with_details = BELEZA_WITH_DETAILS
+    # Estratégias rebaixadas valem só para esta execução (ADAPTERS vive no processo todo)
+    ADAPTERS.reset()
+    # Os extratores consultam o índice de identidades no meio do crawl: lido antes, numa thread
+    await asyncio.to_thread(IDENTITY.load)
+    sem_dado = await carregar_sem_dados_url() if retry_sem_dados else []
+    all_urls = list(dict.fromkeys(sem_dado + urls))
+    combined_urls = all_urls
+    total_urls = len(all_urls)
+
+    beleza_urls = []
+    if beleza_batch:
+        beleza_urls = [url for url in combined_urls if marketplace_from_url(url) == 'Beleza na Web']
+        combined_urls = [url for url in combined_urls if marketplace_from_url(url) != 'Beleza na Web']
 
     print(f'Total de URLs a processar: {total_urls} (incluindo {len(sem_dado)} URLs de execuções anteriores)')
-    async with AsyncWebCrawler(verbose=True) as crawler:
-        for url in combined_urls:
-            processed_count += 1
-            print(f'Processado {processed_count}/{total_urls} URLs')
-            result = await crawl_url(crawler, url)
-            print('Dados extraídos:')
-            pprint(result, indent=2)  # Use pprint for structured output
-            if result:
-                post_status = await send_to_api(result)
-                if post_status in (200, 201):
-                    print(f'Dados salvos com sucesso para {url}, POST concluído.')
-                    successful_urls += 1
-                elif post_status == 400:
-                    put_status = await update_to_api(result)
-                    if put_status != 202:
-                        print(f'Falha ao atualizar dados de {url} (Status: {put_status})')
-                        sem_dados.append(url)
-                    else:
-                        print(f'Dados atualizados com sucesso para {url}, PUT concluído.')
-                        successful_urls += 1
-                else:
-                    print(f'Falha ao salvar dados de {url} (Status: {post_status})')
-                    sem_dados.append(url)
-            else:
-                print(f'Sem dados para {url}, marcando para lista de URLs sem dados')
-                sem_dados.append(url)
-            time.sleep(1)
+    if metrics is None:
+        metrics = RunMetrics()
+    if governor is None:
+        governor = MemoryGovernor(metrics)
+    else:
+        # O governor do daemon atravessa as execuções; as métricas são as desta
+        governor.metrics = metrics
+    if breakers is None:
+        breakers = MarketplaceBreakers()
+    run_deadline = Deadline(RUN_DEADLINE_S)
+    scrape_dedup = ScrapeDedup(ADAPTERS.product_key)
+    offer_dedup = OfferDedup()
+    # Ofertas gravadas nesta execução, para a análise de preços do final
+    run_offers = []
+    run_id = new_run_id()
+    # O navegador do crawl4ai só sobe se algum adaptador das URLs usa o crawler
+    needs_crawler = crawler is None and any(
+        adapter is not None and adapter.uses_crawler
+        for adapter in map(ADAPTERS.for_url, all_urls)
+    )
+    # Tudo o que roda em segundo plano ou segura arquivos é liberado mesmo se o pipeline falhar
+    async with AsyncExitStack() as resources:
+        sampler = asyncio.create_task(metrics.sample_forever())
+        resources.push_async_callback(cancel_task, sampler)
+        # LOOP_LAG_MONITOR / CPU_PROFILE: diagnóstico opcional do event loop
+        lag_monitor, profiler = start_diagnostics()
+        resources.callback(stop_diagnostics, lag_monitor, profiler)
+        wire_stats.reset()
+        # Abrir a outbox (SQLite) e devolver as falhas à fila tocam o disco: numa thread
+        outbox = await asyncio.to_thread(Outbox)
+        resources.callback(outbox.close)
+        requeued = await asyncio.to_thread(outbox.requeue_failed)
+        if requeued:
+            print(f'{requeued} envios pendentes de execuções anteriores voltaram para a outbox')
+        uploader = OutboxUploader(outbox, ApiSink(upload_result), workers=UPLOAD_WORKERS)
+        uploader_task = asyncio.create_task(uploader.run())
+        resources.push_async_callback(cancel_task, uploader_task)
+        local_sinks = build_local_sinks(run_id)
+        for sink in local_sinks:
+            resources.push_async_callback(sink.close)
+        async with AsyncExitStack() as stack:
+            beleza_session = track_beleza_session(crawler) if crawler is not None else None
+            if needs_crawler:
+                from crawl4ai import AsyncWebCrawler
+
+                crawler = await stack.enter_async_context(AsyncWebCrawler(config=await build_browser_config()))
+                beleza_session = track_beleza_session(crawler)
+            if beleza_session is not None:
+                release_session = functools.partial(release_beleza_session, beleza_session)
+                governor.before_recycle.append(release_session)
+                # O governor do daemon atravessa as execuções: o callback é só desta
+                stack.callback(governor.before_recycle.remove, release_session)
+            details_uploader = None
+            on_markdown = None
+            if with_details:
+                details_client = BatchedApiClient(DETAILS_API_URL)
+                details_uploader = DetailsUploader(details_client, max_age=DETAILS_TTL_HOURS * 3600)
+                # Registrado antes do cliente: os hashes só são gravados depois do flush final
+                stack.push_async_callback(details_uploader.finish)
+                await stack.enter_async_context(details_client)
 
-    save_sem_dados_urls(sem_dados)
-    print(f'Processamento concluído: {processed_count}/{total_urls} URLs processadas')
-    print(f'Resultados: {successful_urls} URLs bem-sucedidas, {len(sem_dados)} URLs falharam, {len(sem_dados)} URLs sem dados')
-    print(sem_dados)
+                async def send_details(url, markdown):
+                    status = await details_uploader.handle(url, markdown)
+                    print(f'[Beleza na Web] Detalhes de {url}: {status}')
+
+                on_markdown = send_details
+
+            def defer(url):
+                if run_deadline.expired:
+                    print(f'Prazo da execução esgotado, adiando {url} para a próxima execução')
+                    return True
+                # Quem reaproveita a raspagem de outra URL não passa pelo circuito:
+                # allow() admitiria a URL de teste, que nunca teria resultado registrado
+                if scrape_dedup.known(url):
+                    return False
+                marketplace = marketplace_from_url(url)
+                if breakers.allow(marketplace):
+                    return False
+                print(f'[{marketplace}] Circuito aberto, adiando {url} para a próxima execução')
+                return True
+
+            async def crawl(url):
+                # URLs do mesmo produto compartilham uma única raspagem
+                return await scrape_dedup.run(url, lambda: crawl_once(url))
+
+            async def crawl_once(url):
+                adapter = ADAPTERS.for_url(url)
+                if adapter is None:
+                    print(f'URL não reconhecida: {url}')
+                    return []
+                marketplace = adapter.name
+                # Só quem usa o navegador do crawler (Beleza na Web) entra no recycle
+                uses_crawler = adapter.uses_crawler
+                url_start = time.time()
+                lojas = []
+                # Produto indisponível é uma resposta normal do site e não conta para o circuito
+                site_ok = False
+                try:
+                    async with adapter.semaphore, governor.page(marketplace, uses_crawler=uses_crawler):
+                        # Todas as esperas da URL descontam deste prazo; wait_for garante o teto
+                        deadline = Deadline(URL_DEADLINE_S, parent=run_deadline)
+                        remaining = deadline.remaining()
+                        with use_deadline(deadline):
+                            lojas = await asyncio.wait_for(
+                                crawl_url(crawler, url, on_markdown=on_markdown),
+                                remaining if remaining != float('inf') else None,
+                            )
+                    site_ok = bool(lojas)
+                except PageBlocked as e:
+                    metrics.record_block(marketplace, e.verdict.kind)
+                    site_ok = e.verdict.kind == INDISPONIVEL
+                except (asyncio.TimeoutError, DeadlineExceeded):
+                    print(f'[{marketplace}] Orçamento de tempo esgotado para {url}')
+                    metrics.record_budget_exhausted(marketplace, time.time() - url_start)
+                finally:
+                    breakers.record(marketplace, site_ok)
+                metrics.record_latency(marketplace, time.time() - url_start)
+                if uses_crawler:
+                    await governor.maybe_recycle(crawler)
+                return lojas
+
+            async def store(url, lojas):
+                lojas = offer_dedup.filter(lojas)
+                if not lojas:
+                    print(f'Ofertas de {url} já gravadas nesta execução por outra URL do mesmo produto')
+                    return True
+                print(f'Dados extraídos de {url}:')
+                pprint(lojas, indent=2)  # Use pprint for structured output
+                for sink in local_sinks:
+                    await sink.write(url, lojas)
+                # Com a API atrasada, espera o envio em vez de acumular na outbox
+                await uploader.wait_for_room()
+                await asyncio.to_thread(outbox.enqueue, run_id, url, lojas)
+                run_offers.extend(lojas)
+                for header in {offer.product for offer in lojas}:
+                    IDENTITY.observe(header)
+                return True
+
+            pipeline = StagedPipeline(
+                crawl,
+                normalize_offers,
+                store,
+                crawl_workers=CRAWL_WORKERS,
+                upload_workers=UPLOAD_WORKERS,
+                queue_size=PIPELINE_QUEUE_SIZE,
+                crawl_delay=CRAWL_DELAY_S,
+                metrics=metrics,
+                skip=defer,
+            )
+            beleza_unique, beleza_duplicates = scrape_dedup.group(beleza_urls)
+            beleza_source = expand_duplicates(crawl_beleza_batch(
+                crawler, beleza_unique, metrics=metrics, on_markdown=on_markdown, governor=governor,
+                deadline=run_deadline, breakers=breakers,
+            ), beleza_duplicates)
+            outcomes = await pipeline.run(combined_urls, sources=[beleza_source], total=total_urls)
+
+            if beleza_session is not None:
+                await save_beleza_session(beleza_session)
+        # Grava as sessões de login que ainda estão na janela de agrupamento
+        await AUTH_STATE.flush()
+
+        # Espera a outbox esvaziar; o que falhar fica para a próxima execução
+        uploader.stop()
+        await uploader_task
+        try:
+            await asyncio.to_thread(IDENTITY.save)
+        except OSError as e:
+            print(f'Erro ao salvar o índice de identidades: {e}')
+        if PRICE_ANALYTICS:
+            from price_analytics import analyze_run
+
+            try:
+                # Ofertas do mesmo produto em marketplaces diferentes entram no mesmo grupo
+                await asyncio.to_thread(analyze_run, run_id, run_offers, key_func=IDENTITY.product_key)
+            except Exception as e:
+                print(f'Erro na análise de preços: {e}')
+        # Só volta a ser raspado o que não gerou dados (incluindo as URLs adiadas
+        # por circuito aberto ou prazo esgotado); falhas de envio ficam na outbox
+        sem_dados = [url for url in all_urls if outcomes.get(url) != 'ok']
+        successful_urls = total_urls - len(sem_dados)
+        if retry_sem_dados:
+            await save_sem_dados_urls(sem_dados)
+        print(f'Processamento concluído: {len(outcomes)}/{total_urls} URLs processadas')
+        adiadas = sum(1 for status in outcomes.values() if status == 'adiado')
+        print(f'Resultados: {successful_urls} URLs com dados, {len(sem_dados)} URLs sem dados ({adiadas} adiadas por circuito aberto ou prazo esgotado)')
+        print(f'API: {uploader.sent} envios concluídos, {uploader.failed} falharam (ficam na outbox)')
+        nao_enviadas = await asyncio.to_thread(outbox.failed_urls, run_id)
+        if nao_enviadas:
+            print(f'URLs desta execução ainda não enviadas à API: {nao_enviadas}')
+        print(f'Tráfego para as APIs: {wire_stats.summary()}')
+        print(f'Duplicatas: {scrape_dedup.shared} URLs reaproveitaram a raspagem de outra URL do mesmo produto, '
+              f'{offer_dedup.dropped} ofertas com key_sku repetido não foram reenviadas')
+        print(f'Identidades: {IDENTITY.linked()} produtos ligados entre marketplaces')
+        print(sem_dados)
+        finish_diagnostics(run_id, lag_monitor, profiler)
+        metrics.print_report()
+        governor.print_report()
+        breakers.print_report()
+        ADAPTERS.print_report()
+        return outcomes
 
 if __name__ == "__main__":
+    # "python scrape_combined_crawl4ai.py --replay" reenvia a outbox sem raspar
+    if '--replay' in sys.argv:
+        asyncio.run(replay_outbox(upload_result))
+        sys.exit(0)
+
     urls = [
         "https://www.epocacosmeticos.com.br/pesquisa?q=8005610672427"       # Adicione outras URLs para Amazon, Beleza na Web, Mercado Livre, etc.
     ]
@@ -0,0 +1,67 @@
+import gzip
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o json da stdlib
+    orjson = None
+
+# Corpos maiores que isso (bytes) vão com gzip; API_GZIP=0 desliga a compressão
+GZIP_THRESHOLD = int(os.environ.get('GZIP_THRESHOLD', '1024'))
+GZIP_ENABLED = os.environ.get('API_GZIP', '1') == '1'
+GZIP_LEVEL = 6
+
+
+def dumps(data) -> bytes:
+    """Serializa em JSON UTF-8 (sem escapar acentos), com orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class WireStats:
+    """Bytes serializados x bytes enviados (após gzip) nas requisições da execução."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.compressed = 0
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+
+    def record(self, raw, wire, compressed):
+        self.requests += 1
+        self.raw_bytes += raw
+        self.wire_bytes += wire
+        if compressed:
+            self.compressed += 1
+
+    def summary(self):
+        saved = self.raw_bytes - self.wire_bytes
+        pct = 100 * saved / self.raw_bytes if self.raw_bytes else 0.0
+        return (
+            f'{self.requests} requisições ({self.compressed} com gzip): '
+            f'{self.raw_bytes / 1024:.1f} KB em JSON, {self.wire_bytes / 1024:.1f} KB enviados '
+            f'({pct:.0f}% economizado)'
+        )
+
+
+wire_stats = WireStats()
+
+
+def encode_body(data, compress=None):
+    """Corpo e cabeçalhos de uma requisição JSON, com gzip acima de GZIP_THRESHOLD."""
+    if compress is None:
+        compress = GZIP_ENABLED
+    body = dumps(data)
+    raw_size = len(body)
+    headers = {'Content-Type': 'application/json'}
+    compressed = compress and raw_size > GZIP_THRESHOLD
+    if compressed:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers['Content-Encoding'] = 'gzip'
+    wire_stats.record(raw_size, len(body), compressed)
+    return body, headers
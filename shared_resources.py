@@ -0,0 +1,117 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+# Um navegador do pool é trocado por um novo depois de tantos usos
+POOL_BROWSER_MAX_USES = int(os.environ.get('POOL_BROWSER_MAX_USES', '200'))
+
+# Pool e sessão HTTP em uso (instalados pelo daemon); None = um por chamada
+_browser_pool = None
+_http_session = None
+
+
+class _PooledBrowser:
+    def __init__(self, browser):
+        self.browser = browser
+        self.uses = 0
+        self.in_use = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """Navegadores Chromium do Playwright mantidos abertos entre as URLs.
+
+    Há um navegador por modo (headless ou visível). Cada extrator abre e fecha
+    o próprio contexto; o navegador continua aberto. Depois de max_uses usos
+    ele é aposentado: novos usos vão para um navegador novo e o antigo fecha
+    quando a última página dele termina.
+    """
+
+    def __init__(self, max_uses=None):
+        self.max_uses = max_uses or POOL_BROWSER_MAX_USES
+        self.launched = 0
+        self._playwright = None
+        self._browsers = {}
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        return self
+
+    async def _entry(self, headless):
+        async with self._lock:
+            entry = self._browsers.get(headless)
+            if entry is None or entry.retired or not entry.browser.is_connected():
+                browser = await self._playwright.chromium.launch(headless=headless)
+                entry = self._browsers[headless] = _PooledBrowser(browser)
+                self.launched += 1
+            entry.uses += 1
+            entry.in_use += 1
+            if entry.uses >= self.max_uses:
+                entry.retired = True
+            return entry
+
+    @asynccontextmanager
+    async def lease(self, headless=True):
+        entry = await self._entry(headless)
+        try:
+            yield entry.browser
+        finally:
+            entry.in_use -= 1
+            if entry.retired and entry.in_use == 0:
+                await entry.browser.close()
+
+    def status(self):
+        return {
+            'navegadores_abertos': sum(1 for e in self._browsers.values() if e.browser.is_connected()),
+            'navegadores_iniciados': self.launched,
+        }
+
+    async def close(self):
+        for entry in self._browsers.values():
+            try:
+                await entry.browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+def install(browser_pool=None, http_session=None):
+    """Passa a usar o pool de navegadores e a sessão HTTP informados (None volta ao padrão)."""
+    global _browser_pool, _http_session
+    _browser_pool = browser_pool
+    _http_session = http_session
+
+
+@asynccontextmanager
+async def playwright_browser(headless=True):
+    """Um navegador Chromium: o do pool, se instalado, ou um novo fechado ao final."""
+    if _browser_pool is not None:
+        async with _browser_pool.lease(headless) as browser:
+            yield browser
+        return
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+@asynccontextmanager
+async def http_session():
+    """Sessão aiohttp: a compartilhada, se instalada, ou uma nova fechada ao final."""
+    if _http_session is not None:
+        yield _http_session
+        return
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        yield session
@@ -0,0 +1,380 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+from records import from_grouped, to_grouped
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional
+    pa = None
+    pq = None
+
+# Diretório de dados locais de cada execução
+DATA_DIR = os.environ.get('DATA_DIR', 'dados')
+OUTBOX_DB = os.path.join(DATA_DIR, 'outbox.sqlite')
+# Máximo de itens por enviar na outbox antes de a gravação esperar o envio
+OUTBOX_MAX_PENDING = int(os.environ.get('OUTBOX_MAX_PENDING', '200'))
+# Dias que os itens já enviados ficam na outbox antes de serem apagados
+OUTBOX_RETENTION_DAYS = float(os.environ.get('OUTBOX_RETENTION_DAYS', '7'))
+
+OFFER_COLUMNS = [
+    'sku', 'loja', 'preco_final', 'data_hora', 'marketplace', 'key_loja',
+    'key_sku', 'descricao', 'review', 'imagem', 'status',
+]
+
+
+def new_run_id():
+    return datetime.now().strftime('%Y%m%dT%H%M%S')
+
+
+def offer_rows(run_id, url, offers):
+    """Linhas planas (uma por oferta) com o run_id e a URL de origem."""
+    rows = []
+    for offer in offers:
+        row = {'run_id': run_id, 'url': url}
+        row.update(offer.as_dict())
+        rows.append(row)
+    return rows
+
+
+class Sink:
+    """Destino das ofertas de uma execução.
+
+    write() recebe as ofertas de uma URL e retorna True se foram aceitas;
+    flush() grava o que estiver em buffer e close() libera os recursos.
+    """
+
+    name = 'sink'
+
+    async def write(self, url, offers):
+        raise NotImplementedError
+
+    async def flush(self):
+        pass
+
+    async def close(self):
+        await self.flush()
+
+
+class BatchedFileSink(Sink):
+    """Base dos sinks locais: acumula linhas e grava em lotes numa thread,
+    para não bloquear o event loop."""
+
+    def __init__(self, run_id, batch_size=200):
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self._rows = []
+        self._lock = asyncio.Lock()
+
+    async def write(self, url, offers):
+        self._rows.extend(offer_rows(self.run_id, url, offers))
+        if len(self._rows) >= self.batch_size:
+            await self.flush()
+        return True
+
+    async def flush(self):
+        async with self._lock:
+            rows, self._rows = self._rows, []
+            if rows:
+                await asyncio.to_thread(self._write_rows, rows)
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+
+class JsonlSink(BatchedFileSink):
+    """Uma linha JSON por oferta em dados/ofertas-AAAAMMDD.jsonl."""
+
+    name = 'jsonl'
+
+    def __init__(self, run_id, batch_size=200, directory=DATA_DIR):
+        super().__init__(run_id, batch_size)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f'ofertas-{run_id[:8]}.jsonl')
+
+    def _write_rows(self, rows):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+
+class SqliteSink(BatchedFileSink):
+    """Tabela ofertas em dados/ofertas.sqlite, gravada com executemany por lote."""
+
+    name = 'sqlite'
+
+    def __init__(self, run_id, batch_size=200, path=os.path.join(DATA_DIR, 'ofertas.sqlite')):
+        super().__init__(run_id, batch_size)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._columns = ['run_id', 'url'] + OFFER_COLUMNS
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS ofertas ({', '.join(self._columns)})"
+        )
+        self._conn.commit()
+
+    def _write_rows(self, rows):
+        placeholders = ', '.join('?' for _ in self._columns)
+        with self._conn:
+            self._conn.executemany(
+                f'INSERT INTO ofertas VALUES ({placeholders})',
+                [tuple(row[c] for c in self._columns) for row in rows],
+            )
+
+    async def close(self):
+        await super().close()
+        self._conn.close()
+
+
+class ParquetSink(BatchedFileSink):
+    """Um arquivo Parquet por lote em dados/parquet/run=<run_id>/ (requer pyarrow)."""
+
+    name = 'parquet'
+
+    def __init__(self, run_id, batch_size=1000, directory=os.path.join(DATA_DIR, 'parquet')):
+        if pa is None:
+            raise RuntimeError('ParquetSink requer o pacote pyarrow')
+        super().__init__(run_id, batch_size)
+        self.directory = os.path.join(directory, f'run={run_id}')
+        os.makedirs(self.directory, exist_ok=True)
+        self._part = 0
+
+    def _write_rows(self, rows):
+        # preco_final/review podem vir como str de alguns extratores
+        for row in rows:
+            for column in ('preco_final', 'review'):
+                try:
+                    row[column] = float(row[column]) if row[column] is not None else None
+                except (TypeError, ValueError):
+                    row[column] = None
+        table = pa.Table.from_pylist(rows)
+        pq.write_table(table, os.path.join(self.directory, f'part-{self._part:04d}.parquet'))
+        self._part += 1
+
+
+class ApiSink(Sink):
+    """Envia as ofertas de uma URL à API remota com a função upload(url, offers)."""
+
+    name = 'api'
+
+    def __init__(self, upload):
+        self.upload = upload
+
+    async def write(self, url, offers):
+        return await self.upload(url, offers)
+
+
+def _price_history_sink(run_id):
+    # Importado só aqui: price_history depende de numpy e deste módulo
+    from price_history import PriceHistorySink
+
+    return PriceHistorySink(run_id)
+
+
+LOCAL_SINKS = {
+    'jsonl': JsonlSink,
+    'sqlite': SqliteSink,
+    'parquet': ParquetSink,
+    'historico': _price_history_sink,
+}
+
+
+def build_local_sinks(run_id, names=None):
+    """Cria os sinks locais listados em names (padrão: variável LOCAL_SINKS, 'jsonl,historico')."""
+    if names is None:
+        names = os.environ.get('LOCAL_SINKS', 'jsonl,historico').split(',')
+    sinks = []
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        if name not in LOCAL_SINKS:
+            print(f'Sink local desconhecido: {name}')
+            continue
+        try:
+            sinks.append(LOCAL_SINKS[name](run_id))
+        except Exception as e:
+            print(f'Erro ao criar sink {name}: {e}')
+    return sinks
+
+
+class Outbox:
+    """Fila persistente (SQLite) das ofertas a enviar à API.
+
+    Cada URL raspada entra como 'pendente'. O envio marca 'enviado' ou
+    'falhou'; falhas voltam a 'pendente' em requeue_failed(), permitindo
+    reenviar sem raspar de novo. backlog conta os itens ainda por enviar.
+    Itens enviados há mais de OUTBOX_RETENTION_DAYS são apagados no
+    requeue_failed(), para o arquivo não crescer a cada execução.
+    """
+
+    def __init__(self, path=OUTBOX_DB):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS outbox ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT, url TEXT, '
+                'payload TEXT, status TEXT, tentativas INTEGER DEFAULT 0, atualizado_em TEXT)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status)')
+        self.backlog = self._count_backlog()
+
+    def _count_backlog(self):
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE status IN ('pendente', 'enviando')"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _timestamp(moment):
+        return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _now(self):
+        return self._timestamp(datetime.now(timezone.utc))
+
+    def enqueue(self, run_id, url, offers):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO outbox (run_id, url, payload, status, atualizado_em) VALUES (?, ?, ?, ?, ?)',
+                (run_id, url, json.dumps(to_grouped(offers), ensure_ascii=False), 'pendente', self._now()),
+            )
+            self.backlog += 1
+
+    def claim(self, limit):
+        """Reserva até limit itens pendentes, marcando-os como 'enviando'."""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, url, payload FROM outbox WHERE status = 'pendente' ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'enviando', tentativas = tentativas + 1 WHERE id = ?",
+                [(row[0],) for row in rows],
+            )
+        return [(row_id, url, from_grouped(json.loads(payload))) for row_id, url, payload in rows]
+
+    def mark(self, row_id, ok):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE outbox SET status = ?, atualizado_em = ? WHERE id = ?',
+                ('enviado' if ok else 'falhou', self._now(), row_id),
+            )
+            self.backlog -= 1
+
+    def requeue_failed(self):
+        """Volta para 'pendente' o que falhou ou ficou pela metade em execuções anteriores."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET status = 'pendente' WHERE status IN ('falhou', 'enviando')"
+            )
+            self.backlog = self._count_backlog()
+        self.prune_sent()
+        return cursor.rowcount
+
+    def prune_sent(self, days=None):
+        """Apaga os itens enviados há mais de days dias (padrão: OUTBOX_RETENTION_DAYS)."""
+        days = OUTBOX_RETENTION_DAYS if days is None else days
+        cutoff = self._timestamp(datetime.now(timezone.utc) - timedelta(days=days))
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM outbox WHERE status = 'enviado' AND atualizado_em < ?", (cutoff,)
+                ).rowcount
+            if deleted:
+                # VACUUM devolve ao disco as páginas liberadas (fora de transação)
+                self._conn.execute('VACUUM')
+        return deleted
+
+    def failed_urls(self, run_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM outbox WHERE run_id = ? AND status != 'enviado'", (run_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        self._conn.close()
+
+
+class OutboxUploader:
+    """Esvazia a Outbox em segundo plano, enviando cada item pelo sink da API."""
+
+    def __init__(self, outbox, api_sink, workers=2, batch_size=10, poll_interval=1.0):
+        self.outbox = outbox
+        self.api_sink = api_sink
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.failed = 0
+        self._stop = asyncio.Event()
+        self._progress = asyncio.Event()
+
+    async def _send(self, row_id, url, offers):
+        try:
+            ok = await self.api_sink.write(url, offers)
+        except Exception as e:
+            print(f'Erro ao enviar {url} da outbox: {e}')
+            ok = False
+        await asyncio.to_thread(self.outbox.mark, row_id, ok)
+        self._progress.set()
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+
+    async def wait_for_room(self, limit=None):
+        """Espera a outbox ter menos de limit itens por enviar (padrão: OUTBOX_MAX_PENDING).
+
+        Dá ao pipeline a mesma contenção das filas limitadas: se a API fica
+        para trás, a gravação (e com ela a raspagem) espera o envio.
+        """
+        limit = OUTBOX_MAX_PENDING if limit is None else limit
+        while limit and self.outbox.backlog >= limit:
+            self._progress.clear()
+            try:
+                await asyncio.wait_for(self._progress.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Envia até stop() ser chamado e a outbox ficar vazia."""
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def send_limited(item):
+            async with semaphore:
+                await self._send(*item)
+
+        while True:
+            items = await asyncio.to_thread(self.outbox.claim, self.batch_size)
+            if items:
+                await asyncio.gather(*(send_limited(item) for item in items))
+                continue
+            if self._stop.is_set():
+                return
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self._stop.set()
+
+
+async def replay_outbox(upload, workers=2):
+    """Reenvia à API tudo o que ficou pendente ou falhou na outbox."""
+    outbox = Outbox()
+    requeued = outbox.requeue_failed()
+    print(f'Reenviando {requeued} itens da outbox')
+    uploader = OutboxUploader(outbox, ApiSink(upload), workers=workers)
+    uploader.stop()
+    await uploader.run()
+    outbox.close()
+    print(f'Outbox: {uploader.sent} enviados, {uploader.failed} falharam')
@@ -0,0 +1,138 @@
+"""Arquivos de estado em JSON (URLs pendentes, sessões de login) sem bloquear o event loop.
+
+Leitura e escrita rodam numa thread (asyncio.to_thread). Toda escrita vai
+para um arquivo temporário no mesmo diretório, que substitui o original com
+os.replace: uma queda no meio da escrita deixa o arquivo antigo intacto.
+
+AUTH_STATE guarda em memória os storage_state do Playwright e junta as
+gravações: as páginas que salvam a mesma sessão em sequência viram uma
+escrita só, AUTH_FLUSH_DELAY_S depois da primeira. flush() grava o que
+estiver pendente (ex.: no fim da execução).
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+AUTH_FLUSH_DELAY_S = float(os.environ.get('AUTH_FLUSH_DELAY_S', '1.0'))
+
+
+def write_file_atomic(path, write, binary=False):
+    """Grava path via arquivo temporário + os.replace; write(f) escreve o conteúdo.
+
+    Com binary, f é aberto em modo binário (ex.: np.savez).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data, indent=None):
+    """Grava data em path via arquivo temporário + os.replace."""
+    write_file_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=indent))
+
+
+def read_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+async def save_json(path, data, indent=None):
+    await asyncio.to_thread(write_json_atomic, path, data, indent)
+
+
+async def load_json(path, default=None):
+    return await asyncio.to_thread(read_json, path, default)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class AuthStateStore:
+    """storage_state por arquivo: leitura com cache e gravação atômica agrupada."""
+
+    def __init__(self, delay=None):
+        self.delay = AUTH_FLUSH_DELAY_S if delay is None else delay
+        self.writes = 0
+        self.coalesced = 0
+        self._states = {}
+        self._pending = {}
+        self._flushes = {}
+        self._locks = {}
+
+    async def load(self, path):
+        """storage_state de path (o pendente, se há um mais novo que o arquivo), ou None."""
+        if path in self._pending:
+            return self._pending[path]
+        mtime = _mtime(path)
+        if mtime is None:
+            return None
+        cached = self._states.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        state = await load_json(path)
+        self._states[path] = (mtime, state)
+        return state
+
+    def save(self, path, state):
+        """Agenda a gravação de state em path; gravações seguidas são agrupadas."""
+        self._pending[path] = state
+        task = self._flushes.get(path)
+        if task is not None and not task.done():
+            self.coalesced += 1
+            return
+        self._flushes[path] = asyncio.create_task(self._flush_later(path))
+
+    async def _flush_later(self, path):
+        while path in self._pending:
+            await asyncio.sleep(self.delay)
+            # shield: um flush() que cancela a espera não interrompe uma gravação em andamento
+            await asyncio.shield(self._write(path))
+
+    async def _write(self, path):
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            state = self._pending.pop(path, None)
+            if state is None:
+                return
+            try:
+                await save_json(path, state)
+            except OSError as e:
+                print(f'Erro ao salvar {path}: {e}')
+                return
+            self._states[path] = (_mtime(path), state)
+            self.writes += 1
+
+    async def flush(self):
+        """Grava já tudo o que está pendente e espera as gravações em andamento."""
+        tasks = list(self._flushes.values())
+        self._flushes.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for path in list(self._pending):
+            await self._write(path)
+        for lock in list(self._locks.values()):
+            async with lock:
+                pass
+
+
+AUTH_STATE = AuthStateStore()
@@ -0,0 +1,25 @@
+"""Fixtures dos testes: ofertas determinísticas geradas pelo marketplace_sim."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import marketplace_sim  # noqa: E402
+from records import Offer, ProductHeader  # noqa: E402
+
+
+def sim_offers(marketplace, n, data_hora='2024-01-01T12:00:00Z'):
+    """Ofertas do produto n no marketplace, com os vendedores e preços do simulador."""
+    header = ProductHeader(f'SIM{n}', marketplace, f'Produto simulado {n}', 4.5, '', marketplace_sim.ean_for(n))
+    offers = []
+    for loja, preco in marketplace_sim.sellers_for(marketplace, n):
+        key_loja = loja.lower().replace(' ', '')
+        offers.append(Offer(header, loja, preco, data_hora, key_loja, f'{key_loja}_{header.sku}'))
+    return offers
+
+
+@pytest.fixture
+def offers_for():
+    return sim_offers
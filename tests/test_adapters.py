@@ -0,0 +1,59 @@
+import pytest
+
+import adapters
+from adapters import BROWSER, HTTP, AdapterRegistry, FetchStrategy, MarketplaceAdapter
+
+HTTP_FETCH = FetchStrategy(HTTP, None)
+BROWSER_FETCH = FetchStrategy(BROWSER, None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(adapters.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def registry():
+    adapter = MarketplaceAdapter('Mercado Livre', (r'mercadolivre',), [BROWSER_FETCH, HTTP_FETCH])
+    return AdapterRegistry([adapter], max_failures=3, demotion_s=600), adapter
+
+
+def demote(registry, adapter):
+    for _ in range(3):
+        registry.record(adapter, HTTP_FETCH, False)
+
+
+def test_strategies_cheapest_first_and_demoted_after_failures(clock):
+    reg, adapter = registry()
+    assert reg.strategies(adapter) == [HTTP_FETCH, BROWSER_FETCH]
+    demote(reg, adapter)
+    assert reg.strategies(adapter) == [BROWSER_FETCH]
+
+
+def test_last_strategy_is_never_demoted(clock):
+    reg, adapter = registry()
+    for _ in range(5):
+        reg.record(adapter, BROWSER_FETCH, False)
+    assert reg.strategies(adapter) == [HTTP_FETCH, BROWSER_FETCH]
+
+
+def test_demotion_expires(clock):
+    reg, adapter = registry()
+    demote(reg, adapter)
+    clock[0] += 599
+    assert reg.strategies(adapter) == [BROWSER_FETCH]
+    clock[0] += 1
+    assert reg.strategies(adapter) == [HTTP_FETCH, BROWSER_FETCH]
+    # Uma nova falha não rebaixa de novo: a contagem recomeçou
+    reg.record(adapter, HTTP_FETCH, False)
+    assert reg.strategies(adapter) == [HTTP_FETCH, BROWSER_FETCH]
+
+
+def test_reset_clears_demotions_and_counts(clock):
+    reg, adapter = registry()
+    reg.record(adapter, BROWSER_FETCH, True)
+    demote(reg, adapter)
+    reg.reset()
+    assert reg.strategies(adapter) == [HTTP_FETCH, BROWSER_FETCH]
+    assert reg.used == {}
@@ -0,0 +1,110 @@
+import pytest
+
+import circuit_breaker
+from circuit_breaker import ABERTO, FECHADO, MEIO_ABERTO, CircuitBreaker, MarketplaceBreakers
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def breaker():
+    return CircuitBreaker('Sim', failure_rate=0.5, min_calls=4, window=6, cooldown=60)
+
+
+def test_stays_closed_below_min_calls(clock):
+    cb = breaker()
+    for _ in range(3):
+        assert cb.allow()
+        cb.record(False)
+    assert cb.state == FECHADO
+
+
+def test_opens_at_failure_rate_and_rejects(clock):
+    cb = breaker()
+    for ok in (True, False, True, False):
+        cb.allow()
+        cb.record(ok)
+    assert cb.state == ABERTO
+    assert cb.opened == 1
+    assert not cb.allow()
+    assert not cb.allow()
+    assert cb.rejected == 2
+
+
+def test_half_open_admits_a_single_probe(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record(False)
+    clock[0] += 59
+    assert not cb.allow()
+    clock[0] += 1
+    assert cb.allow()
+    assert cb.state == MEIO_ABERTO
+    # Enquanto a URL de teste não volta, as demais continuam recusadas
+    assert not cb.allow()
+    assert not cb.allow()
+
+
+def test_successful_probe_closes_and_clears_window(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record(False)
+    clock[0] += 60
+    assert cb.allow()
+    cb.record(True)
+    assert cb.state == FECHADO
+    assert len(cb.results) == 0
+    # Janela limpa: uma falha isolada não reabre
+    cb.record(False)
+    assert cb.state == FECHADO
+
+
+def test_failed_probe_reopens_for_another_cooldown(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record(False)
+    clock[0] += 60
+    assert cb.allow()
+    cb.record(False)
+    assert cb.state == ABERTO
+    assert cb.opened == 2
+    clock[0] += 30
+    assert not cb.allow()
+    clock[0] += 30
+    assert cb.allow()
+
+
+def test_results_while_open_are_ignored(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record(False)
+    cb.record(True)
+    assert cb.state == ABERTO
+    assert len(cb.results) == 4
+
+
+def test_marketplace_breakers_are_independent(clock):
+    breakers = MarketplaceBreakers(failure_rate=0.5, min_calls=2, window=4, cooldown=60)
+    breakers.record('Amazon', False)
+    breakers.record('Amazon', False)
+    assert not breakers.closed('Amazon')
+    assert not breakers.allow('Amazon')
+    assert breakers.closed('Mercado Livre')
+    assert breakers.allow('Mercado Livre')
+    assert breakers.get('Amazon') is breakers.get('Amazon')
+
+
+def test_released_probe_lets_another_url_probe(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record(False)
+    clock[0] += 60
+    assert cb.allow()
+    # A URL de teste foi interrompida pelo prazo, sem resultado
+    cb.release()
+    assert cb.state == MEIO_ABERTO
+    assert cb.allow()
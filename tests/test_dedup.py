@@ -0,0 +1,82 @@
+import asyncio
+
+import marketplace_sim
+from adapters import HTTP, AdapterRegistry, FetchStrategy, MarketplaceAdapter
+from dedup import OfferDedup, ScrapeDedup, expand_duplicates
+
+BASE = 'http://127.0.0.1:8090'
+
+
+def registry():
+    return AdapterRegistry([
+        MarketplaceAdapter('Mercado Livre', (r'mercadolivre\.com\.br',), [FetchStrategy(HTTP, None)],
+                           product_id_pattern=r'/p/(MLB\d+)'),
+        MarketplaceAdapter('Amazon', (r'amazon\.com\.br',), [FetchStrategy(HTTP, None)],
+                           product_id_pattern=r'/dp/([A-Z0-9]{10})'),
+    ])
+
+
+def meli_url(n, suffix=''):
+    return marketplace_sim.product_url(BASE, 'Mercado Livre', n) + suffix
+
+
+def test_scrape_dedup_fetches_each_product_once():
+    dedup = ScrapeDedup(registry().product_key)
+    calls = []
+
+    async def fetch(n):
+        calls.append(n)
+        await asyncio.sleep(0.01)
+        return marketplace_sim.sellers_for('Mercado Livre', n)
+
+    async def main():
+        return await asyncio.gather(
+            dedup.run(meli_url(1), lambda: fetch(1)),
+            dedup.run(meli_url(1, '?tracking=abc'), lambda: fetch(1)),
+            dedup.run(meli_url(1, '#reviews'), lambda: fetch(1)),
+            dedup.run(meli_url(2), lambda: fetch(2)),
+        )
+
+    results = asyncio.run(main())
+    assert sorted(calls) == [1, 2]
+    assert results[0] == results[1] == results[2] == marketplace_sim.sellers_for('Mercado Livre', 1)
+    assert dedup.shared == 2
+    assert dedup.known(meli_url(1, '?outra=1'))
+    assert not dedup.known(meli_url(3))
+
+
+def test_scrape_dedup_group_and_expand():
+    dedup = ScrapeDedup(registry().product_key)
+    amazon = marketplace_sim.product_url(BASE, 'Amazon', 7)
+    urls = [meli_url(1), amazon, meli_url(1, '?a=1'), meli_url(2), meli_url(1, '?b=2')]
+    representatives, duplicates = dedup.group(urls)
+    assert representatives == [meli_url(1), amazon, meli_url(2)]
+    assert duplicates == {meli_url(1): [meli_url(1, '?a=1'), meli_url(1, '?b=2')]}
+    assert dedup.shared == 2
+
+    async def source():
+        for url in representatives:
+            yield url, f'resultado {url}'
+
+    async def collect():
+        return [item async for item in expand_duplicates(source(), duplicates)]
+
+    expanded = dict(asyncio.run(collect()))
+    assert set(expanded) == set(urls)
+    assert expanded[meli_url(1, '?b=2')] == f'resultado {meli_url(1)}'
+
+
+def test_offer_dedup_drops_repeated_key_sku(offers_for):
+    offers = offers_for('Amazon', 3)
+    dedup = OfferDedup()
+    assert dedup.filter(offers) == offers
+    assert dedup.filter(offers) == []
+    assert dedup.dropped == len(offers)
+
+
+def test_offer_dedup_keeps_offers_without_key(offers_for):
+    offer = offers_for('Amazon', 3)[0]
+    offer.key_sku = None
+    dedup = OfferDedup()
+    assert dedup.filter([offer, offer]) == [offer, offer]
+    assert dedup.dropped == 0
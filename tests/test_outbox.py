@@ -0,0 +1,69 @@
+from sinks import Outbox
+
+
+def fill(outbox, offers_for, count):
+    for n in range(count):
+        outbox.enqueue('run-1', f'https://www.amazon.com.br/dp/{n}', offers_for('Amazon', n))
+
+
+def test_claim_returns_the_enqueued_offers(tmp_path, offers_for):
+    outbox = Outbox(str(tmp_path / 'outbox.sqlite'))
+    fill(outbox, offers_for, 2)
+    claimed = outbox.claim(10)
+    assert [url for _, url, _ in claimed] == ['https://www.amazon.com.br/dp/0', 'https://www.amazon.com.br/dp/1']
+    expected = offers_for('Amazon', 0)
+    offers = claimed[0][2]
+    assert [(o.loja, o.preco_final, o.key_sku) for o in offers] == [(o.loja, o.preco_final, o.key_sku) for o in expected]
+    assert outbox.claim(10) == []
+    outbox.close()
+
+
+def test_backlog_and_requeue_failed(tmp_path, offers_for):
+    path = str(tmp_path / 'outbox.sqlite')
+    outbox = Outbox(path)
+    fill(outbox, offers_for, 4)
+    assert outbox.backlog == 4
+    (ok_id, _, _), (failed_id, failed_url, _) = outbox.claim(2)
+    assert outbox.backlog == 4
+    outbox.mark(ok_id, True)
+    outbox.mark(failed_id, False)
+    assert outbox.backlog == 2
+    assert failed_url in outbox.failed_urls('run-1')
+
+    assert outbox.requeue_failed() == 1
+    assert outbox.backlog == 3
+    assert failed_url in [url for _, url, _ in outbox.claim(10)]
+    outbox.close()
+
+
+def test_requeue_recovers_items_left_sending(tmp_path, offers_for):
+    path = str(tmp_path / 'outbox.sqlite')
+    outbox = Outbox(path)
+    fill(outbox, offers_for, 3)
+    outbox.claim(2)
+    outbox.close()
+
+    # Execução interrompida: os itens 'enviando' ainda contam no backlog e voltam à fila
+    reopened = Outbox(path)
+    assert reopened.backlog == 3
+    assert reopened.requeue_failed() == 2
+    assert len(reopened.claim(10)) == 3
+    reopened.close()
+
+
+def test_requeue_prunes_old_sent_items(tmp_path, offers_for):
+    outbox = Outbox(str(tmp_path / 'outbox.sqlite'))
+    fill(outbox, offers_for, 3)
+    (old_id, _, _), (recent_id, _, _) = outbox.claim(2)
+    outbox.mark(old_id, True)
+    outbox.mark(recent_id, True)
+    with outbox._conn:
+        outbox._conn.execute("UPDATE outbox SET atualizado_em = '2000-01-01T00:00:00Z' WHERE id = ?", (old_id,))
+
+    outbox.requeue_failed()
+    ids = [row[0] for row in outbox._conn.execute('SELECT id FROM outbox ORDER BY id')]
+    assert old_id not in ids
+    assert recent_id in ids
+    assert outbox.backlog == 1
+    assert outbox.prune_sent() == 0
+    outbox.close()
@@ -0,0 +1,32 @@
+import json
+import os
+
+from price_analytics import analyze, load_snapshot, product_key
+
+
+def test_report_is_saved_and_old_reports_pruned(tmp_path, offers_for):
+    report = analyze(offers_for('Amazon', 1) + offers_for('Mercado Livre', 2), own_stores=[])
+    for run_id in ('20240101T000000', '20240102T000000', '20240103T000000'):
+        path = report.save(run_id, directory=str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ['analise-20240102T000000.json', 'analise-20240103T000000.json']
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['run_id'] == '20240103T000000'
+    assert saved['produtos'] == ['Amazon:SIM1', 'Mercado Livre:SIM2']
+
+
+def test_snapshot_keeps_products_missing_from_a_partial_run(tmp_path, offers_for):
+    path = str(tmp_path / 'analise-ultima.npz')
+    first = analyze(offers_for('Amazon', 1) + offers_for('Amazon', 2), own_stores=[])
+    first.save_snapshot(path)
+
+    # Execução parcial (ex.: um lote do daemon) só com o produto 2, 10% mais barato
+    cheaper = offers_for('Amazon', 2)
+    for offer in cheaper:
+        offer.preco_final = round(offer.preco_final * 0.9, 2)
+    previous = load_snapshot(path)
+    second = analyze(cheaper, own_stores=[], previous=previous, drop_pct=5)
+    second.save_snapshot(path, previous)
+
+    assert {alerta['produto'] for alerta in second.alertas} == {product_key(cheaper[0])}
+    assert list(load_snapshot(path)['produtos']) == ['Amazon:SIM1', 'Amazon:SIM2']
@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+
+import pytest
+
+from price_history import PriceHistory
+
+DAYS = ('2024-01-01', '2024-01-02')
+
+
+def rows(offers_for, marketplace, products, day, hour=12):
+    result = []
+    for n in products:
+        for offer in offers_for(marketplace, n, f'{day}T{hour:02d}:00:00Z'):
+            result.append(offer.as_dict())
+    return result
+
+
+def expected_lowest(offers_for, marketplace, products):
+    return {f'SIM{n}': min(offer.preco_final for offer in offers_for(marketplace, n)) for n in products}
+
+
+@pytest.fixture
+def history(tmp_path, offers_for):
+    history = PriceHistory(str(tmp_path / 'historico'))
+    for i, day in enumerate(DAYS):
+        history.append(f'run-{i}', rows(offers_for, 'Amazon', range(5), day))
+        history.append(f'run-{i}b', rows(offers_for, 'Mercado Livre', range(3), day))
+    return history
+
+
+def test_lowest_after_compaction(history, offers_for):
+    before = history.lowest(marketplace='Amazon')
+    assert history.compact(before='2024-01-03') == 4
+    for day in DAYS:
+        directory = os.path.join(history.root, f'dia={day}', 'marketplace=amazon')
+        assert os.listdir(directory) == ['dia.npz']
+
+    lowest = history.lowest(marketplace='Amazon')
+    assert lowest == before
+    assert {sku: preco for sku, (preco, _, _) in lowest.items()} == expected_lowest(offers_for, 'Amazon', range(5))
+    # As lojas e o momento vêm da oferta que tem o menor preço
+    for sku, (preco, loja, _) in lowest.items():
+        assert (loja, preco) in [(o.loja, o.preco_final) for o in offers_for('Amazon', int(sku[3:]))]
+
+
+def test_lowest_mixes_compacted_days_and_new_parts(history, offers_for):
+    history.compact(before='2024-01-03')
+    cheaper = rows(offers_for, 'Amazon', [0], '2024-01-03')
+    for row in cheaper:
+        row['preco_final'] = 1.0
+    history.append('run-novo', cheaper)
+
+    lowest = history.lowest(marketplace='Amazon')
+    assert lowest['SIM0'][0] == 1.0
+    assert lowest['SIM1'][0] == expected_lowest(offers_for, 'Amazon', [1])['SIM1']
+    assert history.lowest(start='2024-01-01', end='2024-01-02', marketplace='Amazon')['SIM0'][0] > 1.0
+
+
+def test_lowest_with_parts_newer_than_the_dictionary(history, offers_for):
+    history.compact(before='2024-01-03')
+    history.lowest()
+    # Outro processo grava skus novos depois que este já carregou o dicionário
+    PriceHistory(history.root).append('run-outro', rows(offers_for, 'Amazon', range(5, 8), '2024-01-02', hour=18))
+    lowest = history.lowest(marketplace='Amazon')
+    assert set(lowest) == {f'SIM{n}' for n in range(8)}
+
+
+def _append_from_process(root, worker, products):
+    from conftest import sim_offers
+
+    history = PriceHistory(root)
+    for n in products:
+        history.append(f'worker{worker}-{n}', rows(sim_offers, 'Amazon', [n], '2024-01-01'))
+
+
+def test_concurrent_processes_keep_sku_ids_consistent(tmp_path, offers_for):
+    root = str(tmp_path / 'historico')
+    PriceHistory(root)
+    workers = [
+        multiprocessing.Process(target=_append_from_process, args=(root, worker, range(worker * 10, worker * 10 + 10)))
+        for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert all(process.exitcode == 0 for process in workers)
+
+    lowest = PriceHistory(root).lowest()
+    assert {sku: preco for sku, (preco, _, _) in lowest.items()} == expected_lowest(offers_for, 'Amazon', range(40))
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import marketplace_sim
+import scrape_api
+from scrape_api import ScrapeService
+
+URL = marketplace_sim.product_url('https://sim', 'Amazon', 1)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Só o relógio do serviço: o event loop continua com o time.monotonic real
+    now = [1000.0]
+    monkeypatch.setattr(scrape_api, 'time', SimpleNamespace(monotonic=lambda: now[0], time=time.time))
+    return now
+
+
+@pytest.fixture
+def crawls(monkeypatch, offers_for):
+    """crawl_url falso: conta as chamadas e devolve as ofertas do simulador (ou levanta fail)."""
+    state = {'calls': 0, 'fail': None, 'delay': 0}
+
+    async def crawl_url(crawler, url):
+        state['calls'] += 1
+        await asyncio.sleep(state['delay'])
+        if state['fail'] is not None:
+            raise state['fail']
+        return offers_for('Amazon', 1)
+
+    monkeypatch.setattr(scrape_api, 'crawl_url', crawl_url)
+    return state
+
+
+def service():
+    return ScrapeService(ttl=300, empty_ttl=60, max_concurrency=2)
+
+
+def test_cache_hit_within_ttl(clock, crawls):
+    async def main():
+        scraper = service()
+        _, first, first_cached = await scraper.get(URL)
+        clock[0] += 299
+        _, second, second_cached = await scraper.get(URL + '?ref=outra')
+        return scraper, first, first_cached, second, second_cached
+
+    scraper, first, first_cached, second, second_cached = asyncio.run(main())
+    assert crawls['calls'] == 1
+    assert (first_cached, second_cached) == (False, True)
+    assert second is first
+    assert second['status'] == 'ok'
+    assert scraper.stats['cache'] == 1
+
+
+def test_refetch_after_ttl(clock, crawls):
+    async def main():
+        scraper = service()
+        await scraper.get(URL)
+        clock[0] += 300
+        return await scraper.get(URL)
+
+    _, _, cached = asyncio.run(main())
+    assert not cached
+    assert crawls['calls'] == 2
+
+
+def test_concurrent_requests_share_one_fetch(clock, crawls):
+    crawls['delay'] = 0.01
+
+    async def main():
+        scraper = service()
+        results = await asyncio.gather(*(scraper.get(URL) for _ in range(10)))
+        return scraper, results
+
+    scraper, results = asyncio.run(main())
+    assert crawls['calls'] == 1
+    assert all(entry is results[0][1] for _, entry, _ in results)
+    assert scraper.stats['coalescidos'] == 9
+    assert scraper._in_flight == {}
+
+
+def test_error_is_not_cached(clock, crawls):
+    crawls['fail'] = RuntimeError('navegador caiu')
+
+    async def main():
+        scraper = service()
+        with pytest.raises(RuntimeError):
+            await scraper.get(URL)
+        assert scraper.cached() == 0
+        crawls['fail'] = None
+        return await scraper.get(URL)
+
+    _, entry, cached = asyncio.run(main())
+    assert not cached
+    assert entry['status'] == 'ok'
+    assert crawls['calls'] == 2
+
+
+def test_crawler_not_started_for_adapters_without_it(clock, crawls):
+    async def main():
+        scraper = service()
+        await scraper.get(URL)
+        return scraper
+
+    assert asyncio.run(main())._crawler is None